@@ -0,0 +1,11 @@
+import os
+import sys
+
+# The ExporterUI modules import each other by bare name, as when run as scripts.
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+from cli import main  # noqa: E402
+
+raise SystemExit(main())
@@ -0,0 +1,387 @@
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from pipeline_io import import_core
+
+# SQLite index of the exports under one or more roots: manifests, validation and import results.
+CATALOG_ENV = 'PIPELINE_CATALOG'  # catalog file used when no path is given
+DEFAULT_DB = os.path.join(tempfile.gettempdir(), "3dsMaxPipeline", "asset_catalog.db")
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, root TEXT NOT NULL, kind TEXT NOT NULL, size INTEGER, mtime_ns INTEGER);
+CREATE TABLE IF NOT EXISTS assets (
+    fbx TEXT PRIMARY KEY, root TEXT NOT NULL, name TEXT, polygons INTEGER, vertices INTEGER,
+    complexity TEXT, lod_count INTEGER, nanite INTEGER, texture_issues TEXT, manifest TEXT, indexed_at REAL);
+CREATE TABLE IF NOT EXISTS validation (
+    fbx TEXT PRIMARY KEY, accuracy REAL, poly_error REAL, actual_complexity TEXT, memory_mb REAL,
+    result TEXT, validated_at REAL);
+CREATE TABLE IF NOT EXISTS imports (
+    fbx TEXT PRIMARY KEY, report TEXT, status TEXT, actual_tris INTEGER, accuracy REAL, lods INTEGER,
+    imported_at REAL);
+CREATE INDEX IF NOT EXISTS assets_polygons ON assets (polygons);
+CREATE INDEX IF NOT EXISTS assets_name ON assets (name);
+CREATE INDEX IF NOT EXISTS assets_root ON assets (root);
+CREATE INDEX IF NOT EXISTS assets_texture_issues ON assets (fbx) WHERE texture_issues != '';
+CREATE INDEX IF NOT EXISTS files_root ON files (root);
+CREATE INDEX IF NOT EXISTS validation_accuracy ON validation (accuracy);
+CREATE VIEW IF NOT EXISTS asset_status AS
+    SELECT a.fbx, a.root, a.name, a.polygons, a.vertices, a.complexity, a.lod_count, a.nanite,
+           a.texture_issues, v.accuracy, v.poly_error, v.actual_complexity, v.memory_mb,
+           i.status AS import_status, i.actual_tris
+    FROM assets a LEFT JOIN validation v ON v.fbx = a.fbx LEFT JOIN imports i ON i.fbx = a.fbx;
+"""
+
+
+def normalize(path):
+    return os.path.normcase(os.path.abspath(path)).replace('\\', '/')
+
+
+def walk(root):
+    # (DirEntry, kind) for manifests, their FBX files and batch import reports.
+    # scandir keeps this to one directory read each; on Windows the stat comes free.
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        names = {e.name for e in entries}
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(entry.path)
+                continue
+            name = entry.name
+            lower = name.lower()
+            if lower.endswith('report.json'):
+                yield entry, 'report'
+            elif lower.endswith('.json') and name[:-5] + '.fbx' in names:
+                yield entry, 'manifest'
+            elif lower.endswith('.fbx') and name[:-4] + '.json' in names:
+                yield entry, 'fbx'
+
+
+def manifest_row(fbx, root, manifest):
+    return (fbx, root, manifest.get('asset') or manifest.get('asset_name') or Path(fbx).stem,
+            manifest.get('polygons'), manifest.get('vertices'), manifest.get('complexity'),
+            manifest.get('lod_count'), int(bool(manifest.get('enable_nanite', False))),
+            manifest.get('texture_issues') or "", json.dumps(manifest), time.time())
+
+
+def report_rows(path):
+    # 'imports' rows from a batch import report JSON (BatchImporter.write_report).
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    imported_at = os.path.getmtime(path)
+    return [(normalize(r['fbx']), path, r.get('status'), r.get('actual_tris'), r.get('accuracy'), r.get('lods'),
+             imported_at) for r in (report.get('assets', []) if isinstance(report, dict) else []) if r.get('fbx')]
+
+
+class AssetCatalog:
+    def __init__(self, db_path=None):
+        # db_path, else $PIPELINE_CATALOG, else DEFAULT_DB.
+        self.db_path = str(db_path or os.environ.get(CATALOG_ENV) or DEFAULT_DB)
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.db_path)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript("DROP VIEW IF EXISTS asset_status; DROP TABLE IF EXISTS files; "
+                                  "DROP TABLE IF EXISTS assets; DROP TABLE IF EXISTS validation; "
+                                  "DROP TABLE IF EXISTS imports;")
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def scan(self, root, validate=False, validator=None, predictor=None):
+        # Brings the catalog in line with root. validate: also run the offline FBX
+        # validation for assets whose manifest or FBX changed since the last scan, and
+        # train predictor (a PerformancePredictor) on them if given.
+        root = normalize(root)
+        known, kinds = {}, {}
+        for row in self.db.execute("SELECT path, kind, size, mtime_ns FROM files WHERE root = ?", (root,)):
+            known[row['path']] = (row['size'], row['mtime_ns'])
+            kinds[row['path']] = row['kind']
+        seen, changed_files = set(), []
+        manifests, reports, fbx_changed = [], [], []
+        for entry, kind in walk(root):
+            path = normalize(entry.path)
+            seen.add(path)
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            if known.get(path) == (st.st_size, st.st_mtime_ns):
+                continue
+            changed_files.append((path, root, kind, st.st_size, st.st_mtime_ns))
+            if kind == 'manifest':
+                manifests.append(path)
+            elif kind == 'report':
+                reports.append(path)
+            else:
+                fbx_changed.append(path)
+        removed = [(path, kinds[path]) for path in known if path not in seen]
+
+        asset_rows, errors = [], []
+        for path in manifests:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    asset_rows.append(manifest_row(path[:-5] + '.fbx', root, json.load(f)))
+            except (OSError, ValueError) as e:
+                errors.append(f"{path}: {e}")
+        import_rows = []
+        for path in reports:
+            try:
+                import_rows += report_rows(path)
+            except (OSError, ValueError) as e:
+                errors.append(f"{path}: {e}")
+
+        with self.db:
+            for path, kind in removed + [(path, 'report') for path in reports]:
+                if kind == 'report':
+                    self.db.execute("DELETE FROM imports WHERE report = ?", (path,))
+            for path, kind in removed:
+                self.db.execute("DELETE FROM files WHERE path = ?", (path,))
+                if kind == 'manifest':
+                    fbx = path[:-5] + '.fbx'
+                    for table in ('assets', 'validation', 'imports'):
+                        self.db.execute(f"DELETE FROM {table} WHERE fbx = ?", (fbx,))
+            self.db.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", changed_files)
+            self.db.executemany("INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", asset_rows)
+            self.db.executemany("INSERT OR REPLACE INTO imports VALUES (?, ?, ?, ?, ?, ?, ?)", import_rows)
+
+        validated = 0
+        if validate:
+            stale = {row[0] for row in asset_rows} | set(fbx_changed)
+            stale |= {row['fbx'] for row in self.db.execute(
+                "SELECT a.fbx FROM assets a LEFT JOIN validation v ON v.fbx = a.fbx "
+                "WHERE a.root = ? AND v.fbx IS NULL", (root,))}
+            validated, failures = self.validate(sorted(stale), validator, predictor)
+            errors += failures
+        return {'root': root, 'changed': len(changed_files), 'manifests': len(asset_rows),
+                'reports': len(reports), 'removed': len(removed), 'validated': validated, 'errors': errors}
+
+    def index_report(self, path):
+        # One batch import report, for reports written outside the scanned roots.
+        path = normalize(path)
+        rows = report_rows(path)
+        with self.db:
+            self.db.execute("DELETE FROM imports WHERE report = ?", (path,))
+            self.db.executemany("INSERT OR REPLACE INTO imports VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    def validate(self, fbx_paths, validator=None, predictor=None):
+        from fbx_reader import FbxError, validate_export
+        rows, errors = [], []
+        for fbx in fbx_paths:
+            try:
+                result = validate_export(fbx, validator, predictor)
+            except (FbxError, OSError, ValueError, KeyError) as e:
+                errors.append(f"{fbx}: {e}")
+                continue
+            if result is None:
+                continue
+            rows.append((fbx, result['accuracy_score'], result['poly_error'], result['actual_complexity'],
+                         result['memory_mb'], json.dumps(result), time.time()))
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO validation VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows), errors
+
+    def find(self, min_polygons=None, max_polygons=None, nanite=None, texture_issues=None, failed=None,
+             name=None, root=None, order_by='polygons DESC', limit=None, rules=None):
+        # Filters combine with AND; None leaves a filter out. name takes SQL LIKE
+        # wildcards (% and _). failed uses the accuracy_score rule of rules (default:
+        # RuleSet.load()).
+        clauses, params = [], []
+        if min_polygons is not None:
+            clauses.append("polygons > ?")
+            params.append(min_polygons)
+        if max_polygons is not None:
+            clauses.append("polygons <= ?")
+            params.append(max_polygons)
+        if nanite is not None:
+            clauses.append("nanite = ?")
+            params.append(int(nanite))
+        if texture_issues is not None:
+            clauses.append("texture_issues != ''" if texture_issues else "texture_issues = ''")
+        if failed is not None:
+            failing = "(accuracy < ? OR (import_status IS NOT NULL AND import_status NOT LIKE 'PASSED%'))"
+            clauses.append(failing if failed else f"NOT {failing}")
+            params.append(pass_accuracy(rules))
+        if name is not None:
+            clauses.append("name LIKE ?")
+            params.append(name)
+        if root is not None:
+            clauses.append("root = ?")
+            params.append(normalize(root))
+        sql = "SELECT * FROM asset_status"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        if order_by not in ('polygons DESC', 'polygons', 'name', 'accuracy', 'memory_mb DESC'):
+            raise ValueError(f"unsupported order: {order_by}")
+        sql += f" ORDER BY {order_by}"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.db.execute(sql, params)]
+
+    def audit(self, rules=None, platform=None, root=None, lod_levels=3):
+        # Budget rules over the whole catalog in one columnar pass. Assets not validated
+        # yet are checked against their manifest counts.
+        validator = import_core('ValidationEngine').ValidationEngine(rules)
+        lod_columns = "".join(f", json_extract(v.result, '$.lod_triangles[{lod}]') AS triangles_lod{lod}"
+                              for lod in range(1, lod_levels + 1))
+        sql = (f"SELECT a.fbx, a.name, a.polygons, json_extract(a.manifest, '$.category') AS category, "
+               f"COALESCE(json_extract(v.result, '$.actual_triangles'), i.actual_tris, a.polygons) AS triangles, "
+               f"v.memory_mb{lod_columns} FROM assets a LEFT JOIN validation v ON v.fbx = a.fbx "
+               f"LEFT JOIN imports i ON i.fbx = a.fbx")
+        params = ()
+        if root is not None:
+            sql += " WHERE a.root = ?"
+            params = (normalize(root),)
+        rows = self.db.execute(sql, params).fetchall()
+        if not rows:
+            return {'assets': 0, 'passed': 0, 'violations': {}}
+        names = ['polygons', 'triangles', 'memory_mb'] + [f'triangles_lod{n}' for n in range(1, lod_levels + 1)]
+        columns = {name: [row[name] for row in rows] for name in names}
+        columns['polygons'] = [p or 0 for p in columns['polygons']]
+        categories = [row['category'] or validator.rules.category_of(row['name'] or "") for row in rows]
+        batch = validator.validate_batch(columns, categories, platform)
+        return {
+            'assets': len(rows),
+            'passed': int(batch['passed'].sum()),
+            'violations': {rule: [rows[i]['name'] for i in indices] for rule, indices in batch['violations'].items()},
+        }
+
+    def query(self, sql, params=()):
+        return [dict(row) for row in self.db.execute(sql, params)]
+
+    def summary(self, budget=None, rules=None):
+        # budget defaults to the triangles rule of rules (default: RuleSet.load()).
+        rules = rules or import_core('BudgetRules').RuleSet.load()
+        if budget is None:
+            budget = rules.limit('triangles')
+        row = self.db.execute("""
+            SELECT COUNT(*) AS assets, COALESCE(SUM(polygons), 0) AS polygons,
+                   COALESCE(SUM(polygons > ?), 0) AS over_budget,
+                   COALESCE(SUM(texture_issues != ''), 0) AS texture_issues,
+                   COALESCE(SUM(nanite), 0) AS nanite,
+                   COALESCE(SUM(accuracy IS NOT NULL), 0) AS validated,
+                   COALESCE(SUM(accuracy < ?), 0) AS failed_validation,
+                   COALESCE(SUM(import_status IS NOT NULL AND import_status NOT LIKE 'PASSED%'), 0) AS failed_import
+            FROM asset_status""", (budget, pass_accuracy(rules))).fetchone()
+        return dict(row)
+
+
+def pass_accuracy(rules=None, category=None, platform=None):
+    # Lowest accuracy_score that passes validation under rules (0 without such a rule).
+    rules = rules or import_core('BudgetRules').RuleSet.load()
+    return rules.limit('accuracy_score', category, platform, bound='min') or 0
+
+
+def print_rows(rows):
+    print(f"{'asset':<32} {'polygons':>10} {'LODs':>5} {'nanite':>6} {'accuracy':>9}  {'import':<12} texture audit")
+    for r in rows:
+        accuracy = "-" if r['accuracy'] is None else f"{r['accuracy']:.1f}%"
+        print(f"{(r['name'] or '')[:32]:<32} {r['polygons'] if r['polygons'] is not None else '-':>10} "
+              f"{r['lod_count'] if r['lod_count'] is not None else '-':>5} {'yes' if r['nanite'] else 'no':>6} "
+              f"{accuracy:>9}  {(r['import_status'] or '-')[:12]:<12} {r['texture_issues'] or 'OK'}")
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Index export folders into a SQLite catalog and query it")
+    parser.add_argument('--db', help=f"catalog file (default: ${CATALOG_ENV} or {DEFAULT_DB})")
+    sub = parser.add_subparsers(dest='command', required=True)
+    scan_parser = sub.add_parser('scan', help="index (or re-index) export roots")
+    scan_parser.add_argument('roots', nargs='+')
+    scan_parser.add_argument('--validate', action='store_true', help="validate changed FBX files offline")
+    scan_parser.add_argument('--learn', nargs='?', const='', metavar='MODEL',
+                             help="with --validate: train the performance predictor on the newly validated assets")
+    find_parser = sub.add_parser('find', help="list assets matching every given filter")
+    find_parser.add_argument('--min-polys', type=int, help="more than this many polygons (e.g. 50000)")
+    find_parser.add_argument('--max-polys', type=int)
+    find_parser.add_argument('--nanite', action='store_true', default=None)
+    find_parser.add_argument('--texture-issues', action='store_true', default=None, help="failed the texture audit")
+    find_parser.add_argument('--failed', action='store_true', default=None, help="failed validation or import")
+    find_parser.add_argument('--name', help="SQL LIKE pattern, e.g. Prop_%%")
+    find_parser.add_argument('--root')
+    find_parser.add_argument('--limit', type=int)
+    find_parser.add_argument('--json', action='store_true')
+    summary_parser = sub.add_parser('summary', help="budget and validation totals")
+    summary_parser.add_argument('--budget', type=int, help="triangle budget (default: the budget rules')")
+    audit_parser = sub.add_parser('audit', help="check every indexed asset against the budget rules")
+    audit_parser.add_argument('--rules', help="budget rules JSON (default: $PIPELINE_BUDGETS or the built-in budgets)")
+    audit_parser.add_argument('--platform')
+    audit_parser.add_argument('--root')
+    audit_parser.add_argument('--json', action='store_true')
+    sql_parser = sub.add_parser('sql', help="run a read-only query against the catalog")
+    sql_parser.add_argument('query')
+    args = parser.parse_args(argv)
+
+    with AssetCatalog(args.db) as catalog:
+        if args.command == 'scan':
+            failed = False
+            predictor = None
+            if args.validate and args.learn is not None:
+                predictor = import_core('PerformancePredictor').PerformancePredictor.load(args.learn or None)
+            for root in args.roots:
+                start = time.perf_counter()
+                result = catalog.scan(root, validate=args.validate, predictor=predictor)
+                print(f"{result['root']}: {result['changed']} changed files, {result['manifests']} manifests, "
+                      f"{result['reports']} reports, {result['removed']} removed, {result['validated']} validated "
+                      f"in {time.perf_counter() - start:.2f}s")
+                for error in result['errors']:
+                    print(f"  {error}", file=sys.stderr)
+                failed |= bool(result['errors'])
+            if predictor is not None:
+                print(f"predictor: {predictor.samples} samples -> {predictor.save(args.learn or None)}")
+            raise SystemExit(1 if failed else 0)
+        if args.command == 'find':
+            rows = catalog.find(args.min_polys, args.max_polys, args.nanite, args.texture_issues, args.failed,
+                                args.name, args.root, limit=args.limit)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            else:
+                print_rows(rows)
+                print(f"{len(rows)} assets")
+        elif args.command == 'audit':
+            start = time.perf_counter()
+            result = catalog.audit(import_core('BudgetRules').RuleSet.load(args.rules), args.platform, args.root)
+            seconds = time.perf_counter() - start
+            if args.json:
+                print(json.dumps(result, indent=2))
+            else:
+                for rule, names in sorted(result['violations'].items()):
+                    print(f"{rule}: {len(names)} assets ({', '.join(names[:5])}{', ...' if len(names) > 5 else ''})")
+                print(f"{result['passed']} / {result['assets']} assets within budget ({seconds * 1000:.0f} ms)")
+            raise SystemExit(1 if result['violations'] else 0)
+        elif args.command == 'summary':
+            print(json.dumps(catalog.summary(args.budget), indent=2))
+        else:
+            catalog.db.execute("PRAGMA query_only = ON")
+            try:
+                print(json.dumps(catalog.query(args.query), indent=2))
+            except sqlite3.Error as e:
+                raise SystemExit(f"sql: {e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,589 @@
+import argparse
+import fnmatch
+import hashlib
+import heapq
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+import tracing
+from max_interface import MaxConnectionError, MaxTimeoutError
+from pipeline_io import import_core, read_manifest, write_manifest
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+RETRY = "retry"
+SKIPPED = "skipped"
+REJECTED = "rejected"  # predicted over budget, never exported
+
+
+def job_id_for(object_name, export_path, do_lods, do_nanite):
+    key = f"{object_name}\n{export_path}\n{int(do_lods)}\n{'auto' if do_nanite is None else int(do_nanite)}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+
+
+def safe_file_name(object_name):
+    return re.sub(r'[<>:"/\\|?*\s]+', '_', object_name).strip('_') or "asset"
+
+
+class ExportJob:
+    # do_nanite None leaves the choice to NaniteAdvisor, made from the exported files.
+    def __init__(self, object_name, export_path, do_lods=True, do_nanite=False, priority=0):
+        self.object_name = object_name
+        self.export_path = str(export_path)
+        self.do_lods = do_lods
+        self.do_nanite = do_nanite
+        self.priority = priority
+        self.job_id = job_id_for(object_name, self.export_path, do_lods, do_nanite)
+        self.state = QUEUED
+        self.attempts = 0
+        self.requeues = 0  # handed to another worker after losing one, not counted in attempts
+        self.error = None
+        self.stats = None
+        self.cached = False
+        self.started = None
+        self.finished = None
+
+    def to_dict(self):
+        return {
+            'job': self.job_id,
+            'object': self.object_name,
+            'path': self.export_path,
+            'lods': self.do_lods,
+            'nanite': self.do_nanite,
+            'priority': self.priority,
+        }
+
+    @classmethod
+    def from_dict(cls, record):
+        return cls(record['object'], record['path'], record['lods'], record['nanite'], record.get('priority', 0))
+
+
+class ExportJournal:
+    # Append-only JSON lines. The last line written for a job wins when replaying, so an
+    # interrupted run can be resumed by skipping everything already marked done.
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.file = None
+
+    def load(self):
+        records = {}
+        if not self.path.exists():
+            return records
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash
+                records.setdefault(entry['job'], {}).update(entry)
+        return records
+
+    def record(self, job, state, **extra):
+        entry = dict(job.to_dict(), state=state, attempts=job.attempts, time=time.time(), **extra)
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, 'a', encoding='utf-8')
+            self.file.write(json.dumps(entry) + "\n")
+            self.file.flush()
+            if state in (DONE, FAILED):
+                os.fsync(self.file.fileno())
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class BatchExportEngine:
+    def __init__(self, interface, scene_cache=None, journal_path=None, concurrency=1, max_retries=2,
+                 on_progress=None, export_cache=None, sidecars=False, textures=None, predictor=None, platform=None,
+                 vertex_split=False, vertex_cache=False, overdraw=False, lod_policy=None, max_requeues=3):
+        self.interface = interface
+        self.scene_cache = scene_cache
+        self.export_cache = export_cache
+        self.sidecars = sidecars  # also write .mesh sidecars (mesh_sidecar.py) for offline tools
+        self.textures = textures  # texture_stage.TextureStage auditing each export's textures
+        self.vertex_split = vertex_split  # record render vertices and sections (vertex_split.py)
+        self.vertex_cache = vertex_cache  # reorder triangles/vertices for the GPU (vertex_cache.py)
+        self.overdraw = overdraw
+        # LodPolicy: LOD reductions and screen sizes per object from its triangles and
+        # bounds instead of AssetPipeline's fixed 50/25/12 percent.
+        self.lod_policy = lod_policy
+        self.instancing = []      # instancing.InstanceGroup per unique mesh of dedup'ed batches
+        self.nanite_advisor = None
+        # PerformancePredictor: rejects predicted over-budget objects before export and
+        # records its prediction in each manifest; platform selects the budget rules.
+        self.predictor = predictor
+        self.platform = platform
+        self.complexity = None  # complexity_bounds()
+        self.journal = ExportJournal(journal_path) if journal_path else None
+        self.completed = {}  # journal records, read by resume() only
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.max_requeues = max_requeues
+        self.on_progress = on_progress
+        self.jobs = {}
+        self.queue = []
+        self.order = itertools.count()
+        self.cond = threading.Condition()
+        self.threads = []
+        self.workers_running = 0
+        self.active = 0
+        self.stopping = False
+        self.stats_stale = True
+
+    def emit(self, job, event):
+        if self.on_progress:
+            self.on_progress(job, event)
+
+    def resolve_objects(self, names_or_patterns):
+        if self.scene_cache is None:
+            return list(names_or_patterns)
+        self.scene_cache.refresh()
+        scene_names = self.scene_cache.names()
+        resolved = []
+        for item in names_or_patterns:
+            if any(c in item for c in "*?["):
+                resolved += [n for n in scene_names if fnmatch.fnmatchcase(n, item) and n not in resolved]
+            elif item not in resolved:
+                resolved.append(item)
+        return resolved
+
+    def add_objects(self, names_or_patterns, output_dir, do_lods=True, do_nanite=False, priority=0, dedup=False):
+        # dedup: export one copy of each distinct mesh and record the others in the
+        # folder's instancing map (instancing.py). Needs the scene cache for the hashes.
+        output_dir = Path(output_dir)
+        names = self.resolve_objects(names_or_patterns)
+        if dedup and self.scene_cache is not None:
+            from instancing import group_instances, write_instancing_map
+            groups = group_instances(self.scene_cache, names)
+            names = [g.prototype for g in groups]
+            write_instancing_map(output_dir, groups, {n: safe_file_name(n) + ".fbx" for n in names},
+                                 self.interface.get_unit_scale())
+            self.instancing += groups
+        rejected = self.screen(names, do_lods, do_nanite) if self.predictor is not None else {}
+        jobs = []
+        for name in names:
+            path = output_dir / (safe_file_name(name) + ".fbx")
+            job = ExportJob(name, path, do_lods, do_nanite, priority)
+            jobs.append(self.reject(job, rejected[name]) if name in rejected else self.submit(job))
+        return jobs
+
+    def screen(self, names, do_lods, do_nanite):
+        # Object name -> predicted budget violations, for the objects in the scene cache
+        # that break a triangle or memory rule even at the low end of their prediction.
+        found = [(name, self.scene_cache.find(name)) for name in names] if self.scene_cache is not None else []
+        found = [(name, obj) for name, obj in found if obj is not None and 'error' not in obj]
+        if not found:
+            return {}
+        columns = {
+            'polygons': [obj['tris'] for _, obj in found],
+            'vertices': [obj['verts'] for _, obj in found],
+            'material_slots': [obj.get('slots', 1) for _, obj in found],
+            'lods': [bool(do_lods)] * len(found),
+            'nanite': [bool(do_nanite)] * len(found),
+        }
+        rules = self.predictor.rules
+        categories = [rules.category_of(name) for name, _ in found]
+        with tracing.span("budget_screen", 'export') as span:
+            result = self.predictor.screen(columns, categories, self.platform)
+            span.args['rejected'] = int((~result['passed']).sum())
+        reasons = {}
+        for rule, indices in result['violations'].items():
+            for i in indices:
+                reasons.setdefault(found[i][0], []).append(f"predicted to break {rule}")
+        return {name: "; ".join(r) for name, r in reasons.items()}
+
+    def reject(self, job, reason):
+        with self.cond:
+            existing = self.jobs.get(job.job_id)
+            if existing is not None and existing.state in (QUEUED, RUNNING):
+                return existing
+            self.jobs[job.job_id] = job
+            job.state = REJECTED
+            job.error = reason
+        if self.journal:
+            self.journal.record(job, REJECTED, error=reason)
+        self.emit(job, REJECTED)
+        return job
+
+    def submit(self, job):
+        # A job that already finished (done, failed, cancelled...) is queued again: the
+        # caller asked for a fresh export. Only resume() skips what the journal marks done.
+        with self.cond:
+            existing = self.jobs.get(job.job_id)
+            if existing is not None and existing.state in (QUEUED, RUNNING):
+                return existing
+            self.jobs[job.job_id] = job
+            if self.completed.get(job.job_id, {}).get('state') == DONE:
+                job.state = SKIPPED
+            else:
+                job.state = QUEUED
+                heapq.heappush(self.queue, (-job.priority, next(self.order), job))
+                self.cond.notify()
+        if job.state == SKIPPED:
+            self.emit(job, SKIPPED)
+        else:
+            if self.journal:
+                self.journal.record(job, QUEUED)
+            self.emit(job, QUEUED)
+        return job
+
+    def resume(self):
+        # Re-queue every job the journal knows about that never reached a final state;
+        # jobs it marks done are skipped when submitted again afterwards.
+        self.completed = self.journal.load() if self.journal else {}
+        unfinished = [ExportJob.from_dict(r) for r in self.completed.values() if r['state'] not in (DONE, CANCELLED, REJECTED)]
+        return [self.submit(job) for job in unfinished]
+
+    def cancel(self, job_id):
+        with self.cond:
+            job = self.jobs.get(job_id)
+            if job is None or job.state != QUEUED:
+                return False
+            job.state = CANCELLED
+            self.queue = [entry for entry in self.queue if entry[2] is not job]
+            heapq.heapify(self.queue)
+        if self.journal:
+            self.journal.record(job, CANCELLED)
+        self.emit(job, CANCELLED)
+        return True
+
+    def cancel_all(self):
+        # Queued jobs are dropped; jobs already inside Max run to completion.
+        with self.cond:
+            queued = [entry[2].job_id for entry in self.queue]
+        for job_id in queued:
+            self.cancel(job_id)
+
+    def start(self):
+        with self.cond:
+            self.stopping = False
+            self.stats_stale = True
+            self.threads = [t for t in self.threads if t.is_alive()]
+            for _ in range(self.concurrency - len(self.threads)):
+                self._spawn(self.interface)
+
+    def _spawn(self, interface):
+        # Caller holds the lock.
+        thread = threading.Thread(target=self._worker, args=(interface,), daemon=True)
+        self.threads.append(thread)
+        self.workers_running += 1
+        thread.start()
+        return thread
+
+    def join(self):
+        # Returns once the queue is drained, or once no worker is left to drain it; jobs
+        # still queued at that point stay unfinished in the journal for a later resume.
+        with self.cond:
+            while (self.queue and self.workers_running) or self.active:
+                self.cond.wait()
+            self.stopping = True
+            self.cond.notify_all()
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        if self.export_cache is not None:
+            self.export_cache.flush()
+
+    def run(self):
+        self.start()
+        self.join()
+        return self.summary()
+
+    def summary(self):
+        counts = {}
+        for job in self.jobs.values():
+            counts[job.state] = counts.get(job.state, 0) + 1
+        return counts
+
+    def _next_job(self):
+        with self.cond:
+            while not self.queue:
+                if self.stopping or not self.active:
+                    return None
+                self.cond.wait()
+            _, _, job = heapq.heappop(self.queue)
+            job.state = RUNNING
+            self.active += 1
+            return job
+
+    def _finish(self, job):
+        with self.cond:
+            self.active -= 1
+            self.cond.notify_all()
+
+    def _worker(self, interface):
+        try:
+            while True:
+                job = self._next_job()
+                if job is None:
+                    return
+                try:
+                    if not self._run_job(job, interface):
+                        return
+                finally:
+                    self._finish(job)
+        finally:
+            with self.cond:
+                self.workers_running -= 1
+                self.cond.notify_all()
+
+    def stats_for(self, job, interface):
+        if self.scene_cache is None:
+            return interface.get_object_stats(job.object_name)
+        with self.cond:
+            refresh, self.stats_stale = self.stats_stale, False
+        return self.scene_cache.get_stats(job.object_name, refresh=refresh)
+
+    def decide_nanite(self, job):
+        from fbx_reader import advise_nanite
+        with self.cond:
+            if self.nanite_advisor is None:
+                rules = import_core('BudgetRules').RuleSet.load()
+                self.nanite_advisor = import_core('NaniteAdvisor').NaniteAdvisor.from_rules(rules)
+        return advise_nanite(job.export_path, self.nanite_advisor)
+
+    def plan_lods(self, job):
+        # LodPolicy plan for the job, or None to keep the fixed levels: no policy, no LODs
+        # asked for, or no bounds (stats from get_object_stats rather than the scene cache).
+        if self.lod_policy is None or not job.do_lods or not job.stats or not job.stats.get('radius_cm'):
+            return None
+        return self.lod_policy.plan(job.stats.get('polygons', 0), job.stats['radius_cm'], self.platform)
+
+    def record_lod_plan(self, job, plan):
+        # 'lod_levels' in the shape the importers read, plus the plan with its reasons.
+        metadata = read_manifest(job.export_path)
+        if metadata is None:
+            return
+        metadata['lod_levels'] = [{'reduction': r, 'screen_size': s}
+                                  for r, s in zip(plan['reductions'], plan['screen_sizes'][1:])]
+        metadata['lod_policy'] = plan
+        write_manifest(job.export_path, metadata)
+
+    def complexity_bounds(self):
+        # The rule set's complexity classes, so the MaxScript estimate classifies like
+        # the predictor and ValidationEngine.
+        if self.complexity is None:
+            rules = self.predictor.rules if self.predictor is not None else import_core('BudgetRules').RuleSet.load()
+            self.complexity = dict(rules.complexity)
+        return self.complexity
+
+    def record_prediction(self, job):
+        # The prediction for the exported asset, from its manifest, replaces the manifest's
+        # 'complexity' so it uses the same classes as validation.
+        metadata = read_manifest(job.export_path)
+        if metadata is None:
+            return None
+        prediction = self.predictor.predict(metadata.get('polygons', 0), metadata.get('vertices', 0),
+                                            metadata.get('material_slots', 1), bool(metadata.get('lod_count')),
+                                            bool(metadata.get('enable_nanite')),
+                                            [level['reduction'] for level in metadata.get('lod_levels') or []] or None)
+        metadata['prediction'] = prediction
+        metadata['complexity'] = prediction['complexity']
+        write_manifest(job.export_path, metadata)
+        return prediction
+
+    def worker_lost(self, job, interface, error):
+        # Hook for pools of monitors: return True to take the worker out of service
+        # and hand the job to another one instead of counting a retry (up to
+        # max_requeues times per job). Timeouts are not a lost worker, just a retry.
+        return False
+
+    def requeue(self, job):
+        with self.cond:
+            job.state = QUEUED
+            heapq.heappush(self.queue, (-job.priority, next(self.order), job))
+            self.cond.notify()
+
+    def _run_job(self, job, interface):
+        with tracing.context(asset=job.object_name, job=job.job_id, attempt=job.attempts + 1):
+            with tracing.span("job", 'export'):
+                return self._attempt(job, interface)
+
+    def _attempt(self, job, interface):
+        job.attempts += 1
+        job.started = time.time()
+        if self.journal:
+            self.journal.record(job, RUNNING)
+        self.emit(job, RUNNING)
+        try:
+            Path(job.export_path).parent.mkdir(parents=True, exist_ok=True)
+            with tracing.span("scene_stats", 'export'):
+                job.stats = self.stats_for(job, interface)
+            plan = None
+            if self.lod_policy is not None:
+                with tracing.span("lod_policy", 'export') as span:
+                    plan = self.plan_lods(job)
+                    span.args['lods'] = plan and plan['lod_count']
+            lod_levels = plan['reductions'] if plan else None
+            cache_key = None
+            if self.export_cache is not None:
+                with tracing.span("cache_restore", 'cache') as span:
+                    reorder = self.vertex_cache and ('overdraw' if self.overdraw else 'vertex_cache')
+                    # The screen sizes go into the manifest, so they are part of the key too.
+                    levels = plan and [[r, s] for r, s in zip(plan['reductions'], plan['screen_sizes'][1:])]
+                    cache_key = self.export_cache.key_for(job.object_name, job.stats, job.do_lods, job.do_nanite,
+                                                          levels, reorder)
+                    job.cached = span.args['hit'] = self.export_cache.restore(cache_key, job.export_path)
+            if not job.cached:
+                interface.export_fbx(job.object_name, job.export_path, job.do_lods, job.do_nanite, lod_levels,
+                                     self.complexity_bounds())
+                if plan is not None:
+                    self.record_lod_plan(job, plan)
+                if job.do_nanite is None:
+                    # Before the vertex cache pass, which leaves meshes going to Nanite alone.
+                    with tracing.span("nanite_decision", 'export') as span:
+                        span.args['mode'] = self.decide_nanite(job)['mode']
+                if self.vertex_cache:
+                    # Before the sidecars and the cache store, which should see the new order.
+                    from vertex_cache import optimize_export
+                    with tracing.span("vertex_cache", 'export') as span:
+                        report = optimize_export(job.export_path, overdraw=self.overdraw)
+                        span.args['acmr'] = report and report['lods'][0]['acmr_after']
+            if self.sidecars:
+                from mesh_sidecar import write_for_export
+                with tracing.span("sidecar", 'export'):
+                    write_for_export(job.export_path)
+            if self.vertex_split and not job.cached:
+                from vertex_split import update_manifest
+                with tracing.span("vertex_split", 'export') as span:
+                    span.args['render_vertices'] = update_manifest(job.export_path)['render_vertices'][0]
+            if self.textures is not None:
+                # Also after a cache hit: the geometry key does not cover the texture files.
+                with tracing.span("texture_audit", 'export') as span:
+                    span.args['textures'] = len(self.textures.audit_export(job.export_path)['textures'])
+            if self.predictor is not None and not job.cached:
+                with tracing.span("prediction", 'export') as span:
+                    prediction = self.record_prediction(job)
+                    span.args['complexity'] = prediction and prediction['complexity']
+            if not job.cached and self.export_cache is not None:
+                with tracing.span("cache_store", 'cache'):
+                    self.export_cache.store(cache_key, job.export_path, since=job.started)
+        except Exception as e:
+            job.error = str(e)
+            lost = (isinstance(e, MaxConnectionError) and not isinstance(e, MaxTimeoutError)
+                    and self.worker_lost(job, interface, e))
+            if lost and job.requeues < self.max_requeues:
+                job.requeues += 1
+                job.attempts -= 1
+                self.requeue(job)
+                if self.journal:
+                    self.journal.record(job, RETRY, error=job.error)
+                self.emit(job, RETRY)
+                return False
+            if job.attempts <= self.max_retries and not self.stopping:
+                self.requeue(job)
+                if self.journal:
+                    self.journal.record(job, RETRY, error=job.error)
+                self.emit(job, RETRY)
+            else:
+                job.state = FAILED
+                job.finished = time.time()
+                if self.journal:
+                    self.journal.record(job, FAILED, error=job.error)
+                self.emit(job, FAILED)
+            return not lost
+        job.state = DONE
+        job.error = None
+        job.finished = time.time()
+        if self.journal:
+            self.journal.record(job, DONE, seconds=round(job.finished - job.started, 3), cached=job.cached)
+        self.emit(job, DONE)
+        return True
+
+
+def print_progress(job, event):
+    detail = f" ({job.error})" if event in (RETRY, FAILED, REJECTED) and job.error else ""
+    if event == DONE and job.cached:
+        detail = " (cached)"
+    print(f"[{event.upper():>9}] {job.object_name} -> {job.export_path}{detail}", flush=True)
+
+
+def main(argv=None, prog=None):
+    import config
+    from max_interface import MaxScriptInterface
+    from scene_cache import SceneCache
+
+    parser = argparse.ArgumentParser(prog=prog, description="Export scene objects from 3ds Max without the GUI")
+    parser.add_argument('objects', nargs='*', default=["*"], help="object names or wildcard patterns")
+    parser.add_argument('--out', required=True, help="directory the FBX files are written to")
+    parser.add_argument('--no-lods', action='store_true', help="skip LOD generation")
+    nanite = parser.add_mutually_exclusive_group()
+    nanite.add_argument('--nanite', dest='nanite', action='store_true', default=None,
+                        help="flag every asset for Nanite (default: decided per asset by NaniteAdvisor)")
+    nanite.add_argument('--no-nanite', dest='nanite', action='store_false', help="never use Nanite")
+    parser.add_argument('--priority', type=int, default=0)
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--journal', help="journal file (default: <out>/export_journal.jsonl)")
+    parser.add_argument('--resume', action='store_true', help="re-queue unfinished jobs from the journal and skip the ones it marks done")
+    parser.add_argument('--channel-dir', help="monitor channel directory")
+    parser.add_argument('--cache', help="export cache directory; unchanged assets are not re-exported")
+    parser.add_argument('--cache-max-gb', type=float, help="evict least recently used cache entries above this size")
+    parser.add_argument('--cache-max-age-days', type=float, help="evict cache entries unused for this long")
+    parser.add_argument('--sidecars', action='store_true', help="write a binary .mesh sidecar next to every FBX")
+    parser.add_argument('--vertex-split', action='store_true',
+                        help="record render vertices and draw sections of each export in its manifest")
+    parser.add_argument('--vertex-cache', action='store_true',
+                        help="reorder each export's triangles and vertices for the GPU vertex cache")
+    parser.add_argument('--overdraw', action='store_true', help="with --vertex-cache, also order for less overdraw")
+    parser.add_argument('--lod-policy', action='store_true',
+                        help="size LODs and their screen sizes per object (LodPolicy, budget rules 'lods')")
+    parser.add_argument('--dedup', action='store_true', help="export identical meshes once and write instancing.json")
+    parser.add_argument('--no-texture-audit', action='store_true', help="keep 3ds Max's texture_issues as written")
+    parser.add_argument('--predict', nargs='?', const='', metavar='MODEL',
+                        help="skip objects predicted over budget and record predictions in the manifests "
+                             "(default model: $PIPELINE_PREDICTOR or the temp folder)")
+    parser.add_argument('--platform', help="target platform for platform-specific budgets")
+    parser.add_argument('--condition-textures', nargs='?', const=config.TEXTURE_CACHE_DIR, metavar='CACHE_DIR',
+                        help="write power-of-two, mipped copies of failing textures to this cache")
+    args = parser.parse_args(argv)
+
+    interface = MaxScriptInterface(args.channel_dir)
+    if not interface.test_connection():
+        raise SystemExit("Connection failed. Make sure monitor.ms is running in Max.")
+    cache = None
+    if args.cache:
+        from export_cache import ExportCache
+        cache = ExportCache(args.cache, args.cache_max_gb and int(args.cache_max_gb * 1024 ** 3), args.cache_max_age_days)
+    textures = None
+    if not args.no_texture_audit:
+        from texture_stage import TextureStage
+        textures = TextureStage(cache_dir=args.condition_textures)
+    predictor = None
+    if args.predict is not None:
+        predictor = import_core('PerformancePredictor').PerformancePredictor.load(args.predict or None)
+    lod_policy = None
+    if args.lod_policy:
+        lod_policy = import_core('LodPolicy').LodPolicy.from_rules(import_core('BudgetRules').RuleSet.load())
+    engine = BatchExportEngine(interface, SceneCache(interface),
+                               journal_path=args.journal or Path(args.out) / "export_journal.jsonl",
+                               max_retries=args.retries, on_progress=print_progress, export_cache=cache,
+                               sidecars=args.sidecars, textures=textures, predictor=predictor,
+                               platform=args.platform or os.environ.get('PIPELINE_PLATFORM'),
+                               vertex_split=args.vertex_split, vertex_cache=args.vertex_cache or args.overdraw,
+                               overdraw=args.overdraw, lod_policy=lod_policy)
+    if args.resume:
+        engine.resume()
+    engine.add_objects(args.objects, args.out, not args.no_lods, args.nanite, args.priority, args.dedup)
+    if engine.instancing:
+        from instancing import dedup_summary
+        print("Dedup: " + ", ".join(f"{k}={v}" for k, v in dedup_summary(engine.instancing).items()))
+    summary = engine.run()
+    print("Summary: " + ", ".join(f"{k}={v}" for k, v in sorted(summary.items())))
+    raise SystemExit(1 if summary.get(FAILED) else 0)
+
+
+if __name__ == '__main__':
+    main()
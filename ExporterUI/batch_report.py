@@ -0,0 +1,408 @@
+import argparse
+import bisect
+import functools
+import hashlib
+import html
+import json
+import os
+import string
+import time
+import webbrowser
+from pathlib import Path
+
+from asset_catalog import AssetCatalog, normalize, pass_accuracy
+
+# One paginated HTML report for a whole batch, read from the asset catalog.
+REPORT_VERSION = 3
+PAGE_SIZE = 250
+FIRST_PAGE = "page_0001.html"  # every sort's first page, linked from the index
+STATUSES = ("IMPORT FAILED", "IMPORT CANCELLED", "FAILED VALIDATION", "OVER BUDGET", "TEXTURE ISSUES", "NOT VALIDATED", "PASSED")
+
+# sort: (column heading, [(row column, descending)]), then by name and FBX path. NULLs
+# sort first, so DESC leaves unmeasured rows last.
+SORTS = {
+    'name': ("Asset", []),
+    'status': ("Status", [('severity', False)]),
+    'polygons': ("Polygons", [('polygons', True)]),
+    'budget': ("Budget", [('budget_percent', True)]),
+    'error': ("Error", [('error', True)]),
+    'memory': ("Memory", [('memory_mb', True)]),
+    'texture': ("Texture Audit", [('texture_ok', False)]),
+}
+NOCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)  # SQLite's NOCASE folds ASCII only
+
+# histogram: (title, row column, bin edges)
+HISTOGRAMS = {
+    'error': ("Triangle count error (%)", 'error', (1, 2, 5, 10, 25)),
+    'budget': ("Share of the triangle budget (%)", 'budget_percent', (25, 50, 75, 100, 150, 200)),
+    'memory': ("GPU memory (MB)", 'memory_mb', (0.5, 1, 2, 5, 10, 20, 50)),
+}
+# texture_stage.texture_issues wording -> histogram bin
+TEXTURE_ISSUES = {
+    'too large': "is too large.",
+    'not power of two': "is NOT Power of Two.",
+    'missing': "is missing.",
+    'unreadable': "could not be read",
+}
+
+ROWS_SQL = """
+SELECT *, CASE
+        WHEN import_status = 'CANCELLED' THEN 1
+        WHEN import_status IS NOT NULL AND import_status NOT LIKE 'PASSED%' THEN 0
+        WHEN accuracy < ? OR passed = 0 THEN 2
+        WHEN budget IS NOT NULL AND polygons > budget THEN 3
+        WHEN texture_issues != '' THEN 4
+        WHEN accuracy IS NULL AND import_status IS NULL THEN 5
+        ELSE 6 END AS severity,
+    100.0 * polygons / budget AS budget_percent, texture_issues = '' AS texture_ok
+FROM (
+    SELECT a.fbx, a.name, a.polygons, COALESCE(i.lods, a.lod_count) AS lods, a.nanite, a.texture_issues,
+           v.accuracy, v.memory_mb, json_extract(v.result, '$.passed') AS passed,
+           json_extract(v.result, '$.violations') AS violations,
+           COALESCE(v.poly_error, 100 - i.accuracy) AS error, i.status AS import_status,
+           COALESCE(json_extract(v.result, '$.actual_triangles'), i.actual_tris) AS actual_tris,
+           report_budget(a.name, json_extract(a.manifest, '$.category')) AS budget,
+           json_extract(a.manifest, '$.lod_levels') AS lod_levels,
+           json_extract(a.manifest, '$.nanite_decision.mode') AS nanite_mode,
+           json_extract(a.manifest, '$.vertex_cache.lods[0]') AS vertex_cache
+    FROM assets a LEFT JOIN validation v ON v.fbx = a.fbx LEFT JOIN imports i ON i.fbx = a.fbx
+    WHERE a.root IN ({roots})
+)
+"""
+
+# Everything the pages are made of changes one of these, so an equal state means the
+# report on disk is current.
+STATE_SQL = """
+SELECT COUNT(*), MAX(a.indexed_at), COUNT(v.fbx), MAX(v.validated_at), COUNT(i.fbx), TOTAL(i.imported_at)
+FROM assets a LEFT JOIN validation v ON v.fbx = a.fbx LEFT JOIN imports i ON i.fbx = a.fbx
+WHERE a.root IN ({roots})
+"""
+
+
+def bin_labels(edges):
+    return ([f"< {edges[0]:g}"] + [f"{a:g} - {b:g}" for a, b in zip(edges, edges[1:])]
+            + [f">= {edges[-1]:g}", "not measured"])
+
+
+def order_by(sort):
+    return ", ".join([f"{column}{' DESC' if descending else ''}" for column, descending in SORTS[sort][1]]
+                     + ["name COLLATE NOCASE", "fbx"])
+
+
+def sort_key(row, sort):
+    # order_by(sort) as a Python tuple, to place rows on the key ranges of the pages.
+    key = []
+    for column, descending in SORTS[sort][1]:
+        value = row[column]
+        if value is None:
+            key += [2 if descending else 0, 0]
+        else:
+            key += [1, -value if descending else value]
+    name = row['name']
+    key += [0, ""] if name is None else [1, name.translate(NOCASE)]
+    return tuple(key + [row['fbx']])
+
+
+def page_file(start):
+    return FIRST_PAGE if start is None else f"page_{hashlib.sha1(repr(start).encode('utf-8')).hexdigest()[:12]}.html"
+
+
+def report_paths(report_path):
+    # index HTML -> (pages directory, summary JSON). The summary does not end in
+    # 'report.json', so the catalog does not take it for an import report.
+    base = str(report_path)[:-len('.html')] if str(report_path).endswith('.html') else str(report_path)
+    return Path(base + "_pages"), Path(base + "_summary.json")
+
+
+def write_text(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
+
+
+class BatchReport:
+    def __init__(self, catalog, rules=None, platform=None, page_size=PAGE_SIZE):
+        if rules is None:
+            from pipeline_io import import_core
+            rules = import_core('BudgetRules').RuleSet.load()
+        self.catalog = catalog
+        self.rules = rules
+        self.platform = platform
+        self.page_size = page_size
+        # SQLite calls the function once per use of the column, so repeats are cached.
+        self.budget = functools.lru_cache(maxsize=1024)(self.budget)
+        catalog.db.create_function('report_budget', 2, self.budget, deterministic=True)
+
+    def budget(self, name, category):
+        # Triangle budget of an asset: the manifest's category, else the name patterns.
+        return self.rules.limit('triangles', category or self.rules.category_of(name or ""), self.platform)
+
+    def rows(self, roots, sort):
+        sql = ROWS_SQL.format(roots=", ".join("?" * len(roots))) + f" ORDER BY {order_by(sort)}"
+        cursor = self.catalog.db.execute(sql, [pass_accuracy(self.rules, platform=self.platform)]
+                                         + [normalize(r) for r in roots])
+        while True:
+            rows = cursor.fetchmany(self.page_size)
+            if not rows:
+                return
+            yield from rows
+
+    def pages(self, roots, sort, boundaries=()):
+        # (start key, rows) per page in the sort's order, off one cursor; the first page's
+        # start is None. A row goes to the page whose key range held it last time
+        # (boundaries: the sorted start keys of the previous run's pages). Pages that grow
+        # to twice page_size are split, ones under a quarter of it are merged into the
+        # next, and rows past the last boundary are cut into pages of page_size.
+        start, rows, index, first = None, [], 0, True
+        for row in self.rows(roots, sort):
+            key = sort_key(row, sort)
+            page = bisect.bisect_right(boundaries, key)
+            if page != index:
+                index = page
+                if len(rows) >= max(1, self.page_size // 4):
+                    yield (None if first else start), rows
+                    start, rows, first = None, [], False
+            if not rows:
+                start = key
+            rows.append(row)
+            if index == len(boundaries) and len(rows) == self.page_size:
+                yield (None if first else start), rows
+                start, rows, first = None, [], False
+            elif len(rows) == 2 * self.page_size:
+                yield (None if first else start), rows[:self.page_size]
+                start, rows, first = sort_key(rows[self.page_size], sort), rows[self.page_size:], False
+        if rows or first:
+            yield (None if first else start), rows
+
+    def state(self, roots, title):
+        row = self.catalog.db.execute(STATE_SQL.format(roots=", ".join("?" * len(roots))),
+                                      [normalize(r) for r in roots]).fetchone()
+        budgets = [[r.metric, r.bound, r.value, r.category, r.platform] for r in self.rules.rules
+                   if r.metric in ('triangles', 'accuracy_score')]
+        return [REPORT_VERSION, self.page_size, title, self.platform, budgets, self.rules.categories,
+                sorted(normalize(r) for r in roots), list(row)]
+
+    def write(self, report_path, roots, title="Pipeline Batch Report", note=""):
+        start = time.perf_counter()
+        report_path = Path(report_path)
+        pages_dir, summary_path = report_paths(report_path)
+        state = json.loads(json.dumps(self.state(roots, title)))
+        old = {}
+        try:
+            with open(summary_path, 'r', encoding='utf-8') as f:
+                old = json.load(f)
+        except (OSError, ValueError):
+            pass
+        previous = old.get('pages', {}) if old.get('version') == REPORT_VERSION and old.get('page_size') == self.page_size else {}
+        if old.get('state') == state and report_path.exists():
+            # Nothing in the catalog changed for these roots: only the note is new.
+            summary = dict(old, generated=time.time(), note=note, written=0, unchanged=len(previous))
+            return self.finish(summary, report_path, summary_path, start)
+
+        assets = state[-1][0]
+        old_boundaries = old.get('boundaries', {}) if previous else {}
+        statuses = dict.fromkeys(STATUSES, 0)
+        histograms = {name: [0] * (len(edges) + 2) for name, (_, _, edges) in HISTOGRAMS.items()}
+        textures = dict.fromkeys(TEXTURE_ISSUES, 0)
+        totals = {'polygons': 0, 'validated': 0, 'imported': 0}
+        digests, boundaries, written = {}, {}, 0
+
+        def emit(sort, page, previous_page, next_page):
+            # Writes one page once its neighbours are known (they are in its links).
+            nonlocal written
+            start, rows = page
+            key = f"{sort}/{page_file(start)}"
+            links = [previous_page and page_file(previous_page[0]), next_page and page_file(next_page[0])]
+            digest = hashlib.sha1(repr([REPORT_VERSION, title, key, links]
+                                       + [tuple(row) for row in rows]).encode('utf-8')).hexdigest()
+            digests[key] = digest
+            if previous.get(key) != digest or not (pages_dir / key).exists():
+                write_text(pages_dir / key, self.render_page(rows, sort, *links, report_path, title))
+                written += 1
+
+        for sort in SORTS:
+            starts = [tuple(key) for key in old_boundaries.get(sort, [])]
+            boundaries[sort] = []
+            window = [None, None]  # the page before the one waiting to be written, and that page
+            for page in self.pages(roots, sort, starts):
+                if sort == 'status':
+                    for row in page[1]:
+                        statuses[STATUSES[row['severity']]] += 1
+                        for name, (_, column, edges) in HISTOGRAMS.items():
+                            value = row[column]
+                            histograms[name][len(edges) + 1 if value is None else bisect.bisect_right(edges, value)] += 1
+                        for kind, phrase in TEXTURE_ISSUES.items():
+                            textures[kind] += row['texture_issues'].count(phrase)
+                        totals['polygons'] += row['polygons'] or 0
+                        totals['validated'] += row['accuracy'] is not None
+                        totals['imported'] += row['import_status'] is not None
+                if page[0] is not None:
+                    boundaries[sort].append(page[0])
+                if window[1] is not None:
+                    emit(sort, window[1], window[0], page)
+                window = [window[1], page]
+            emit(sort, window[1], window[0], None)
+        for key in set(previous) - set(digests):
+            try:
+                os.remove(pages_dir / key)
+            except OSError:
+                pass
+
+        summary = {
+            'version': REPORT_VERSION,
+            'generated': time.time(),
+            'title': title,
+            'note': note,
+            'roots': [normalize(r) for r in roots],
+            'assets': assets,
+            'passed': statuses["PASSED"],
+            'statuses': statuses,
+            'totals': totals,
+            'histograms': {name: {'title': label, 'bins': bin_labels(edges), 'counts': histograms[name]}
+                           for name, (label, _, edges) in HISTOGRAMS.items()},
+            'texture_issues': textures,
+            'page_size': self.page_size,
+            'pages': digests,
+            'boundaries': boundaries,
+            'state': state,
+            'written': written,
+            'unchanged': len(digests) - written,
+        }
+        return self.finish(summary, report_path, summary_path, start)
+
+    def finish(self, summary, report_path, summary_path, start):
+        write_text(report_path, self.render_index(summary, report_path))
+        summary['seconds'] = round(time.perf_counter() - start, 3)
+        write_text(summary_path, json.dumps(summary, indent=2))
+        return summary
+
+    def render_page(self, rows, sort, previous_page, next_page, report_path, title):
+        # previous_page / next_page: file names of the neighbouring pages, None at the ends.
+        def link(target, page, text):
+            return f'<a style="color: #8cf" href="../{target}/{page}">{text}</a>'
+
+        headings = "".join(f"<th>{link(s, FIRST_PAGE, label) if s != sort else label + ' &#9660;'}</th>"
+                           for s, (label, _) in SORTS.items() if s != 'texture')
+        nav = " ".join(filter(None, [
+            link(sort, previous_page, "&larr; previous") if previous_page else "",
+            f"{len(rows)} assets",
+            link(sort, next_page, "next &rarr;") if next_page else "",
+        ]))
+        body = "".join(self.render_row(row) for row in rows)
+        return f'''<html>
+<body style="font-family: Arial; background-color: #333; color: white; padding: 20px;">
+    <h1>{html.escape(title)}</h1>
+    <p><a style="color: #8cf" href="../../{html.escape(report_path.name)}">Summary</a> &middot; {nav}</p>
+    <table border="1" cellpadding="8" style="width:100%; border-collapse: collapse; text-align: left;">
+        <tr>{headings}<th>LODs (Screen Sizes)</th><th>Nanite</th><th>Vertex Cache (LOD0)</th><th>{link('texture', FIRST_PAGE, "Texture Audit") if sort != 'texture' else "Texture Audit &#9660;"}</th></tr>
+        {body}
+    </table>
+    <p>{nav}</p>
+</body>
+</html>
+'''
+
+    def render_row(self, r):
+        status = STATUSES[r['severity']]
+        color = "green" if status == "PASSED" else "gray" if status in ("NOT VALIDATED", "IMPORT CANCELLED") else "red"
+        violations = json.loads(r['violations']) if r['violations'] else []
+        detail = f'<br><small>{html.escape("; ".join(violations))}</small>' if violations else ""
+        actual = "-" if r['actual_tris'] is None else r['actual_tris']
+        lods = "-" if r['lods'] is None else str(r['lods'])
+        if r['lod_levels']:
+            lods += " (" + ", ".join(f"{level['screen_size']:g}" for level in json.loads(r['lod_levels'])) + ")"
+        nanite = ("ENABLED" if r['nanite'] else "Disabled") + (f" (auto: {r['nanite_mode']})" if r['nanite_mode'] else "")
+        cache = "-"
+        if r['vertex_cache']:
+            stats = json.loads(r['vertex_cache'])
+            cache = f"ACMR {stats['acmr_before']} &rarr; {stats['acmr_after']}, ATVR {stats['atvr_before']} &rarr; {stats['atvr_after']}"
+
+        def number(value, fmt, unit=""):
+            return "-" if value is None else format(value, fmt) + unit
+
+        return (f'<tr><td>{html.escape(r["name"] or "")}</td><td style="color: {color}">{status}{detail}</td>'
+                f'<td>{actual} (Pred: {r["polygons"]})</td><td>{number(r["budget_percent"], ".0f", "%")}</td>'
+                f'<td>{number(r["error"], ".1f", "%")}</td><td>{number(r["memory_mb"], ".2f", " MB")}</td>'
+                f'<td>{lods}</td><td>{nanite}</td><td>{cache}</td>'
+                f'<td>{html.escape(r["texture_issues"]) if r["texture_issues"] else "OK"}</td></tr>\n')
+
+    def render_index(self, summary, report_path):
+        pages = report_paths(report_path)[0].name
+        sorts = " &middot; ".join(f'<a style="color: #8cf" href="{pages}/{sort}/{FIRST_PAGE}">{label}</a>'
+                                  for sort, (label, _) in SORTS.items())
+        statuses = "".join(f"<tr><td>{status}</td><td>{count}</td></tr>" for status, count in summary['statuses'].items())
+        charts = [("Texture issues (textures)", list(summary['texture_issues']), list(summary['texture_issues'].values()))]
+        charts = [(h['title'], h['bins'], h['counts']) for h in summary['histograms'].values()] + charts
+        histograms = "".join(self.render_histogram(*chart) for chart in charts)
+        return f'''<html>
+<body style="font-family: Arial; background-color: #333; color: white; padding: 20px;">
+    <h1>{html.escape(summary['title'])}</h1>
+    <div style="background-color: #444; padding: 15px; border-radius: 5px;">
+        <h2>{summary['passed']} / {summary['assets']} assets passed</h2>
+        <p>{html.escape(summary['note'])}</p>
+        <p>{summary['totals']['polygons']} polygons; {summary['totals']['validated']} validated, {summary['totals']['imported']} imported</p>
+    </div>
+    <h2>Assets</h2>
+    <p>Pages of about {self.page_size} assets, sorted by: {sorts}</p>
+    <table border="1" cellpadding="8" style="border-collapse: collapse; text-align: left;">
+        <tr><th>Status</th><th>Assets</th></tr>
+        {statuses}
+    </table>
+    {histograms}
+</body>
+</html>
+'''
+
+    def render_histogram(self, title, labels, counts):
+        peak = max(counts) or 1
+        rows = "".join(f'<tr><td>{html.escape(label)}</td><td><div style="background-color: #8cf; height: 12px; '
+                       f'width: {300 * count // peak}px"></div></td><td>{count}</td></tr>'
+                       for label, count in zip(labels, counts))
+        return f'''
+    <h2>{html.escape(title)}</h2>
+    <table cellpadding="4" style="border-collapse: collapse; text-align: left;">{rows}</table>'''
+
+
+def update_report(roots, report_path, db_path=None, validate=False, rules=None, platform=None, page_size=PAGE_SIZE,
+                  imports=(), title="Pipeline Batch Report", note=""):
+    # Brings the catalog up to date with the roots (and import reports written outside
+    # them), then rewrites the report pages that changed. Returns the summary.
+    with AssetCatalog(db_path) as catalog:
+        for root in roots:
+            catalog.scan(root, validate=validate)
+        for path in imports:
+            catalog.index_report(path)
+        return BatchReport(catalog, rules, platform, page_size).write(report_path, roots, title, note)
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="One paginated, sortable HTML report for whole export batches")
+    parser.add_argument('roots', nargs='+', help="export folders")
+    parser.add_argument('--out', help="report HTML (default: <first root>/Batch_Report.html)")
+    parser.add_argument('--db', help="catalog file (default: $PIPELINE_CATALOG or the asset_catalog default)")
+    parser.add_argument('--validate', action='store_true', help="validate changed FBX files offline first")
+    parser.add_argument('--rules', help="budget rules JSON (default: $PIPELINE_BUDGETS or the built-in budgets)")
+    parser.add_argument('--platform', default=os.environ.get('PIPELINE_PLATFORM'))
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    parser.add_argument('--open', action='store_true', help="open the report in the browser")
+    parser.add_argument('--json', action='store_true', help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    from pipeline_io import import_core
+    report_path = args.out or os.path.join(args.roots[0], "Batch_Report.html")
+    summary = update_report(args.roots, report_path, args.db, args.validate,
+                            import_core('BudgetRules').RuleSet.load(args.rules), args.platform, args.page_size)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{report_path}: {summary['passed']}/{summary['assets']} passed, "
+              + ", ".join(f"{status.lower()} {count}" for status, count in summary['statuses'].items() if count))
+        print(f"{len(summary['pages'])} pages, {summary['written']} written, {summary['unchanged']} unchanged "
+              f"in {summary['seconds']:.2f}s")
+    if args.open:
+        webbrowser.open('file://' + os.path.realpath(report_path))
+
+
+if __name__ == '__main__':
+    main()
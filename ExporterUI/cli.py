@@ -0,0 +1,42 @@
+import importlib
+import sys
+
+# Headless entry point: `python -m ExporterUI <command> ...`, importing only the chosen command.
+PROG = "python -m ExporterUI"
+
+# command: (module, fixed leading arguments, help)
+COMMANDS = {
+    'export': ('batch_engine', [], "export scene objects from 3ds Max (monitor.ms must be running)"),
+    'import-script': ('unreal_importer', [], "write the Unreal script that imports an FBX or an export folder"),
+    'validate': ('fbx_reader', ['--validate'], "check exports offline against their manifests and budgets"),
+    'stats': ('fbx_reader', [], "print triangle/vertex/UV/material counts read from the FBX files"),
+    'vertex-split': ('vertex_split', [], "count render vertices, draw sections and UV/normal seams of exports"),
+    'vertex-cache': ('vertex_cache', [], "reorder exported triangles and vertices for the GPU vertex cache"),
+    'index': ('asset_catalog', [], "index export roots into the SQLite catalog and query it"),
+    'report': ('batch_report', [], "write one paginated, sortable HTML/JSON report for export folders"),
+    'gui': ('main', [], "open the exporter window"),
+}
+
+
+def usage():
+    lines = [f"usage: {PROG} <command> [options]", "", "commands:"]
+    lines += [f"  {name:<15}{help_text}" for name, (_, _, help_text) in COMMANDS.items()]
+    lines += ["", f"`{PROG} <command> --help` lists the options of a command."]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0 if argv else 2
+    command = COMMANDS.get(argv[0])
+    if command is None:
+        print(f"{PROG}: unknown command '{argv[0]}'\n\n{usage()}", file=sys.stderr)
+        return 2
+    module_name, fixed, _ = command
+    return importlib.import_module(module_name).main(fixed + argv[1:], prog=f"{PROG} {argv[0]}")
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
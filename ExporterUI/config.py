@@ -1,2 +1,11 @@
+import os
+import tempfile
+
 WINDOW_WIDTH = 900
-WINDOW_HEIGHT = 700
\ No newline at end of file
+WINDOW_HEIGHT = 700
+
+EXPORT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "3dsMaxPipelineCache")
+EXPORT_CACHE_MAX_BYTES = 20 * 1024 ** 3
+EXPORT_CACHE_MAX_AGE_DAYS = 30
+
+TEXTURE_CACHE_DIR = os.path.join(tempfile.gettempdir(), "3dsMaxPipelineTextures")
\ No newline at end of file
@@ -0,0 +1,506 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_LOD_LEVELS = (50, 25, 12)
+BOUNDARY_WEIGHT = 100.0
+BATCH_SHARE = 0.1  # share of the cheapest edges each simplification pass considers
+MAX_ROUNDS = 8     # independent-set rounds per pass
+NEVER = np.iinfo(np.int64).max
+
+
+def face_planes(positions, faces):
+    v0, v1, v2 = positions[faces[:, 0]], positions[faces[:, 1]], positions[faces[:, 2]]
+    normals = cross(v1 - v0, v2 - v0)
+    lengths = np.linalg.norm(normals, axis=1)
+    safe = np.where(lengths > 0, lengths, 1.0)
+    unit = normals / safe[:, None]
+    planes = np.concatenate([unit, -np.einsum('ij,ij->i', unit, v0)[:, None]], axis=1)
+    return planes, lengths * 0.5
+
+
+def accumulate_quadrics(count, indices, planes, weights):
+    # Sum of weighted plane outer products per vertex, one bincount per matrix entry.
+    outer = planes[:, :, None] * planes[:, None, :] * weights[:, None, None]
+    quadrics = np.empty((count, 4, 4))
+    for i in range(4):
+        for j in range(i, 4):
+            quadrics[:, i, j] = quadrics[:, j, i] = np.bincount(indices, outer[:, i, j], minlength=count)
+    return quadrics
+
+
+def vertex_quadrics(positions, faces):
+    planes, areas = face_planes(positions, faces)
+    quadrics = accumulate_quadrics(len(positions), faces.ravel(), np.repeat(planes, 3, axis=0), np.repeat(areas, 3))
+
+    # Open borders get a plane perpendicular to their face so they don't shrink inward.
+    edges = np.sort(np.concatenate([faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]]), axis=1)
+    owner = np.tile(np.arange(len(faces)), 3)
+    unique, first, counts = np.unique(edges, axis=0, return_index=True, return_counts=True)
+    border = counts == 1
+    if border.any():
+        a, b = unique[border, 0], unique[border, 1]
+        direction = positions[b] - positions[a]
+        normal = cross(direction, planes[owner[first[border]], :3])
+        lengths = np.linalg.norm(normal, axis=1)
+        keep = lengths > 0
+        normal = normal[keep] / lengths[keep, None]
+        a, b = a[keep], b[keep]
+        border_planes = np.concatenate([normal, -np.einsum('ij,ij->i', normal, positions[a])[:, None]], axis=1)
+        weight = BOUNDARY_WEIGHT * np.einsum('ij,ij->i', direction[keep], direction[keep])
+        quadrics += accumulate_quadrics(len(positions), np.concatenate([a, b]),
+                                        np.concatenate([border_planes, border_planes]), np.concatenate([weight, weight]))
+    return quadrics, unique
+
+
+def cross(a, b):
+    # np.cross without its axis juggling, which dominates on the small batches the
+    # collapse loop produces.
+    return np.stack([a[..., 1] * b[..., 2] - a[..., 2] * b[..., 1],
+                     a[..., 2] * b[..., 0] - a[..., 0] * b[..., 2],
+                     a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]], axis=-1)
+
+
+def quadric_error(q, x):
+    return (np.einsum('ei,eij,ej->e', x, q[:, :3, :3], x)
+            + 2 * np.einsum('ei,ei->e', x, q[:, :3, 3]) + q[:, 3, 3])
+
+
+def collapse_targets(quadrics, positions, us, ws):
+    # Batched optimal placement: solve the 3x3 quadric system (closed-form adjugate) where
+    # it is well conditioned, otherwise fall back to the better of the endpoints and
+    # the midpoint.
+    q = quadrics[us] + quadrics[ws]
+    pu, pw = positions[us], positions[ws]
+    mid = (pu + pw) * 0.5
+    a = q[:, :3, :3]
+    b = -q[:, :3, 3]
+    adj = np.stack([cross(a[:, 1], a[:, 2]), cross(a[:, 2], a[:, 0]), cross(a[:, 0], a[:, 1])], axis=2)
+    det = np.einsum('ei,ei->e', a[:, 0], adj[:, :, 0])
+    solvable = np.abs(det) > 1e-12
+    optimal = np.einsum('eij,ej->ei', adj, b) / np.where(solvable, det, 1.0)[:, None]
+    span = np.einsum('ei,ei->e', pw - pu, pw - pu)
+    offset = optimal - mid
+    solvable &= np.einsum('ei,ei->e', offset, offset) <= 4 * span
+
+    best = np.where(solvable[:, None], optimal, mid)
+    best_error = quadric_error(q, best)
+    for candidate in (pu, pw, mid):
+        error = quadric_error(q, candidate)
+        better = error < best_error
+        best = np.where(better[:, None], candidate, best)
+        best_error = np.where(better, error, best_error)
+    return best, np.maximum(best_error, 0.0)
+
+
+def vertex_faces(faces, count):
+    # CSR of vertex -> incident faces: faces_of[start[v]:start[v + 1]] are v's faces.
+    corners = faces.ravel()
+    order = np.argsort(corners, kind='stable')
+    start = np.concatenate(([0], np.cumsum(np.bincount(corners, minlength=count))))
+    return start, order // 3
+
+
+def gather(start, values, keys):
+    # (owner, value) pairs for values[start[k]:start[k + 1]] of every k in keys; owner
+    # is the position of k in keys.
+    counts = start[keys + 1] - start[keys]
+    owner = np.repeat(np.arange(len(keys)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, values[np.repeat(start[keys], counts) + offsets]
+
+
+class EdgeBatch:
+    # Candidate collapses (ws[i] merges into us[i], which moves to targets[i]) and the
+    # faces around them in one pass's live triangles.
+    def __init__(self, tris, count, us, ws, targets):
+        self.tris = tris
+        self.count = count
+        self.us, self.ws, self.targets = us, ws, targets
+        start, face_of = vertex_faces(tris, count)
+        self.owner_u, self.face_u = gather(start, face_of, us)
+        self.owner_w, self.face_w = gather(start, face_of, ws)
+
+    def ring(self):
+        # (vertex, candidate) for every corner of every face around each candidate.
+        owner = np.concatenate([self.owner_u, self.owner_w])
+        face = np.concatenate([self.face_u, self.face_w])
+        return self.tris[face].ravel(), np.repeat(owner, 3)
+
+    def around(self, selected):
+        # Faces around the selected candidates once each, and whether the collapse
+        # removes them (they hold both ends).
+        m = len(self.tris)
+        pick_u, pick_w = selected[self.owner_u], selected[self.owner_w]
+        pairs, listed = np.unique(np.concatenate([self.owner_u[pick_u] * m + self.face_u[pick_u],
+                                                  self.owner_w[pick_w] * m + self.face_w[pick_w]]),
+                                  return_counts=True)
+        return pairs // m, pairs % m, listed == 2
+
+    def allowed(self, selected, points):
+        # Link condition: the only vertices adjacent to both ends are the opposite corners
+        # of the faces being removed; otherwise the collapse pinches the surface. Collapses
+        # that would flip a surviving face are rejected too.
+        k, count = len(self.us), self.count
+        owner, face, shared = self.around(selected)
+        shared_count = np.bincount(owner[shared], minlength=k)
+
+        def neighbours(owners, faces):
+            pick = selected[owners]
+            owners = np.repeat(owners[pick], 3)
+            vertices = self.tris[faces[pick]].ravel()
+            keep = (vertices != self.us[owners]) & (vertices != self.ws[owners])
+            return np.unique(owners[keep] * count + vertices[keep])
+        common = np.intersect1d(neighbours(self.owner_u, self.face_u), neighbours(self.owner_w, self.face_w),
+                                assume_unique=True)
+        ok = selected & (np.bincount(common // count, minlength=k) == shared_count) & (shared_count > 0)
+
+        kept = ~shared
+        corners = self.tris[face[kept]]
+        moving = (corners == self.us[owner[kept], None]) | (corners == self.ws[owner[kept], None])
+        before = points[corners]
+        after = np.where(moving[..., None], self.targets[owner[kept], None, :], before)
+        flips = np.einsum('ij,ij->i', triangle_normals(before), triangle_normals(after)) <= 0
+        ok[owner[kept][flips]] = False
+        return ok
+
+
+class ProgressiveMesh:
+    # One greedy edge-collapse pass down to the smallest requested size. Every collapse
+    # is recorded (which vertex merged into which, where the survivor moved, which faces
+    # died), so any LOD between the original and the floor is extracted without
+    # simplifying again.
+    def __init__(self, positions, faces):
+        self.positions = np.ascontiguousarray(positions, dtype=np.float64)
+        self.faces = np.ascontiguousarray(faces, dtype=np.int64)
+        count = len(self.positions)
+        self.merged_into = np.full(count, -1, dtype=np.int64)
+        self.merged_at = np.full(count, NEVER, dtype=np.int64)
+        self.face_death = np.full(len(self.faces), NEVER, dtype=np.int64)
+        self.moves = []
+        self.steps = 0
+        self.faces_after = [len(self.faces)]
+
+    @classmethod
+    def build(cls, positions, faces, min_ratio=min(DEFAULT_LOD_LEVELS) / 100.0):
+        mesh = cls(positions, faces)
+        mesh.simplify(int(len(mesh.faces) * min_ratio))
+        return mesh
+
+    def simplify(self, target_faces):
+        # Batched greedy: every pass prices all edges of the current mesh, takes the
+        # cheapest BATCH_SHARE of them, drops those that would pinch the surface or flip
+        # a face, and collapses the ones that are independent of every cheaper candidate
+        # (neither collapse touches a face around the other). Independent collapses give
+        # the same result in any order, so each one is still recorded as its own step.
+        count = len(self.positions)
+        quadrics, _ = vertex_quadrics(self.positions, self.faces)
+        points = self.positions.copy()
+        faces = self.faces.copy()
+        alive = len(faces)
+        share = BATCH_SHARE
+        priced = {'keys': np.empty(0, dtype=np.int64), 'dirty': np.zeros(count, dtype=bool)}
+        while alive > target_faces:
+            live = np.flatnonzero(self.face_death == NEVER)
+            accepted = self._pass(points, quadrics, faces, live, alive - target_faces, share, priced)
+            if accepted:
+                alive = self.faces_after[-1]
+                share = BATCH_SHARE
+            elif share < 1.0:
+                share = 1.0  # every cheap edge was blocked: look at all of them once
+            else:
+                break
+        self.positions_after = points
+        return self
+
+    def _pass(self, points, quadrics, faces, live, needed, share, priced):
+        # priced: the previous pass's edge keys, targets and costs, and the vertices it
+        # moved; only edges at those vertices (or new edges) are priced again.
+        count = len(points)
+        tris = faces[live]
+        a, b = tris.ravel(), tris[:, [1, 2, 0]].ravel()
+        keys = np.unique(np.minimum(a, b) * count + np.maximum(a, b))
+        take = min(len(keys), max(int(len(keys) * share), 1))
+        us, ws = keys // count, keys % count
+        targets, costs = np.empty((len(keys), 3)), np.empty(len(keys))
+        known = priced['keys']
+        fresh = np.ones(len(keys), dtype=bool)
+        if len(known):
+            at = np.minimum(np.searchsorted(known, keys), len(known) - 1)
+            fresh = (known[at] != keys) | priced['dirty'][us] | priced['dirty'][ws]
+            targets[~fresh], costs[~fresh] = priced['targets'][at[~fresh]], priced['costs'][at[~fresh]]
+        targets[fresh], costs[fresh] = collapse_targets(quadrics, points, us[fresh], ws[fresh])
+        priced.update(keys=keys, targets=targets, costs=costs)
+        priced['dirty'][:] = False
+        candidates = np.argpartition(costs, take - 1)[:take] if take < len(costs) else np.arange(len(costs))
+        candidates = candidates[np.argsort(costs[candidates], kind='stable')]
+        edge = EdgeBatch(tris, count, us[candidates], ws[candidates], targets[candidates])
+
+        # Independent collapses, cheapest first: no two may share a face, i.e. no collapse
+        # has an end among the vertices of another's faces. Each round takes the candidates
+        # that are the cheapest in their neighbourhood, keeps those that are allowed and
+        # closes everything that conflicts with them.
+        k = len(candidates)
+        rank = np.arange(k)
+        ring_vertices, ring_owner = edge.ring()
+        accepted = np.zeros(k, dtype=bool)
+        open_ = np.ones(k, dtype=bool)
+        for _ in range(MAX_ROUNDS):
+            use = open_[ring_owner]
+            ring_vertices, ring_owner = ring_vertices[use], ring_owner[use]
+            ring_min = np.full(count, k)
+            np.minimum.at(ring_min, ring_vertices, ring_owner)
+            end_min = np.full(count, k)
+            np.minimum.at(end_min, edge.us[open_], rank[open_])
+            np.minimum.at(end_min, edge.ws[open_], rank[open_])
+            won = open_ & (ring_min[edge.us] == rank) & (ring_min[edge.ws] == rank)
+            won[ring_owner[end_min[ring_vertices] < ring_owner]] = False
+            if not won.any():
+                break
+            open_ &= ~won
+            won &= edge.allowed(won, points)
+            accepted |= won
+            ends = np.zeros(count, dtype=bool)
+            ends[edge.us[won]] = ends[edge.ws[won]] = True
+            taken = np.zeros(count, dtype=bool)
+            taken[ring_vertices[won[ring_owner]]] = True
+            open_ &= ~(taken[edge.us] | taken[edge.ws])
+            open_[ring_owner[ends[ring_vertices]]] = False
+        chosen = np.flatnonzero(accepted)
+        if not len(chosen):
+            return 0
+        owner, face, shared = edge.around(accepted)
+        shared_count = np.bincount(owner[shared], minlength=k)
+        removed = np.cumsum(shared_count[chosen])
+        chosen = chosen[:int(np.searchsorted(removed, needed)) + 1]
+        removed = removed[:len(chosen)]
+
+        steps = self.steps + 1 + np.arange(len(chosen))
+        u, w = edge.us[chosen], edge.ws[chosen]
+        self.merged_into[w] = u
+        self.merged_at[w] = steps
+        self.moves.extend(zip(u.tolist(), steps.tolist(), *edge.targets[chosen].T.tolist()))
+        step_of = np.full(k, -1)
+        step_of[chosen] = steps
+        dying = shared & (step_of[owner] >= 0)
+        self.face_death[live[face[dying]]] = step_of[owner[dying]]
+        rows = live[face[(step_of[owner] >= 0) & ~shared]]
+        renamed = faces[rows]
+        old, new = edge.ws[owner[(step_of[owner] >= 0) & ~shared]], edge.us[owner[(step_of[owner] >= 0) & ~shared]]
+        faces[rows] = np.where(renamed == old[:, None], new[:, None], renamed)
+        points[u] = edge.targets[chosen]
+        quadrics[u] += quadrics[w]
+        priced['dirty'][u] = True
+        self.steps += len(chosen)
+        self.faces_after.extend((self.faces_after[-1] - removed).tolist())
+        return len(chosen)
+
+    def step_for(self, face_count):
+        # First step at which no more than face_count faces remain.
+        remaining = np.asarray(self.faces_after)
+        hits = np.flatnonzero(remaining <= face_count)
+        return int(hits[0]) if len(hits) else self.steps
+
+    def extract(self, ratio, attributes=None):
+        # attributes: per-triangle (T, ...) or per-corner (T, 3, ...) arrays of the source
+        # mesh (material IDs, UVs, normals). Each surviving face keeps its own corners'
+        # values, so UV seams and material borders stay where they were.
+        step = self.step_for(int(len(self.faces) * ratio))
+        representative = np.arange(len(self.positions))
+        while True:
+            follow = np.where(self.merged_at[representative] <= step, self.merged_into[representative], representative)
+            if np.array_equal(follow, representative):
+                break
+            representative = follow
+
+        positions = self.positions.copy()
+        if self.moves and step:
+            moves = np.asarray(self.moves[:step])
+            latest = moves[::-1]
+            vertices, first = np.unique(latest[:, 0].astype(np.int64), return_index=True)
+            positions[vertices] = latest[first, 2:5]
+
+        source_faces = np.flatnonzero(self.face_death > step)
+        faces = representative[self.faces[source_faces]]
+        used, compact = np.unique(faces, return_inverse=True)
+        remap = np.full(len(self.positions), -1, dtype=np.int64)
+        remap[used] = np.arange(len(used))
+        carried = {name: np.asarray(values)[source_faces] for name, values in (attributes or {}).items()}
+        return LodMesh(positions[used], compact.reshape(-1, 3), remap[representative], step, source_faces, carried)
+
+    def levels(self, percents=DEFAULT_LOD_LEVELS, attributes=None):
+        return [self.extract(p / 100.0, attributes) for p in percents]
+
+
+class LodMesh:
+    def __init__(self, positions, faces, source_map, step, source_faces=None, attributes=None):
+        self.positions = positions
+        self.faces = faces
+        self.source_map = source_map  # original vertex -> vertex of this LOD (-1 if dropped)
+        self.step = step
+        self.source_faces = source_faces  # source triangle of each face
+        self.attributes = attributes or {}
+
+    def write_obj(self, path):
+        # UVs and normals are written per corner (vt/vn i of face i is 3i+1..3i+3) and
+        # faces are grouped by material ID.
+        count = len(self.faces)
+        uvs, normals = self.attributes.get('uv0'), self.attributes.get('normals')
+        ids = self.attributes.get('material_ids')
+        order = np.argsort(ids, kind='stable') if ids is not None else np.arange(count)
+        corners = np.arange(count * 3).reshape(-1, 3) + 1
+        columns = [self.faces + 1]
+        fmt = "%d"
+        if uvs is not None:
+            columns.append(corners)
+            fmt += "/%d"
+        if normals is not None:
+            columns.append(corners)
+            fmt += "/%d" if uvs is not None else "//%d"
+        rows = np.stack(columns, axis=2).reshape(count, -1)
+        with open(path, 'w') as f:
+            np.savetxt(f, self.positions, fmt="v %.6f %.6f %.6f")
+            if uvs is not None:
+                np.savetxt(f, np.asarray(uvs, dtype=np.float64).reshape(-1, 2), fmt="vt %.6f %.6f")
+            if normals is not None:
+                np.savetxt(f, np.asarray(normals, dtype=np.float64).reshape(-1, 3), fmt="vn %.6f %.6f %.6f")
+            if ids is None:
+                np.savetxt(f, rows, fmt="f " + " ".join([fmt] * 3))
+                return
+            sorted_ids = np.asarray(ids)[order]
+            starts = np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]])
+            for start, end in zip(starts, np.r_[starts[1:], count]):
+                f.write(f"usemtl material_{int(sorted_ids[start])}\n")
+                np.savetxt(f, rows[order[start:end]], fmt="f " + " ".join([fmt] * 3))
+
+
+def triangle_normals(corners):
+    return cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+
+
+def point_segment_distance(p, a, b):
+    ab = b - a
+    t = np.clip(np.einsum('ij,ij->i', p - a, ab) / np.maximum(np.einsum('ij,ij->i', ab, ab), 1e-30), 0, 1)
+    return np.linalg.norm(p - (a + ab * t[:, None]), axis=1)
+
+
+def point_triangle_distance(p, a, b, c):
+    n = cross(b - a, c - a)
+    nn = np.maximum(np.einsum('ij,ij->i', n, n), 1e-30)
+    offset = np.einsum('ij,ij->i', p - a, n) / nn
+    q = p - n * offset[:, None]
+    inside = ((np.einsum('ij,ij->i', cross(b - a, q - a), n) >= 0)
+              & (np.einsum('ij,ij->i', cross(c - b, q - b), n) >= 0)
+              & (np.einsum('ij,ij->i', cross(a - c, q - c), n) >= 0))
+    edges = np.minimum(np.minimum(point_segment_distance(p, a, b), point_segment_distance(p, b, c)),
+                       point_segment_distance(p, c, a))
+    return np.where(inside, np.abs(offset) * np.sqrt(nn), edges)
+
+
+def geometric_error(original_positions, lod):
+    # Distance from every original vertex to the LOD surface around the vertex it was
+    # merged into (a local one-sided Hausdorff estimate), relative to the bounds diagonal.
+    targets = lod.source_map
+    valid = np.flatnonzero(targets >= 0)
+    order = np.argsort(lod.faces.ravel(), kind='stable')
+    face_of_corner = order // 3
+    starts = np.searchsorted(lod.faces.ravel()[order], np.arange(len(lod.positions) + 1))
+    counts = starts[1:] - starts[:-1]
+    per_vertex = counts[targets[valid]]
+    has_faces = per_vertex > 0
+    valid, per_vertex = valid[has_faces], per_vertex[has_faces]
+    if not len(valid):
+        return {'mean': 0.0, 'rms': 0.0, 'max': 0.0, 'relative_max': 0.0}
+    pair_vertex = np.repeat(valid, per_vertex)
+    offsets = np.arange(per_vertex.sum()) - np.repeat(np.cumsum(per_vertex) - per_vertex, per_vertex)
+    pair_face = face_of_corner[starts[targets[pair_vertex]] + offsets]
+    tri = lod.positions[lod.faces[pair_face]]
+    distances = point_triangle_distance(original_positions[pair_vertex], tri[:, 0], tri[:, 1], tri[:, 2])
+    group_starts = np.concatenate(([0], np.cumsum(per_vertex)[:-1]))
+    nearest = np.minimum.reduceat(distances, group_starts)
+    diagonal = np.linalg.norm(original_positions.max(axis=0) - original_positions.min(axis=0)) or 1.0
+    return {
+        'mean': float(nearest.mean()),
+        'rms': float(np.sqrt(np.mean(nearest ** 2))),
+        'max': float(nearest.max()),
+        'relative_max': float(nearest.max() / diagonal),
+    }
+
+
+def load_fbx_mesh(path):
+    # Positions, triangles and the attributes the LODs carry over: material IDs per
+    # triangle, UV channel 0 and normals per corner. Read from the sidecar when current.
+    from mesh_sidecar import current_sidecar, mesh_arrays
+    sidecar = current_sidecar(path)
+    arrays = {name: sidecar.array(name) for name in sidecar.sections} if sidecar is not None else mesh_arrays(path)
+    positions = np.array(arrays['positions'], dtype=np.float64)
+    faces = np.array(arrays['indices'], dtype=np.int64).reshape(-1, 3)
+    attributes = {}
+    if arrays.get('material_ids') is not None and len(arrays['material_ids']) == len(faces):
+        attributes['material_ids'] = np.asarray(arrays['material_ids'])
+    for name, width in (('uv0', 2), ('normals', 3)):
+        if arrays.get(name) is not None and len(arrays[name]) == 3 * len(faces):
+            attributes[name] = np.asarray(arrays[name]).reshape(-1, 3, width)
+    return positions, faces, attributes
+
+
+def manifest_levels(path):
+    # LOD percents the export's manifest asks for ('lod_levels', written with LodPolicy),
+    # else the fixed defaults.
+    from pipeline_io import read_manifest
+    metadata = read_manifest(path) or {}
+    levels = metadata.get('lod_levels')
+    return tuple(level['reduction'] for level in levels) if levels is not None else DEFAULT_LOD_LEVELS
+
+
+def decimate_file(path, percents=None, write_obj=False, measure_error=True):
+    if percents is None:
+        percents = manifest_levels(path)
+    positions, faces, attributes = load_fbx_mesh(path)
+    start = time.perf_counter()
+    mesh = ProgressiveMesh.build(positions, faces, min(percents, default=100) / 100.0)
+    simplify_seconds = time.perf_counter() - start
+    result = {'file': str(path), 'triangles': len(faces), 'collapses': mesh.steps,
+              'seconds': round(simplify_seconds, 3),
+              'tris_per_second': round((len(faces) - mesh.faces_after[-1]) / max(simplify_seconds, 1e-9)),
+              'levels': []}
+    for index, (percent, lod) in enumerate(zip(percents, mesh.levels(percents, attributes)), start=1):
+        level = {'lod': index, 'percent': percent, 'triangles': len(lod.faces), 'vertices': len(lod.positions)}
+        if measure_error:
+            level['error'] = geometric_error(positions, lod)
+        if write_obj:
+            obj_path = Path(path).with_name(f"{Path(path).stem}_LOD{index}.obj")
+            lod.write_obj(obj_path)
+            level['path'] = str(obj_path)
+        result['levels'].append(level)
+    return result
+
+
+def decimate_many(paths, percents=None, processes=None, write_obj=False):
+    # Assets are independent, so each one is simplified in its own worker process.
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(decimate_file, p, percents and tuple(percents), write_obj) for p in paths]
+        for future in futures:
+            yield future.result()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Quadric error metric LOD generation for exported FBX files")
+    parser.add_argument('paths', nargs='+', help="base FBX files")
+    parser.add_argument('--levels', help="LOD sizes in percent of the base triangle count "
+                                         "(default: the manifest's lod_levels, else 50,25,12)")
+    parser.add_argument('--processes', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--write-obj', action='store_true', help="write <name>_LODn.obj next to each input")
+    args = parser.parse_args()
+
+    percents = tuple(float(p) for p in args.levels.split(',')) if args.levels else None
+    for result in decimate_many(args.paths, percents, args.processes, args.write_obj):
+        print(f"{result['file']}: {result['triangles']} tris, {result['seconds']}s "
+              f"({result['tris_per_second']} tris/s)")
+        for level in result['levels']:
+            error = level.get('error', {})
+            print(f"   > LOD{level['lod']}: {level['percent']} percent -> {level['triangles']} tris"
+                  + (f", max error {error['relative_max']:.4%} of bounds" if error else ""))
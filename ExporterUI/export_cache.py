@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+# Bump when AssetPipeline.ms changes what it writes, so older cache entries stop matching.
+PIPELINE_VERSION = 4
+
+# Mirrors the FBXExporterSetParam calls in AssetPipeline.runAutomatedExport.
+FBX_EXPORT_PARAMS = {
+    'AxisConversionMethod': "None",
+    'UpAxis': "Z",
+    'SmoothingGroups': True,
+    'Triangulate': True,
+    'ASCII': False,
+    'FileVersion': "FBX202000",
+}
+
+DEFAULT_LOD_LEVELS = (50, 25, 12)
+
+SAVE_INTERVAL = 2.0
+
+
+def export_artifacts(export_path):
+    # Everything runAutomatedExport leaves next to the FBX: the base mesh, its _LODn
+    # siblings and the JSON manifest, plus the .mesh sidecars written for them.
+    export_path = Path(export_path)
+    stem = export_path.stem
+    found = [export_path, export_path.with_suffix('.json'), export_path.with_suffix('.mesh')]
+    found += sorted(export_path.parent.glob(f"{stem}_LOD[0-9]*.fbx"))
+    found += sorted(export_path.parent.glob(f"{stem}_LOD[0-9]*.mesh"))
+    return [p for p in found if p.exists()]
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExportCache:
+    # Artifacts are stored under the hash of everything that determines them: the
+    # object's full geometry hash, material (name and parameters, SceneQuery.materialHash),
+    # transform and name plus the export settings. The textures an export uses are only
+    # known once it exists, so their content digests are kept with the entry and checked
+    # before restoring it.
+    def __init__(self, cache_dir, max_bytes=None, max_age_days=None):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / "index.json"
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400 if max_age_days else None
+        self.lock = threading.Lock()
+        self.index = self._load_index()
+        self.saved_at = 0.0
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+        self.digests = {}  # (path, size, mtime) -> content digest, so unchanged textures hash once
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self, force=False):
+        # Caller holds the lock. Batches of thousands of hits would otherwise rewrite the
+        # whole index per job; losing a few seconds of last_used updates is harmless.
+        self.dirty = True
+        if not force and time.time() - self.saved_at < SAVE_INTERVAL:
+            return
+        tmp = self.index_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self.index_path)
+        self.saved_at = time.time()
+        self.dirty = False
+
+    def flush(self):
+        with self.lock:
+            if self.dirty:
+                self._save_index(force=True)
+
+    def key_for(self, object_name, stats, do_lods, do_nanite, lod_levels=None, reorder=None):
+        if not stats or not stats.get('geometry_hash'):
+            return None
+        key = {
+            'version': PIPELINE_VERSION,
+            'object': object_name,
+            'geometry': stats['geometry_hash'],
+            'polygons': stats.get('polygons'),
+            'vertices': stats.get('vertices'),
+            'material': stats.get('material'),
+            'material_hash': stats.get('material_hash'),
+            'transform': stats.get('transform'),
+            'lods': list(DEFAULT_LOD_LEVELS if lod_levels is None else lod_levels) if do_lods else [],
+            'nanite': do_nanite if do_nanite is None else bool(do_nanite),
+            'fbx': FBX_EXPORT_PARAMS,
+        }
+        if reorder:
+            key['reorder'] = reorder  # vertex_cache.py settings; absent keeps older keys valid
+        return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _fingerprint(self, paths):
+        return {p.name: [p.stat().st_size, p.stat().st_mtime] for p in paths}
+
+    def texture_digest(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        if key not in self.digests:
+            self.digests[key] = file_digest(path)
+        return self.digests[key]
+
+    def texture_digests(self, export_path):
+        # Path -> content digest of every texture the export's manifest lists.
+        from pipeline_io import read_manifest
+        from texture_stage import asset_textures
+        manifest = read_manifest(export_path)
+        if manifest is None or 'textures' not in manifest:
+            return {}
+        return {path: self.texture_digest(path) for path in asset_textures(export_path, manifest)}
+
+    def restore(self, key, export_path):
+        # True when export_path now holds this key's artifacts, either because they are
+        # still there from the last export or because they were copied out of the store.
+        # The lock only guards the index; files are compared and copied outside it.
+        if key is None:
+            return False
+        export_path = Path(export_path)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None or not (self.objects_dir / key).is_dir():
+                self.misses += 1
+                return False
+            artifacts = list(entry['artifacts'])
+            recorded = entry.get('outputs', {}).get(str(export_path))
+            textures = dict(entry.get('textures', {}))
+        try:
+            if any(self.texture_digest(path) != digest for path, digest in textures.items()):
+                return self._miss()
+            current = export_artifacts(export_path)
+            if recorded != self._fingerprint(current) or len(current) != len(artifacts):
+                export_path.parent.mkdir(parents=True, exist_ok=True)
+                for name in artifacts:
+                    target = export_path.with_name(export_path.stem + name[len("asset"):])
+                    shutil.copy2(self.objects_dir / key / name, target)
+            fingerprint = self._fingerprint(export_artifacts(export_path))
+        except OSError:
+            return self._miss()  # evicted or replaced while copying
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is not None:
+                entry.setdefault('outputs', {})[str(export_path)] = fingerprint
+                entry['last_used'] = time.time()
+            self.hits += 1
+            self._save_index()
+        return True
+
+    def _miss(self):
+        with self.lock:
+            self.misses += 1
+        return False
+
+    def store(self, key, export_path, since=None):
+        # since: export start time; older files next to the FBX (e.g. _LODn files from a
+        # previous run with more LOD levels) are not part of this export. Artifacts are
+        # copied into a private directory that is renamed into place under the lock.
+        if key is None:
+            return
+        export_path = Path(export_path)
+        artifacts = [p for p in export_artifacts(export_path) if since is None or p.stat().st_mtime >= since - 1]
+        if not artifacts:
+            return
+        staging = self.objects_dir / f"{key}.{threading.get_ident()}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        names = []
+        for path in artifacts:
+            name = "asset" + path.name[len(export_path.stem):]
+            shutil.copy2(path, staging / name)
+            names.append(name)
+        entry = {
+            'artifacts': names,
+            'size': sum(p.stat().st_size for p in artifacts),
+            'outputs': {str(export_path): self._fingerprint(artifacts)},
+            'textures': self.texture_digests(export_path),
+        }
+        target_dir = self.objects_dir / key
+        replaced = staging.with_suffix('.old')
+        shutil.rmtree(replaced, ignore_errors=True)
+        with self.lock:
+            if target_dir.exists():
+                os.replace(target_dir, replaced)
+            os.replace(staging, target_dir)
+            entry['created'] = entry['last_used'] = time.time()
+            self.index[key] = entry
+            self._evict()
+            self._save_index()
+        shutil.rmtree(replaced, ignore_errors=True)
+
+    def evict(self):
+        with self.lock:
+            removed = self._evict()
+            self._save_index(force=True)
+            return removed
+
+    def _evict(self):
+        # Caller holds the lock. Drops entries past max_age, then least recently used
+        # entries until the store fits in max_bytes.
+        now = time.time()
+        doomed = []
+        if self.max_age:
+            doomed = [k for k, e in self.index.items() if now - e['last_used'] > self.max_age]
+        if self.max_bytes:
+            remaining = sorted((e['last_used'], k) for k, e in self.index.items() if k not in doomed)
+            total = sum(self.index[k]['size'] for _, k in remaining)
+            for _, k in remaining:
+                if total <= self.max_bytes:
+                    break
+                total -= self.index[k]['size']
+                doomed.append(k)
+        for k in doomed:
+            shutil.rmtree(self.objects_dir / k, ignore_errors=True)
+            del self.index[k]
+        return len(doomed)
+
+    def total_bytes(self):
+        return sum(e['size'] for e in self.index.values())
@@ -0,0 +1,165 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from batch_engine import BatchExportEngine, DONE, FAILED, QUEUED, print_progress
+from max_channel import PORT_FILE
+from max_interface import MaxScriptInterface, max_string
+from scene_cache import SceneCache
+
+
+def discover_monitors(root=None):
+    # The default monitor listens in the root; farm seats each listen in <root>/<channel id>.
+    root = Path(root) if root else Path(tempfile.gettempdir()) / "3dsMaxPipeline"
+    candidates = [root] + sorted(p for p in root.iterdir() if p.is_dir()) if root.exists() else []
+    return [p for p in candidates if (p / PORT_FILE).exists()]
+
+
+class FarmWorker:
+    def __init__(self, channel_dir):
+        self.channel_dir = Path(channel_dir)
+        self.name = self.channel_dir.name
+        self.interface = MaxScriptInterface(channel_dir)
+        self.scene_cache = SceneCache(self.interface)
+        self.alive = True
+        self.done = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.joined = time.time()
+        self.last_error = None
+        self.stats_stale = True
+
+    def export_fbx(self, *args, **kwargs):
+        return self.interface.export_fbx(*args, **kwargs)
+
+    def throughput(self):
+        elapsed = max(time.time() - self.joined, 1e-9)
+        return {
+            'worker': self.name,
+            'alive': self.alive,
+            'done': self.done,
+            'failed': self.failed,
+            'busy_seconds': round(self.busy_seconds, 3),
+            'utilization': round(self.busy_seconds / elapsed, 3),
+            'jobs_per_minute': round(self.done * 60.0 / elapsed, 2),
+            'last_error': self.last_error,
+        }
+
+
+class ExportFarm(BatchExportEngine):
+    # One worker thread per reachable monitor, all pulling from the shared priority queue,
+    # so faster seats simply take more jobs. A seat that stops answering is taken out of
+    # service and its job goes back on the queue for the others; a job that keeps losing
+    # seats is requeued max_requeues times, then retried like any other error. A seat that
+    # only times out stays in service and the job counts a retry.
+    def __init__(self, root=None, journal_path=None, max_retries=2, on_progress=None, export_cache=None,
+                 max_requeues=3):
+        super().__init__(None, journal_path=journal_path, max_retries=max_retries, on_progress=on_progress,
+                         export_cache=export_cache, max_requeues=max_requeues)
+        self.root = root
+        self.farm_workers = {}
+
+    def discover(self):
+        found = []
+        for channel_dir in discover_monitors(self.root):
+            key = str(channel_dir)
+            worker = self.farm_workers.get(key)
+            if worker is not None and worker.alive:
+                continue
+            worker = FarmWorker(channel_dir)
+            if worker.interface.test_connection():
+                self.farm_workers[key] = worker
+                found.append(worker)
+        return found
+
+    def live_workers(self):
+        return [w for w in self.farm_workers.values() if w.alive]
+
+    def broadcast(self, script, timeout=600):
+        # e.g. loadMaxFile on every seat so they all export from the same scene.
+        futures = [(w, w.interface.submit(script)) for w in self.live_workers()]
+        return {w.name: w.interface.wait(f, timeout) for w, f in futures}
+
+    def load_scene(self, max_file):
+        path = str(max_file).replace('\\', '/')
+        return self.broadcast(f'loadMaxFile {max_string(path)} quiet:true useFileUnits:true')
+
+    def resolve_objects(self, names_or_patterns):
+        workers = self.live_workers()
+        self.scene_cache = workers[0].scene_cache if workers else None
+        return super().resolve_objects(names_or_patterns)
+
+    def start(self):
+        with self.cond:
+            self.stopping = False
+            running = {id(t.worker) for t in self.threads if t.is_alive()}
+            for worker in self.live_workers():
+                if id(worker) not in running:
+                    worker.stats_stale = True
+                    self._spawn(worker).worker = worker
+
+    def stats_for(self, job, worker):
+        with self.cond:
+            refresh, worker.stats_stale = worker.stats_stale, False
+        return worker.scene_cache.get_stats(job.object_name, refresh=refresh)
+
+    def worker_lost(self, job, worker, error):
+        worker.alive = False
+        worker.last_error = str(error)
+        worker.interface.close()
+        return True
+
+    def _run_job(self, job, worker):
+        start = time.time()
+        keep_going = super()._run_job(job, worker)
+        worker.busy_seconds += time.time() - start
+        if job.state == DONE:
+            worker.done += 1
+        elif job.state == FAILED:
+            worker.failed += 1
+        return keep_going
+
+    def worker_stats(self):
+        return [w.throughput() for w in self.farm_workers.values()]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Spread an export batch over every running monitor")
+    parser.add_argument('objects', nargs='*', default=["*"], help="object names or wildcard patterns")
+    parser.add_argument('--out', required=True, help="directory the FBX files are written to")
+    parser.add_argument('--scene', help=".max file every seat loads before exporting")
+    parser.add_argument('--root', help="channel root (default: %%TEMP%%/3dsMaxPipeline)")
+    parser.add_argument('--no-lods', action='store_true', help="skip LOD generation")
+    nanite = parser.add_mutually_exclusive_group()
+    nanite.add_argument('--nanite', dest='nanite', action='store_true', default=None,
+                        help="flag every asset for Nanite (default: decided per asset by NaniteAdvisor)")
+    nanite.add_argument('--no-nanite', dest='nanite', action='store_false', help="never use Nanite")
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--journal', help="journal file (default: <out>/export_journal.jsonl)")
+    parser.add_argument('--resume', action='store_true', help="re-queue unfinished jobs from the journal and skip the ones it marks done")
+    parser.add_argument('--cache', help="export cache directory shared by all seats")
+    args = parser.parse_args()
+
+    cache = None
+    if args.cache:
+        from export_cache import ExportCache
+        cache = ExportCache(args.cache)
+    farm = ExportFarm(args.root, journal_path=args.journal or Path(args.out) / "export_journal.jsonl",
+                      max_retries=args.retries, on_progress=print_progress, export_cache=cache)
+    workers = farm.discover()
+    if not workers:
+        raise SystemExit("No monitors found. Start monitor.ms with PIPELINE_CHANNEL set on each seat.")
+    print(f"Farm: {len(workers)} worker(s): " + ", ".join(w.name for w in workers))
+    if args.scene:
+        farm.load_scene(args.scene)
+    if args.resume:
+        farm.resume()
+    farm.add_objects(args.objects, args.out, not args.no_lods, args.nanite)
+    summary = farm.run()
+    for stats in farm.worker_stats():
+        print(f"  {stats['worker']:<20} done={stats['done']:<5} failed={stats['failed']:<4} "
+              f"{stats['jobs_per_minute']:>8} jobs/min  busy={stats['utilization']:.0%}"
+              + ("" if stats['alive'] else f"  LOST: {stats['last_error']}"))
+    print("Summary: " + ", ".join(f"{k}={v}" for k, v in sorted(summary.items())))
+    raise SystemExit(1 if summary.get(FAILED) or summary.get(QUEUED) else 0)
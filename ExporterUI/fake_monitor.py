@@ -0,0 +1,210 @@
+import argparse
+import json
+import re
+import socket
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from max_channel import PORT_FILE, encode_frame, decode_payload
+
+class FakeMonitor:
+    # Pure-Python stand-in for monitor.ms. It speaks the same wire protocol and runs
+    # commands one at a time like the single Max main thread, but instead of evaluating
+    # MaxScript it answers through regex handlers registered by the caller.
+    def __init__(self, channel_dir, delay=0.0):
+        self.channel_dir = Path(channel_dir)
+        self.channel_dir.mkdir(parents=True, exist_ok=True)
+        self.port_file = self.channel_dir / PORT_FILE
+        self.delay = delay
+        self.handlers = []
+        self.max_lock = threading.Lock()
+        self.server = None
+        self.clients = []
+        self.executed = 0
+
+    def add_handler(self, pattern, handler):
+        self.handlers.append((re.compile(pattern, re.S), handler))
+        return self
+
+    def evaluate(self, script):
+        for pattern, handler in self.handlers:
+            match = pattern.search(script)
+            if match:
+                return handler(match, script)
+        return "OK"
+
+    def start(self):
+        self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen()
+        self.port_file.write_text(str(self.server.getsockname()[1]))
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self.port_file.exists():
+            self.port_file.unlink()
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+        for client in self.clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+                client.close()
+            except OSError:
+                pass
+        self.clients = []
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _accept_loop(self):
+        server = self.server
+        while True:
+            try:
+                client, _ = server.accept()
+            except OSError:
+                return
+            client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.clients.append(client)
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _serve(self, client):
+        try:
+            for line in client.makefile('rb'):
+                # An empty script is sent as "<id> " with nothing after the space.
+                req_id, _, payload = line.decode('ascii').strip().partition(' ')
+                with self.max_lock:
+                    if self.delay:
+                        time.sleep(self.delay)
+                    try:
+                        frame = encode_frame(req_id, "OK", str(self.evaluate(decode_payload(payload))))
+                    except Exception as e:
+                        frame = encode_frame(req_id, "ERR", str(e))
+                    self.executed += 1
+                client.sendall(frame)
+        except (OSError, ValueError):
+            pass
+
+
+class FakeScene:
+    # Python model of sceneQuery (MaxScript/Core/SceneQuery.ms) for a FakeMonitor.
+    def __init__(self):
+        self.revision = 0
+        self.epoch = 0
+        self.nodes = {}
+        self.next_handle = 1
+
+    def add(self, name, tris, verts, material="None", geometry_hash=None, transform=None, slots=1, radius=100.0,
+            material_id=None, material_hash="0"):
+        self.revision += 1
+        handle = self.next_handle
+        self.next_handle += 1
+        self.nodes[handle] = {'handle': handle, 'name': name, 'rev': self.revision, 'tris': tris,
+                              'verts': verts, 'slots': slots, 'radius': radius, 'material': material,
+                              'materialId': material_id if material_id is not None else material,
+                              'materialHash': material_hash,
+                              'hash': str(geometry_hash if geometry_hash is not None else hash((tris, verts))),
+                              'transform': transform or [1, 0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 0]}
+        return handle
+
+    def modify(self, handle, **changes):
+        self.revision += 1
+        self.nodes[handle].update(changes, rev=self.revision)
+
+    def delete(self, handle):
+        self.revision += 1
+        del self.nodes[handle]
+
+    def reset(self):
+        self.epoch += 1
+        self.revision += 1
+        self.nodes = {}
+
+    def matching(self, pattern):
+        regex = re.compile(fnmatch_to_regex(pattern), re.I)
+        return [n for n in self.nodes.values() if regex.fullmatch(n['name'])]
+
+    def names(self, match, script):
+        return json.dumps([n['name'] for n in self.matching(json.loads(match.group(1)))])
+
+    def query(self, match, script):
+        since, offset, count = int(match.group(1)), int(match.group(2)), int(match.group(3))
+        nodes = self.matching(json.loads(match.group(4)))
+        header = {'epoch': self.epoch, 'rev': self.revision, 'total': len(nodes)}
+        if offset == 0:
+            header['handles'] = [n['handle'] for n in nodes]
+        lines = [json.dumps(header)]
+        lines += [json.dumps(n) for n in nodes[offset:offset + count] if since < 0 or n['rev'] > since]
+        return "\n".join(lines)
+
+    def install(self, monitor):
+        monitor.add_handler(r'sceneQuery\.names pattern:("(?:[^"\\]|\\.)*")', self.names)
+        monitor.add_handler(r'sceneQuery\.query (-?\d+) (\d+) (\d+) pattern:("(?:[^"\\]|\\.)*")', self.query)
+        return self
+
+
+def fnmatch_to_regex(pattern):
+    return "".join(".*" if c == "*" else "." if c == "?" else re.escape(c) for c in pattern)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure_latency(interface, count=1000, window=64):
+    sequential = []
+    for _ in range(count):
+        start = time.perf_counter()
+        interface.execute('print "Ping"')
+        sequential.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for offset in range(0, count, window):
+        interface.execute_many(['print "Ping"'] * min(window, count - offset))
+    pipelined = time.perf_counter() - start
+
+    return {
+        'count': count,
+        'p50_ms': percentile(sequential, 50),
+        'p90_ms': percentile(sequential, 90),
+        'p99_ms': percentile(sequential, 99),
+        'max_ms': max(sequential),
+        'sequential_per_sec': count / (sum(sequential) / 1000),
+        'pipelined_per_sec': count / pipelined,
+    }
+
+
+if __name__ == '__main__':
+    from max_interface import MaxScriptInterface
+
+    parser = argparse.ArgumentParser(description="Pure-Python stand-in for monitor.ms")
+    parser.add_argument('--channel-dir', help="serve this channel directory until interrupted")
+    parser.add_argument('--count', type=int, default=1000, help="round-trips for the latency run")
+    parser.add_argument('--window', type=int, default=64, help="requests in flight when pipelining")
+    args = parser.parse_args()
+
+    if args.channel_dir:
+        with FakeMonitor(args.channel_dir):
+            print(f"Fake monitor listening at: {args.channel_dir}")
+            try:
+                while True:
+                    time.sleep(1)
+            except KeyboardInterrupt:
+                pass
+    else:
+        with tempfile.TemporaryDirectory() as channel_dir, FakeMonitor(channel_dir):
+            interface = MaxScriptInterface(channel_dir)
+            stats = measure_latency(interface, args.count, args.window)
+            interface.close()
+        for key, value in stats.items():
+            print(f"{key:>20}: {value:.3f}" if isinstance(value, float) else f"{key:>20}: {value}")
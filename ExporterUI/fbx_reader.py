@@ -0,0 +1,633 @@
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from pipeline_io import import_core, read_manifest, write_manifest
+
+MAGIC = b"Kaydara FBX Binary  \x00"
+HEADER_SIZE = 27
+
+ARRAY_TYPES = {b'f': '<f4', b'd': '<f8', b'l': '<i8', b'i': '<i4', b'b': '<u1'}
+SCALAR_TYPES = {b'Y': '<h', b'C': '<?', b'I': '<i', b'F': '<f', b'D': '<d', b'L': '<q'}
+ARRAY_CODES = {dtype: code for code, dtype in ARRAY_TYPES.items()}
+FOOTER_TAIL = 144  # zero padding, version, 120 zero bytes and the footer magic
+
+
+class FbxError(Exception):
+    pass
+
+
+class FbxNode:
+    # A node record inside the mapped file. Only the record header is read up front;
+    # properties and children are decoded when asked for, so walking to the geometry
+    # skips over everything else in the file.
+    __slots__ = ('doc', 'name', 'offset', 'end', 'num_props', 'props_start', 'props_end')
+
+    def __init__(self, doc, name, offset, end, num_props, props_start, props_end):
+        self.doc = doc
+        self.name = name
+        self.offset = offset
+        self.end = end
+        self.num_props = num_props
+        self.props_start = props_start
+        self.props_end = props_end
+
+    def children(self):
+        return self.doc._read_nodes(self.props_end, self.end)
+
+    def child(self, name):
+        for node in self.children():
+            if node.name == name:
+                return node
+        return None
+
+    def children_named(self, name):
+        return [node for node in self.children() if node.name == name]
+
+    def properties(self):
+        return self.doc._read_properties(self)
+
+    def prop(self, index=0):
+        return self.properties()[index]
+
+    def value(self, name, default=None):
+        node = self.child(name)
+        return node.prop() if node is not None and node.num_props else default
+
+    def __repr__(self):
+        return f"FbxNode({self.name!r}, props={self.num_props})"
+
+
+class FbxDocument:
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = open(self.path, 'rb')
+        try:
+            self.buf = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise FbxError(f"{self.path}: empty file")
+        if self.buf[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise FbxError(f"{self.path}: not a binary FBX file")
+        self.version = struct.unpack_from('<I', self.buf, 23)[0]
+        self.wide = self.version >= 7500
+        self.header_fmt = '<QQQB' if self.wide else '<IIIB'
+        self.header_len = struct.calcsize(self.header_fmt)
+
+    def close(self):
+        if self.buf is not None:
+            try:
+                self.buf.close()
+            except BufferError:
+                pass  # arrays handed out still view the mapping; it goes when they do
+            self.buf = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_nodes(self, offset, limit):
+        buf = self.buf
+        while offset + self.header_len <= limit:
+            end, num_props, props_len, name_len = struct.unpack_from(self.header_fmt, buf, offset)
+            if end == 0:
+                return
+            name_start = offset + self.header_len
+            name = bytes(buf[name_start:name_start + name_len]).decode('ascii', 'replace')
+            props_start = name_start + name_len
+            yield FbxNode(self, name, offset, end, num_props, props_start, props_start + props_len)
+            offset = end
+
+    def top_level(self):
+        return self._read_nodes(HEADER_SIZE, len(self.buf))
+
+    def find(self, name):
+        for node in self.top_level():
+            if node.name == name:
+                return node
+        return None
+
+    def _read_properties(self, node):
+        buf = self.buf
+        offset = node.props_start
+        values = []
+        for _ in range(node.num_props):
+            code = buf[offset:offset + 1]
+            offset += 1
+            if code in SCALAR_TYPES:
+                fmt = SCALAR_TYPES[code]
+                values.append(struct.unpack_from(fmt, buf, offset)[0])
+                offset += struct.calcsize(fmt)
+            elif code in ARRAY_TYPES:
+                length, encoding, size = struct.unpack_from('<III', buf, offset)
+                offset += 12
+                values.append(self._decode_array(ARRAY_TYPES[code], length, encoding, offset, size))
+                offset += size
+            elif code in (b'S', b'R'):
+                size = struct.unpack_from('<I', buf, offset)[0]
+                offset += 4
+                raw = bytes(buf[offset:offset + size])
+                values.append(raw.decode('utf-8', 'replace') if code == b'S' else raw)
+                offset += size
+            else:
+                raise FbxError(f"{self.path}: unknown property type {code!r} in {node.name}")
+        return values
+
+    def _decode_array(self, dtype, length, encoding, offset, size):
+        if encoding == 0:
+            # Zero-copy view straight into the mapped file.
+            return np.frombuffer(self.buf, dtype=dtype, count=length, offset=offset)
+        if encoding == 1:
+            return np.frombuffer(zlib.decompress(self.buf[offset:offset + size]), dtype=dtype, count=length)
+        raise FbxError(f"{self.path}: unknown array encoding {encoding}")
+
+    def write(self, path, arrays, level=1):
+        # Copies the file to path with the array of every node whose offset is a key of
+        # arrays replaced (single-property array nodes such as Vertices or UVIndex).
+        # Everything else is copied byte for byte; record end offsets are rewritten.
+        null = b"\0" * self.header_len
+        end = HEADER_SIZE
+        with open(path, 'wb') as out:
+            out.write(self.buf[:HEADER_SIZE])
+            for node in self.top_level():
+                self._write_node(out, node, arrays, level, null)
+                end = node.end
+            tail = self.buf[end:]
+            if len(tail) < len(null) + 16 + FOOTER_TAIL:
+                out.write(tail)
+                return
+            # Footer id, then padding to a 16-byte boundary that depends on the new size.
+            out.write(tail[:len(null) + 16])
+            old_pad = len(tail) - len(null) - 16 - FOOTER_TAIL
+            pad = -out.tell() % 16 or (16 if old_pad == 16 else 0)
+            out.write(b"\0" * pad + tail[-FOOTER_TAIL:])
+
+    def _write_node(self, out, node, arrays, level, null):
+        start = out.tell()
+        name = self.buf[node.offset + self.header_len:node.props_start]
+        if node.offset in arrays:
+            props = encode_array(arrays[node.offset], level)
+        else:
+            props = self.buf[node.props_start:node.props_end]
+        out.write(struct.pack(self.header_fmt, 0, node.num_props, len(props), len(name)))
+        out.write(name)
+        out.write(props)
+        if node.end > node.props_end:
+            for child in node.children():
+                self._write_node(out, child, arrays, level, null)
+            out.write(null)
+        end = out.tell()
+        out.seek(start)
+        out.write(struct.pack(self.header_fmt[:2], end))
+        out.seek(end)
+
+    def objects(self, name=None):
+        objects = self.find("Objects")
+        if objects is None:
+            return []
+        return [n for n in objects.children() if name is None or n.name == name]
+
+    def connections(self):
+        node = self.find("Connections")
+        if node is None:
+            return []
+        return [c.properties() for c in node.children() if c.name == "C"]
+
+    def meshes(self):
+        geometries = {g.prop(0): g for g in self.objects("Geometry") if g.num_props >= 3 and g.prop(2) == "Mesh"}
+        models = {m.prop(0): object_name(m.prop(1)) for m in self.objects("Model")}
+        materials = {m.prop(0) for m in self.objects("Material")}
+        owners, model_materials = {}, {}
+        for link in self.connections():
+            if len(link) < 3 or link[0] != "OO":
+                continue
+            child, parent = link[1], link[2]
+            if child in geometries and parent in models:
+                owners[child] = parent
+            elif child in materials and parent in models:
+                model_materials[parent] = model_materials.get(parent, 0) + 1
+        meshes = []
+        for geo_id, node in geometries.items():
+            model_id = owners.get(geo_id)
+            name = models.get(model_id, object_name(node.prop(1)))
+            meshes.append(FbxMesh(node, name, model_materials.get(model_id, 0)))
+        return meshes
+
+    def unit_scale(self):
+        # Centimetres per file unit (GlobalSettings UnitScaleFactor), 1.0 if absent.
+        settings = self.find("GlobalSettings")
+        properties = settings.child("Properties70") if settings is not None else None
+        for p in properties.children_named("P") if properties is not None else []:
+            values = p.properties()
+            if values and values[0] == "UnitScaleFactor":
+                return float(values[-1])
+        return 1.0
+
+    def texture_paths(self):
+        paths = []
+        for tex in self.objects("Texture"):
+            path = tex.value("FileName") or tex.value("RelativeFilename")
+            if path and path not in paths:
+                paths.append(path)
+        return paths
+
+
+def encode_array(values, level=1):
+    # One array property, zlib-compressed unless level is 0.
+    values = np.ascontiguousarray(values, dtype=np.dtype(values.dtype).newbyteorder('<'))
+    raw = values.tobytes()
+    data = zlib.compress(raw, level) if level else raw
+    return ARRAY_CODES[values.dtype.str] + struct.pack('<III', len(values), int(bool(level)), len(data)) + data
+
+
+def object_name(raw):
+    # Binary FBX stores "Name\x00\x01Class".
+    return raw.split("\x00\x01")[0] if isinstance(raw, str) else str(raw)
+
+
+class FbxMesh:
+    def __init__(self, node, name, material_slots=0):
+        self.node = node
+        self.name = name
+        self.connected_materials = material_slots
+
+    def _array(self, name, layer=None):
+        node = (layer or self.node).child(name)
+        if node is None or not node.num_props:
+            return None
+        return node.prop()
+
+    def positions(self):
+        data = self._array("Vertices")
+        return np.empty((0, 3)) if data is None else data.reshape(-1, 3)
+
+    def polygon_vertex_index(self):
+        data = self._array("PolygonVertexIndex")
+        return np.empty(0, dtype='<i4') if data is None else data
+
+    def polygon_sizes(self):
+        ends = np.flatnonzero(self.polygon_vertex_index() < 0)
+        return np.diff(np.concatenate(([-1], ends)))
+
+    def triangle_corners(self):
+        # Fan-triangulates every polygon; returns (T, 3) positions in the polygon vertex
+        # array, which is what per-corner layer data (normals, UVs) is indexed by.
+        sizes = self.polygon_sizes()
+        fan = np.maximum(sizes - 2, 0)
+        starts = np.repeat(np.cumsum(sizes) - sizes, fan)
+        step = np.arange(fan.sum()) - np.repeat(np.cumsum(fan) - fan, fan) + 1
+        return np.stack([starts, starts + step, starts + step + 1], axis=1)
+
+    def triangle_polygons(self):
+        # Source polygon of each triangle, for per-polygon data such as material IDs.
+        sizes = self.polygon_sizes()
+        return np.repeat(np.arange(len(sizes)), np.maximum(sizes - 2, 0))
+
+    def triangles(self):
+        # (T, 3) indices into positions().
+        pvi = self.polygon_vertex_index()
+        corners = np.where(pvi < 0, ~pvi, pvi).astype(np.int64)
+        return corners[self.triangle_corners()]
+
+    def triangle_count(self):
+        sizes = self.polygon_sizes()
+        return int(np.sum(np.maximum(sizes - 2, 0)))
+
+    def vertex_count(self):
+        node = self.node.child("Vertices")
+        if node is None:
+            return 0
+        # The array header holds the length; no need to decode (or inflate) the data.
+        length = struct.unpack_from('<I', node.doc.buf, node.props_start + 1)[0]
+        return length // 3
+
+    def layers(self, name):
+        return self.node.children_named(name)
+
+    def uv_set_count(self):
+        return len(self.layers("LayerElementUV"))
+
+    def has_vertex_colors(self):
+        return bool(self.layers("LayerElementColor"))
+
+    def material_ids(self):
+        layer = self.node.child("LayerElementMaterial")
+        if layer is None:
+            return None
+        ids = self._array("Materials", layer)
+        mapping = layer.value("MappingInformationType", "AllSame")
+        if ids is None or not len(ids):
+            return None
+        if mapping == "AllSame":
+            return np.full(len(self.polygon_sizes()), ids[0], dtype=ids.dtype)
+        return ids
+
+    def material_slot_count(self):
+        if self.connected_materials:
+            return self.connected_materials
+        ids = self.material_ids()
+        return int(len(np.unique(ids))) if ids is not None else 0
+
+    def layer_values(self, layer_name, data_name, index_name, width, index=0):
+        # Expands a layer element (the index-th of that name, e.g. the second UV set) to
+        # one value per polygon vertex, whatever its mapping/reference mode. Returns None
+        # if the layer is missing.
+        layers = self.layers(layer_name)
+        if len(layers) <= index:
+            return None
+        layer = layers[index]
+        data = self._array(data_name, layer)
+        if data is None:
+            return None
+        data = data.reshape(-1, width)
+        mapping = layer.value("MappingInformationType", "ByPolygonVertex")
+        reference = layer.value("ReferenceInformationType", "Direct")
+        if reference in ("IndexToDirect", "Index"):
+            data = data[self._array(index_name, layer)]
+        if mapping in ("ByVertice", "ByVertex"):
+            pvi = self.polygon_vertex_index()
+            return data[np.where(pvi < 0, ~pvi, pvi)]
+        if mapping == "ByPolygon":
+            return np.repeat(data, self.polygon_sizes(), axis=0)
+        if mapping == "AllSame":
+            return np.repeat(data[:1], len(self.polygon_vertex_index()), axis=0)
+        return data
+
+    def stats(self):
+        return {
+            'name': self.name,
+            'triangles': self.triangle_count(),
+            'vertices': self.vertex_count(),
+            'polygons': int(len(self.polygon_sizes())),
+            'uv_sets': self.uv_set_count(),
+            'vertex_colors': self.has_vertex_colors(),
+            'material_slots': self.material_slot_count(),
+        }
+
+
+def fbx_stats(path, use_sidecar=True):
+    # A current .mesh sidecar (see mesh_sidecar.py) already holds these numbers.
+    if use_sidecar:
+        from mesh_sidecar import current_sidecar
+        sidecar = current_sidecar(path)
+        if sidecar is not None:
+            return dict(sidecar.meta['stats'], file=str(path))
+    with FbxDocument(path) as doc:
+        meshes = [m.stats() for m in doc.meshes()]
+        return {
+            'file': str(path),
+            'version': doc.version,
+            'meshes': meshes,
+            'triangles': sum(m['triangles'] for m in meshes),
+            'vertices': sum(m['vertices'] for m in meshes),
+            'uv_sets': max((m['uv_sets'] for m in meshes), default=0),
+            'vertex_colors': any(m['vertex_colors'] for m in meshes),
+            'material_slots': sum(m['material_slots'] for m in meshes),
+        }
+
+
+def fbx_bounds(path):
+    # Extent (x, y, z) in centimetres of all meshes in the file, in their own space.
+    from mesh_sidecar import current_sidecar
+    sidecar = current_sidecar(path)
+    with FbxDocument(path) as doc:
+        positions = (sidecar.positions if sidecar is not None
+                     else np.concatenate([m.positions() for m in doc.meshes()] or [np.empty((0, 3))]))
+        if not len(positions):
+            return [0.0, 0.0, 0.0]
+        return ((positions.max(axis=0) - positions.min(axis=0)) * doc.unit_scale()).tolist()
+
+
+def lod_files(fbx_path):
+    fbx_path = Path(fbx_path)
+    pattern = re.compile(re.escape(fbx_path.stem) + r"_LOD(\d+)\.fbx$", re.I)
+    found = []
+    for sibling in fbx_path.parent.iterdir():
+        match = pattern.match(sibling.name)
+        if match:
+            found.append((int(match.group(1)), sibling))
+    return [path for _, path in sorted(found)]
+
+
+def lod_chain_stats(fbx_path):
+    return [fbx_stats(fbx_path)] + [fbx_stats(p) for p in lod_files(fbx_path)]
+
+
+def measure_fbx(fbx_path, metadata=None):
+    # Same shape as PerformanceMeasurer.measure_asset, without an editor; the memory
+    # estimate covers the exported _LODn files and the manifest's Nanite setting.
+    MemoryEstimator = import_core('MemoryEstimator')
+    chain = lod_chain_stats(fbx_path)
+    base = chain[0]
+    metadata = metadata or {}
+    # Render vertices from vertex_split.py when the manifest has them, else control points;
+    # seams and hard edges split more vertices on the GPU than the FBX stores.
+    render = metadata.get('render_stats') or {}
+    gpu_vertices = render.get('render_vertices') or [s['vertices'] for s in chain]
+    if len(gpu_vertices) != len(chain):
+        gpu_vertices = [s['vertices'] for s in chain]
+    vertex_format = MemoryEstimator.VertexFormat(uv_channels=base['uv_sets'], colors=base['vertex_colors'])
+    memory = MemoryEstimator.MemoryEstimator(vertex_format).estimate(
+        [(s['triangles'], v) for s, v in zip(chain, gpu_vertices)],
+        nanite=metadata.get('enable_nanite', False),
+        nanite_fallback_percent=metadata.get('nanite_fallback_percent', 100))
+    return {
+        'triangles': base['triangles'],
+        'vertices': base['vertices'],
+        'memory_mb': memory['gpu_mb'],
+        'memory': memory,
+        'lods': len(chain),
+        'lod_triangles': [s['triangles'] for s in chain],
+        'gpu_vertices': gpu_vertices[0],
+        'draw_sections': render['draw_calls'][0] if render.get('draw_calls') else max(1, base['material_slots']),
+    }
+
+
+def nanite_stats(fbx_path, metadata=None):
+    # NaniteAdvisor input for an export: measured LOD chain and bounds, material slot
+    # kinds from the manifest and the copy count from the folder's instancing map.
+    from instancing import load_instancing_map
+    metadata = metadata or {}
+    chain = lod_chain_stats(fbx_path)
+    group = load_instancing_map(Path(fbx_path).parent).get('meshes', {}).get(Path(fbx_path).name)
+    return {
+        'triangles': chain[0]['triangles'],
+        'vertices': chain[0]['vertices'],
+        'lod_triangles': [s['triangles'] for s in chain],
+        'uv_sets': chain[0]['uv_sets'],
+        'vertex_colors': chain[0]['vertex_colors'],
+        'bounds_cm': fbx_bounds(fbx_path),
+        'masked_slots': metadata.get('masked_slots', 0),
+        'translucent_slots': metadata.get('translucent_slots', 0),
+        'instances': len(group['instances']) if group else 1,
+    }
+
+
+def advise_nanite(fbx_path, advisor=None, platform=None, update_manifest=True):
+    # Decides Nanite vs LODs for an export and, by default, records the decision and its
+    # reasons in the manifest ('enable_nanite' and 'nanite_decision').
+    metadata = read_manifest(fbx_path)
+    if metadata is None:
+        raise FbxError(f"{Path(fbx_path).with_suffix('.json')}: no readable manifest")
+    if advisor is None:
+        advisor = import_core('NaniteAdvisor').NaniteAdvisor.from_rules(import_core('BudgetRules').RuleSet.load())
+    decision = advisor.decide(nanite_stats(fbx_path, metadata), platform or os.environ.get('PIPELINE_PLATFORM'))
+    if update_manifest:
+        metadata['enable_nanite'] = decision['enable_nanite']
+        metadata['nanite_decision'] = decision
+        write_manifest(fbx_path, metadata)
+    return decision
+
+
+def validate_export(fbx_path, validator=None, predictor=None):
+    # predictor: a PerformancePredictor that also learns from the measured asset.
+    json_path = Path(fbx_path).with_suffix('.json')
+    if not os.path.exists(json_path):
+        return None
+    with open(json_path, 'r') as f:
+        metadata = json.load(f)
+    if validator is None:
+        validator = import_core('ValidationEngine').ValidationEngine()
+    measured = measure_fbx(fbx_path, metadata)
+    if predictor is not None:
+        predictor.observe_exports([(metadata, measured)], [str(fbx_path)])
+    results = validator.validate_predictions(metadata, measured)
+    results['file'] = str(fbx_path)
+    return results
+
+
+def validate_exports(fbx_paths, validator=None, platform=None, on_error=None, predictor=None):
+    # validate_export for many files: each one is measured, then predictions and budget
+    # rules are checked for all of them in one ValidationEngine.validate_batch call.
+    # on_error(path, exc) skips files that cannot be read instead of raising.
+    if validator is None:
+        validator = import_core('ValidationEngine').ValidationEngine()
+    rows = []
+    for fbx_path in fbx_paths:
+        json_path = Path(fbx_path).with_suffix('.json')
+        if not os.path.exists(json_path):
+            continue
+        try:
+            with open(json_path, 'r') as f:
+                metadata = json.load(f)
+            rows.append((str(fbx_path), metadata, measure_fbx(fbx_path, metadata)))
+        except (FbxError, OSError, ValueError, zlib.error) as e:
+            if on_error is None:
+                raise
+            on_error(fbx_path, e)
+    if not rows:
+        return []
+    if predictor is not None:
+        predictor.observe_exports([(metadata, stats) for _, metadata, stats in rows], [path for path, _, _ in rows])
+    lod_levels = max(len(stats['lod_triangles']) for _, _, stats in rows)
+    columns = {
+        'polygons': [metadata.get('polygons', 0) for _, metadata, _ in rows],
+        'triangles': [stats['triangles'] for _, _, stats in rows],
+        'memory_mb': [stats['memory_mb'] for _, _, stats in rows],
+        'draw_calls': [stats['draw_sections'] if metadata.get('render_stats') else None
+                       for _, metadata, stats in rows],
+    }
+    for lod in range(1, lod_levels):
+        columns[f'triangles_lod{lod}'] = [s['lod_triangles'][lod] if lod < len(s['lod_triangles']) else None
+                                          for _, _, s in rows]
+    categories = [validator.rules.category_of(Path(path).stem, metadata) for path, metadata, _ in rows]
+    batch = validator.validate_batch(columns, categories, platform)
+    failed_rules = [[] for _ in rows]
+    for rule, indices in batch['violations'].items():
+        for i in indices:
+            failed_rules[i].append(rule)
+    results = []
+    for i, (path, metadata, stats) in enumerate(rows):
+        results.append({
+            'file': path,
+            'category': categories[i],
+            'poly_error': float(batch['poly_error'][i]),
+            'accuracy_score': float(batch['accuracy_score'][i]),
+            'predicted_complexity': metadata.get('complexity'),
+            'actual_complexity': batch['actual_complexity'][i],
+            'memory_mb': stats['memory_mb'],
+            'actual_triangles': stats['triangles'],
+            'lod_triangles': stats['lod_triangles'],
+            'passed': bool(batch['passed'][i]),
+            'violations': failed_rules[i],
+        })
+    return results
+
+
+def iter_fbx_files(paths):
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            for found in sorted(path.rglob("*.fbx")):
+                if not re.search(r"_LOD\d+\.fbx$", found.name, re.I):
+                    yield found
+        else:
+            yield path
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Read mesh statistics from binary FBX exports")
+    parser.add_argument('paths', nargs='+', help="FBX files or directories to scan")
+    parser.add_argument('--lods', action='store_true', help="include the _LODn siblings of each file")
+    parser.add_argument('--validate', action='store_true', help="compare against the JSON manifest and budgets")
+    parser.add_argument('--rules', help="budget rules JSON (default: $PIPELINE_BUDGETS or the built-in budgets)")
+    parser.add_argument('--platform', help="target platform for platform-specific budgets")
+    parser.add_argument('--json', action='store_true', help="print JSON lines instead of a table")
+    parser.add_argument('--learn', nargs='?', const='', metavar='MODEL',
+                        help="with --validate: train the performance predictor on the measured exports "
+                             "(default model: $PIPELINE_PREDICTOR or the temp folder)")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    if args.validate:
+        rules = import_core('BudgetRules').RuleSet.load(args.rules)
+        errors = []
+        predictor = None
+        if args.learn is not None:
+            predictor = import_core('PerformancePredictor').PerformancePredictor.load(args.learn or None, rules)
+        results = validate_exports(iter_fbx_files(args.paths), import_core('ValidationEngine').ValidationEngine(rules),
+                                   args.platform, on_error=lambda path, e: errors.append((path, e)),
+                                   predictor=predictor)
+        if predictor is not None:
+            path = predictor.save(args.learn or None)
+            print(f"predictor: {predictor.samples} samples -> {path}", file=sys.stderr)
+        for path, e in errors:
+            print(f"{path}: {e}", file=sys.stderr)
+        for result in results:
+            if args.json:
+                print(json.dumps(result))
+            else:
+                print(f"{result['file']}: error {result['poly_error']:.1f}%  accuracy {result['accuracy_score']:.1f}%"
+                      + ("" if result['passed'] else f"  FAILED {'; '.join(result['violations'])}"))
+        raise SystemExit(1 if errors or not all(r['passed'] for r in results) else 0)
+
+    for fbx_path in iter_fbx_files(args.paths):
+        try:
+            result = lod_chain_stats(fbx_path) if args.lods else [fbx_stats(fbx_path)]
+        except (FbxError, OSError, zlib.error) as e:
+            print(f"{fbx_path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        if args.json:
+            print(json.dumps(result))
+        else:
+            for stats in result:
+                print(f"{stats['file']}: {stats['triangles']} tris, {stats['vertices']} verts, "
+                      f"{stats['uv_sets']} UV sets, {stats['material_slots']} material slots")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
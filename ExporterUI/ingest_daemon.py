@@ -0,0 +1,294 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import tracing
+
+# Watches export folders and queues settled exports for UnrealScripts/IngestQueue.py.
+QUEUE_DIR = Path(tempfile.gettempdir()) / "3dsMaxPipeline" / "ingest"
+BATCH_SUFFIX = '.batch.json'
+DONE_SUFFIX = '.done.json'
+
+POLL_INTERVAL = 0.25
+SETTLE_SECONDS = 0.5
+BATCH_WINDOW = 1.0     # seconds to wait for more assets after the first one is ready
+MAX_BATCH = 200
+MAX_LODS = 8
+RELIST_SECONDS = 30.0  # full re-list, for shares that do not update directory mtimes
+MAX_RETRIES = 3
+RETRY_STATUSES = ("IMPORT FAILED", "CANCELLED")  # BatchImporter statuses worth importing again
+
+
+def file_state(path):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class PendingAsset:
+    def __init__(self, fbx_path, now):
+        self.fbx_path = fbx_path
+        self.signature = None
+        self.changed_at = now
+        self.ready_at = None
+        self.exported_at = None
+        self.submitted_at = None
+
+
+class QueueTarget:
+    # One <id>.batch.json per batch in queue_dir; IngestQueue.py answers with
+    # <id>.done.json holding the import results and timings.
+    def __init__(self, queue_dir=QUEUE_DIR):
+        self.queue_dir = Path(queue_dir)
+        self.queue_dir.mkdir(parents=True, exist_ok=True)
+        self.outstanding = {}
+
+    def submit(self, assets):
+        batch_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        payload = {'batch': batch_id, 'submitted': time.time(),
+                   'assets': [{'fbx': a.fbx_path, 'exported': a.exported_at} for a in assets]}
+        tmp = self.queue_dir / (batch_id + '.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(payload, f)
+        os.replace(tmp, self.queue_dir / (batch_id + BATCH_SUFFIX))
+        self.outstanding[batch_id] = assets
+        return batch_id
+
+    def completed(self):
+        # (assets, done payload) for every outstanding batch the editor has finished. The
+        # pair is deleted once read, the batch file first so the editor never sees it
+        # as pending again.
+        finished = []
+        for batch_id in list(self.outstanding):
+            done_path = self.queue_dir / (batch_id + DONE_SUFFIX)
+            try:
+                with open(done_path, 'r', encoding='utf-8') as f:
+                    done = json.load(f)
+            except (OSError, ValueError):
+                continue
+            for path in (self.queue_dir / (batch_id + BATCH_SUFFIX), done_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            finished.append((self.outstanding.pop(batch_id), done))
+        return finished
+
+
+class IngestDaemon:
+    def __init__(self, roots, target=None, settle=SETTLE_SECONDS, batch_window=BATCH_WINDOW,
+                 max_batch=MAX_BATCH, on_event=None):
+        self.roots = [str(Path(r)) for r in roots]
+        self.target = target or QueueTarget()
+        self.settle = settle
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.on_event = on_event or (lambda kind, message: None)
+        self.dir_mtimes = {}      # directory -> mtime_ns when last listed
+        self.dir_children = {}    # directory -> subdirectories at that listing
+        self.dir_manifests = {}   # directory -> manifests at that listing
+        self.manifests = {}       # manifest path -> (size, mtime_ns) last seen
+        self.listed_at = 0.0
+        self.pending = {}         # fbx path -> PendingAsset waiting to settle
+        self.ready = []           # settled, waiting for the batch window
+        self.ingested = {}        # fbx path -> signature last imported
+        self.in_flight = {}       # fbx path -> signature submitted, not answered yet
+        self.retries = {}         # fbx path -> (signature, failed imports of it)
+        self.latencies = []       # export -> import seconds, per asset
+        self.stopping = False
+
+    def list_directories(self, record_state=False):
+        # Re-lists only directories whose mtime moved (files added, removed or renamed).
+        # record_state: take the manifests found as already seen, not as changes.
+        stack = list(self.roots)
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime = os.stat(directory).st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime is not None and self.dir_mtimes.get(directory) == mtime:
+                stack += self.dir_children.get(directory, [])
+                continue
+            entries = []
+            if mtime is not None:
+                try:
+                    with os.scandir(directory) as it:
+                        entries = list(it)
+                except OSError:
+                    mtime = None
+            names = {e.name for e in entries}
+            children, manifests = [], set()
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    children.append(entry.path)
+                elif entry.name.lower().endswith('.json') and entry.name[:-5] + '.fbx' in names:
+                    manifests.add(entry.path)
+                    if entry.path not in self.manifests:
+                        self.manifests[entry.path] = file_state(entry.path) if record_state else None
+            for path in self.dir_manifests.get(directory, set()) - manifests:
+                self.manifests.pop(path, None)
+            if mtime is None:
+                self.dir_mtimes.pop(directory, None)
+                self.dir_children.pop(directory, None)
+                self.dir_manifests.pop(directory, None)
+                continue
+            self.dir_mtimes[directory] = mtime
+            self.dir_children[directory] = children
+            self.dir_manifests[directory] = manifests
+            stack += children
+
+    def asset_signature(self, fbx_path):
+        # States of the FBX, its manifest and its _LODn siblings, plus whether the set is
+        # complete: the manifest parses and every LOD it announces is there.
+        base = fbx_path[:-4]
+        manifest_path = base + '.json'
+        states = [file_state(fbx_path), file_state(manifest_path)]
+        lods = []
+        for i in range(1, MAX_LODS + 1):
+            state = file_state(f"{base}_LOD{i}.fbx")
+            if state is None:
+                break
+            lods.append(state)
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                lod_count = int(json.load(f).get('lod_count', 0) or 0)
+        except (OSError, ValueError):
+            return tuple(states + lods), False
+        complete = None not in states and len(lods) >= lod_count
+        return tuple(states + lods), complete
+
+    def baseline(self):
+        # What is already on disk at startup counts as ingested.
+        self.list_directories(record_state=True)
+        for manifest in self.manifests:
+            fbx_path = manifest[:-5] + '.fbx'
+            self.ingested[fbx_path] = self.asset_signature(fbx_path)[0]
+
+    def poll(self, now=None):
+        now = time.time() if now is None else now
+        if now - self.listed_at >= RELIST_SECONDS:
+            self.dir_mtimes.clear()
+            self.listed_at = now
+        self.list_directories()
+        for manifest, seen in self.manifests.items():
+            state = file_state(manifest)
+            if state != seen:
+                self.manifests[manifest] = state
+                fbx_path = manifest[:-5] + '.fbx'
+                if state is not None and fbx_path not in self.pending:
+                    self.pending[fbx_path] = PendingAsset(fbx_path, now)
+
+        for fbx_path, asset in list(self.pending.items()):
+            signature, complete = self.asset_signature(fbx_path)
+            if signature != asset.signature:
+                asset.signature = signature
+                asset.changed_at = now
+                continue
+            if not complete or now - asset.changed_at < self.settle:
+                continue
+            del self.pending[fbx_path]
+            if signature in (self.ingested.get(fbx_path), self.in_flight.get(fbx_path)):
+                continue  # touched but identical to what was imported or is being imported
+            asset.ready_at = now
+            asset.exported_at = max(s[1] for s in signature if s) / 1e9
+            self.ready.append(asset)
+
+        if self.ready and (len(self.ready) >= self.max_batch or now - self.ready[0].ready_at >= self.batch_window):
+            self.flush(now)
+        self.collect()
+
+    def flush(self, now=None):
+        now = time.time() if now is None else now
+        while self.ready:
+            batch, self.ready = self.ready[:self.max_batch], self.ready[self.max_batch:]
+            for asset in batch:
+                asset.submitted_at = now
+                self.in_flight[asset.fbx_path] = asset.signature
+            with tracing.span("ingest_submit", 'ingest', assets=len(batch)):
+                batch_id = self.target.submit(batch)
+            self.on_event('submitted', f"batch {batch_id}: {len(batch)} assets")
+
+    def collect(self):
+        for assets, done in self.target.completed():
+            finished = done.get('finished', time.time())
+            latencies = [finished - a.exported_at for a in assets]
+            self.latencies += latencies
+            for asset in assets:
+                tracing.complete("ingest", asset.exported_at * 1e6, (finished - asset.exported_at) * 1e6, 'ingest',
+                                 asset=Path(asset.fbx_path).stem, settle_s=round(asset.ready_at - asset.exported_at, 3),
+                                 queued_s=round(asset.submitted_at - asset.ready_at, 3))
+            statuses = {os.path.normcase(os.path.normpath(r.get('fbx', ''))): str(r.get('status', ''))
+                        for r in done.get('results', [])}
+            passed = sum(1 for status in statuses.values() if status.startswith("PASSED"))
+            retried = [a for a in assets if self.settle_result(a, statuses, done.get('error'), finished)]
+            self.on_event('imported', f"batch {done.get('batch')}: {passed}/{len(assets)} passed, "
+                                      f"export->import {min(latencies):.1f}-{max(latencies):.1f}s"
+                                      + (f", {len(retried)} to retry" if retried else ""))
+            if done.get('error'):
+                self.on_event('failed', f"batch {done.get('batch')}: {done['error']}")
+
+    def settle_result(self, asset, statuses, error, now):
+        # Marks the asset ingested if the editor imported it; otherwise queues it to be
+        # handed over again. Returns whether it will be retried.
+        if self.in_flight.get(asset.fbx_path) == asset.signature:
+            del self.in_flight[asset.fbx_path]
+        status = statuses.get(os.path.normcase(os.path.normpath(asset.fbx_path)))
+        if not error and status is not None and status not in RETRY_STATUSES:
+            self.ingested[asset.fbx_path] = asset.signature
+            self.retries.pop(asset.fbx_path, None)
+            return False
+        signature, attempts = self.retries.get(asset.fbx_path, (None, 0))
+        attempts = attempts + 1 if signature == asset.signature else 1
+        self.retries[asset.fbx_path] = (asset.signature, attempts)
+        if attempts > MAX_RETRIES:
+            self.on_event('failed', f"{asset.fbx_path}: not imported after {MAX_RETRIES} retries")
+            self.ingested[asset.fbx_path] = asset.signature  # until it is exported again
+            return False
+        self.pending.setdefault(asset.fbx_path, PendingAsset(asset.fbx_path, now))
+        return True
+
+    def latency_summary(self):
+        return {
+            'assets': len(self.latencies),
+            'p50_s': round(tracing.percentile(self.latencies, 50), 3),
+            'p90_s': round(tracing.percentile(self.latencies, 90), 3),
+            'max_s': round(max(self.latencies, default=0.0), 3),
+        }
+
+    def run(self, interval=POLL_INTERVAL, initial=False):
+        if not initial:
+            self.baseline()
+        while not self.stopping:
+            started = time.time()
+            self.poll(started)
+            time.sleep(max(0.0, interval - (time.time() - started)))
+
+    def stop(self):
+        self.stopping = True
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Hand finished exports to the Unreal ingest queue")
+    parser.add_argument('roots', nargs='+', help="export folders to watch")
+    parser.add_argument('--queue', default=str(QUEUE_DIR), help=f"ingest queue directory (default: {QUEUE_DIR})")
+    parser.add_argument('--initial', action='store_true', help="also ingest exports already on disk")
+    parser.add_argument('--settle', type=float, default=SETTLE_SECONDS, help="seconds files must stay unchanged")
+    parser.add_argument('--batch-window', type=float, default=BATCH_WINDOW)
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL)
+    args = parser.parse_args()
+
+    daemon = IngestDaemon(args.roots, QueueTarget(args.queue), args.settle, args.batch_window,
+                          on_event=lambda kind, message: print(f"[{kind.upper():>9}] {message}", flush=True))
+    print(f"Watching {', '.join(args.roots)} -> {args.queue} (run UnrealScripts/IngestQueue.py in the editor)")
+    try:
+        daemon.run(args.interval, args.initial)
+    except KeyboardInterrupt:
+        pass
+    print("Latency: " + ", ".join(f"{k}={v}" for k, v in daemon.latency_summary().items()))
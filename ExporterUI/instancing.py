@@ -0,0 +1,84 @@
+import json
+import os
+from pathlib import Path
+
+# Finds copies of one mesh before export and lists them in instancing.json.
+INSTANCING_MAP = "instancing.json"
+MAP_VERSION = 1
+
+
+def geometry_key(obj):
+    # None for objects the scene query could not describe; those are never merged.
+    if obj is None or 'error' in obj or not obj.get('hash'):
+        return None
+    return obj['hash'], obj['tris'], obj['verts'], obj.get('materialId', obj['material'])
+
+
+class InstanceGroup:
+    def __init__(self, key, prototype):
+        self.key = key
+        self.prototype = prototype  # the member that is exported
+        self.members = []           # (name, Max node transform) for every copy, prototype included
+
+    def to_dict(self):
+        return {
+            'mesh': self.prototype,
+            'hash': self.key[0] if self.key else None,
+            'instances': [{'name': name, 'transform': transform} for name, transform in self.members],
+        }
+
+
+def group_instances(scene_cache, names):
+    # Groups in the order their first member appears in names.
+    groups, by_key = [], {}
+    for name in names:
+        obj = scene_cache.find(name)
+        key = geometry_key(obj)
+        group = by_key.get(key) if key is not None else None
+        if group is None:
+            group = InstanceGroup(key, name)
+            groups.append(group)
+            if key is not None:
+                by_key[key] = group
+        group.members.append((name, obj.get('transform') if obj else None))
+    return groups
+
+
+def load_instancing_map(folder):
+    try:
+        with open(Path(folder) / INSTANCING_MAP, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'version': MAP_VERSION, 'meshes': {}}
+
+
+def write_instancing_map(folder, groups, file_names, unit_scale=1.0):
+    # file_names maps each group's prototype to its FBX file name. Earlier entries for
+    # other files are kept, so several batches can export into the same folder.
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    instancing = load_instancing_map(folder)
+    meshes = instancing.setdefault('meshes', {})
+    for group in groups:
+        file_name = file_names[group.prototype]
+        if len(group.members) > 1:
+            meshes[file_name] = group.to_dict()
+        else:
+            meshes.pop(file_name, None)
+    instancing['version'] = MAP_VERSION
+    instancing['unit_scale'] = unit_scale  # centimetres per Max system unit
+    tmp = folder / (INSTANCING_MAP + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(instancing, f)
+    os.replace(tmp, folder / INSTANCING_MAP)
+    return instancing
+
+
+def dedup_summary(groups):
+    objects = sum(len(g.members) for g in groups)
+    return {
+        'objects': objects,
+        'unique_meshes': len(groups),
+        'instanced_groups': sum(1 for g in groups if len(g.members) > 1),
+        'duplication_ratio': round(objects / len(groups), 2) if groups else 0.0,
+    }
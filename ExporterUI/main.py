@@ -1,46 +1,38 @@
 import sys
 import os
+import json
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QPushButton, QComboBox, 
                              QLineEdit, QTextEdit, QFileDialog, QMessageBox,
                              QGroupBox, QTabWidget, QCheckBox)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
 from PyQt5.QtGui import QFont
 
+from batch_engine import BatchExportEngine, ExportJob, DONE, FAILED, RETRY
+from export_cache import ExportCache
 from max_interface import MaxScriptInterface
+from scene_cache import SceneCache
+from texture_stage import TextureStage
 from exporter import Exporter
+from pipeline_io import import_core
 from unreal_importer import UnrealImporter
 import config
 
-class ExportWorker(QThread):
-    finished = pyqtSignal(object, str) 
-    error = pyqtSignal(str)           
-
-    def __init__(self, interface, exporter, obj_name, path, do_lods, do_nanite):
-        super().__init__()
-        self.interface = interface
-        self.exporter = exporter
-        self.obj_name = obj_name
-        self.path = path
-        self.do_lods = do_lods
-        self.do_nanite = do_nanite
-
-    def run(self):
-        try:
-            stats = self.interface.get_object_stats(self.obj_name)
-            
-            self.interface.export_fbx(self.obj_name, self.path, self.do_lods, self.do_nanite)
-            
-            json_path = self.path.replace('.fbx', '.json')
-            
-            self.finished.emit(stats, json_path)
-        except Exception as e:
-            self.error.emit(str(e))
+class EngineBridge(QObject):
+    # Engine callbacks arrive on worker threads; re-emit them on the Qt thread.
+    progress = pyqtSignal(object, str)
 
 class PipelineUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.max_interface = MaxScriptInterface()
+        self.scene_cache = SceneCache(self.max_interface)
+        self.bridge = EngineBridge()
+        self.bridge.progress.connect(self.on_job_progress)
+        self.export_cache = ExportCache(config.EXPORT_CACHE_DIR, config.EXPORT_CACHE_MAX_BYTES, config.EXPORT_CACHE_MAX_AGE_DAYS)
+        self.engine = BatchExportEngine(self.max_interface, self.scene_cache, on_progress=self.bridge.progress.emit,
+                                        export_cache=self.export_cache, textures=TextureStage(),
+                                        predictor=import_core('PerformancePredictor').PerformancePredictor.load())
         self.exporter = Exporter()
         self.importer = UnrealImporter()
         self.init_ui()
@@ -108,14 +100,15 @@ class PipelineUI(QMainWindow):
         self.lod_checkbox.setChecked(True)
         self.lod_checkbox.setStyleSheet("font-weight: bold; color: #0078d4;")
         self.lod_checkbox.setToolTip("Generates 50%, 25%, and 12% reduction versions.")
-        self.nanite_checkbox = QCheckBox("Enable Nanite Support (UE5)")
-        self.nanite_checkbox.setChecked(False)
-        self.nanite_checkbox.setStyleSheet("font-weight: bold; color: #e83e8c;")
-        self.nanite_checkbox.setToolTip("Enables Virtualized Geometry. Note: Nanite meshes typically do not require standard LODs.")
+        self.nanite_combo = QComboBox()
+        self.nanite_combo.addItems(["Nanite: Auto (decided from the export)", "Nanite: Always", "Nanite: Never"])
+        self.nanite_combo.setStyleSheet("font-weight: bold; color: #e83e8c;")
+        self.nanite_combo.setToolTip("Auto weighs triangle density, bounds, masked/translucent materials and "
+                                     "Nanite vs LOD-chain memory per asset; the reasons go into the manifest.")
 
         path_layout.addLayout(file_layout)
         path_layout.addWidget(self.lod_checkbox)
-        path_layout.addWidget(self.nanite_checkbox)
+        path_layout.addWidget(self.nanite_combo)
         path_group.setLayout(path_layout)
         layout.addWidget(path_group)
         
@@ -137,10 +130,10 @@ class PipelineUI(QMainWindow):
         layout = QVBoxLayout(tab)
         layout.setSpacing(15)
         
-        info = QLabel("Select the exported FBX to generate the Unreal Python import script.")
+        info = QLabel("Select the exported FBX (or a folder of them, imported as one batch) to generate the Unreal Python import script.")
         layout.addWidget(info)
         self.fbx_input = QLineEdit()
-        self.fbx_input.setPlaceholderText("Path to exported FBX...")
+        self.fbx_input.setPlaceholderText("Path to exported FBX or export folder...")
         layout.addWidget(self.fbx_input)
         
         self.gen_btn = QPushButton("GENERATE UNREAL IMPORT SCRIPT")
@@ -174,7 +167,8 @@ class PipelineUI(QMainWindow):
 
     def load_objects(self):
         try:
-            objs = self.max_interface.get_scene_objects()
+            self.scene_cache.refresh()
+            objs = self.scene_cache.names()
             self.obj_combo.clear()
             self.obj_combo.addItems(objs)
             self.log(f"Loaded {len(objs)} objects from scene.", "blue")
@@ -190,7 +184,7 @@ class PipelineUI(QMainWindow):
         obj_name = self.obj_combo.currentText()
         export_path = self.path_input.text()
         do_lods = self.lod_checkbox.isChecked()
-        do_nanite = self.nanite_checkbox.isChecked()
+        do_nanite = (None, True, False)[self.nanite_combo.currentIndex()]
         
         if not obj_name:
             QMessageBox.warning(self, "Input Error", "Please select an object.")
@@ -203,16 +197,45 @@ class PipelineUI(QMainWindow):
         self.export_btn.setText("EXPORTING... (Processing...)")
         self.log(f"Starting export for '{obj_name}'...", "blue")
         
-        self.worker = ExportWorker(self.max_interface, self.exporter, obj_name, export_path, do_lods, do_nanite)
-        self.worker.finished.connect(self.on_export_done)
-        self.worker.error.connect(self.on_export_fail)
-        self.worker.start()
+        self.engine.submit(ExportJob(obj_name, export_path, do_lods, do_nanite))
+        self.engine.start()
+
+    def on_job_progress(self, job, event):
+        if event == DONE:
+            if job.cached:
+                self.log(f"'{job.object_name}' unchanged since its last export, reused cached files.", "gray")
+            self.on_export_done(job.stats, job.export_path.replace('.fbx', '.json'))
+        elif event == FAILED:
+            self.on_export_fail(job.error)
+        elif event == RETRY:
+            self.log(f"Retrying '{job.object_name}': {job.error}", "orange")
+        if event in (DONE, FAILED) and not self.engine.queue:
+            # The GUI never join()s the engine, so the cache index is written here.
+            self.export_cache.flush()
+
+    def closeEvent(self, event):
+        self.export_cache.flush()
+        super().closeEvent(event)
 
     def on_export_done(self, stats, json_path):
         self.export_btn.setEnabled(True)
         self.export_btn.setText("EXPORT ASSET")
         self.log("Export Successful!", "green")
         self.log(f"Metadata saved: {json_path}", "black")
+        try:
+            with open(json_path, 'r') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            metadata = {}
+        prediction = metadata.get('prediction')
+        if prediction:
+            memory = prediction['memory_mb']
+            spread = f" ({memory['low']:.2f}-{memory['high']:.2f})" if memory['low'] is not None else ""
+            self.log(f"Predicted: {prediction['complexity']}, {memory['value']:.2f} MB{spread}, "
+                     f"{prediction['draw_sections']['value']:.0f} sections", "black")
+        decision = metadata.get('nanite_decision')
+        if decision:
+            self.log(f"Nanite decision: {decision['mode'].upper()} ({'; '.join(decision['reasons'])})", "black")
         self.fbx_input.setText(self.path_input.text())
         QMessageBox.information(self, "Success", f"Asset exported successfully!")
 
@@ -228,16 +251,27 @@ class PipelineUI(QMainWindow):
             QMessageBox.warning(self, "Error", "FBX file not found.")
             return
         try:
-            script_path = self.importer.save_import_script(fbx_path)
+            if os.path.isdir(fbx_path):
+                fbx_files = self.importer.base_fbx_files(fbx_path)
+                if not fbx_files:
+                    QMessageBox.warning(self, "Error", "No FBX files in this folder.")
+                    return
+                script_path = self.importer.save_batch_import_script(
+                    fbx_files, os.path.join(fbx_path, "batch_import.py"))
+            else:
+                script_path = self.importer.save_import_script(fbx_path)
             self.log(f"Unreal script generated: {script_path}", "green")
             QMessageBox.information(self, "Script Generated", 
                 f"Python script created successfully!\n\nLocation: {script_path}\n\nRun this script inside Unreal Engine.")
         except Exception as e:
             self.log(f"Script generation failed: {e}", "red")
 
-if __name__ == '__main__':
+def main(argv=None, prog=None):
     app = QApplication(sys.argv)
     app.setStyle('Fusion') 
     window = PipelineUI()
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    return app.exec_()
+
+if __name__ == '__main__':
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,121 @@
+import base64
+import itertools
+import socket
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+
+PORT_FILE = "port.txt"
+
+
+class ChannelError(Exception):
+    pass
+
+
+def encode_frame(req_id, *fields):
+    payload = base64.b64encode(fields[-1].encode('utf-8')).decode('ascii')
+    return (" ".join([str(req_id)] + list(fields[:-1]) + [payload]) + "\n").encode('ascii')
+
+
+def decode_payload(payload):
+    return base64.b64decode(payload).decode('utf-8')
+
+
+class MaxChannel:
+    # Frames are single lines: "<id> <base64 script>" out, "<id> <OK|ERR> <base64 result>" back.
+    # Any number of requests can be in flight; replies are matched by id on a reader thread.
+    def __init__(self, channel_dir, connect_timeout=2):
+        self.channel_dir = Path(channel_dir)
+        self.port_file = self.channel_dir / PORT_FILE
+        self.connect_timeout = connect_timeout
+        self.sock = None
+        self.pending = {}
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()       # sock and pending; the reader thread needs it
+        self.send_lock = threading.Lock()  # one frame on the wire at a time
+
+    def _connect(self):
+        if not self.port_file.exists():
+            raise ChannelError(f"No monitor listening in {self.channel_dir}")
+        try:
+            port = int(self.port_file.read_text().strip())
+            sock = socket.create_connection(("127.0.0.1", port), timeout=self.connect_timeout)
+        except (ValueError, OSError) as e:
+            raise ChannelError(f"Could not reach monitor in {self.channel_dir}: {e}")
+        sock.settimeout(None)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = sock
+        threading.Thread(target=self._read_loop, args=(sock,), daemon=True).start()
+
+    def connect(self):
+        with self.lock:
+            if self.sock is None:
+                self._connect()
+
+    @property
+    def connected(self):
+        return self.sock is not None
+
+    def submit(self, script):
+        # The future is registered under the lock but sent outside it: a send that blocks
+        # on a full socket buffer must not keep the reader thread from resolving replies,
+        # or neither side drains the other.
+        future = Future()
+        with self.lock:
+            if self.sock is None:
+                self._connect()
+            sock = self.sock
+            req_id = next(self.ids)
+            self.pending[req_id] = future
+        future.req_id = req_id
+        try:
+            with self.send_lock:
+                sock.sendall(encode_frame(req_id, script))
+        except OSError as e:
+            with self.lock:
+                self.pending.pop(req_id, None)
+                self._drop(sock)
+            raise ChannelError(f"Lost connection to monitor: {e}")
+        return future
+
+    def forget(self, future):
+        with self.lock:
+            self.pending.pop(getattr(future, 'req_id', None), None)
+
+    def close(self):
+        with self.lock:
+            if self.sock is not None:
+                self._drop(self.sock)
+
+    def _drop(self, sock):
+        # Caller holds the lock. A reader thread of an already replaced socket must not
+        # fail the requests that belong to the new connection.
+        try:
+            sock.close()
+        except OSError:
+            pass
+        if self.sock is not sock:
+            return
+        self.sock = None
+        pending, self.pending = self.pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(ChannelError("Connection to monitor closed"))
+
+    def _read_loop(self, sock):
+        try:
+            for line in sock.makefile('rb'):
+                parts = line.decode('ascii').split()
+                if len(parts) < 2:
+                    continue
+                req_id, status = int(parts[0]), parts[1]
+                text = decode_payload(parts[2]) if len(parts) > 2 else ""
+                with self.lock:
+                    future = self.pending.pop(req_id, None)
+                if future is None or future.done():
+                    continue
+                future.set_result(text if status == "OK" else "ERROR: " + text)
+        except (OSError, ValueError):
+            pass
+        with self.lock:
+            self._drop(sock)
@@ -1,39 +1,59 @@
-import os
-import time
+import json
 import tempfile
+from concurrent.futures import TimeoutError as FutureTimeout
 from pathlib import Path
 
+import tracing
+from max_channel import MaxChannel, ChannelError
+
+class MaxConnectionError(Exception):
+    # The monitor could not be reached, went away, or did not answer in time.
+    pass
+
+class MaxTimeoutError(MaxConnectionError):
+    # The monitor is there but did not answer in time: Max may still be busy with the
+    # request, so the seat is not lost.
+    pass
+
+def max_string(value):
+    return '"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
 class MaxScriptInterface:
-    def __init__(self):
-        self.temp_dir = Path(tempfile.gettempdir()) / "3dsMaxPipeline"
+    def __init__(self, channel_dir=None):
+        self.temp_dir = Path(channel_dir) if channel_dir else Path(tempfile.gettempdir()) / "3dsMaxPipeline"
         self.temp_dir.mkdir(parents=True, exist_ok=True)
-        self.command_file = self.temp_dir / "command.ms"
-        self.result_file = self.temp_dir / "result.txt"
-        
-        if self.command_file.exists(): self.command_file.unlink()
-        if self.result_file.exists(): self.result_file.unlink()
+        self.channel = MaxChannel(self.temp_dir)
+
+    def submit(self, script):
+        try:
+            future = self.channel.submit(script)
+        except ChannelError as e:
+            raise MaxConnectionError(f"{e}. Is monitor.ms running?")
+        future.submitted_us = tracing.now_us()
+        return future
+
+    def wait(self, future, timeout=30):
+        try:
+            result = future.result(timeout).strip()
+            tracing.complete("ipc", future.submitted_us, tracing.now_us() - future.submitted_us, 'ipc',
+                             request=future.req_id)
+            return result
+        except FutureTimeout:
+            self.channel.forget(future)
+            raise MaxTimeoutError(f"3ds Max timed out ({timeout}s). Is monitor.ms running?")
+        except ChannelError as e:
+            raise MaxConnectionError(f"{e}. Is monitor.ms running?")
 
     def execute(self, script, timeout=30):
-        if self.result_file.exists():
-            self.result_file.unlink()
-
-        with open(self.command_file, 'w') as f:
-            f.write(script)
-
-        max_attempts = timeout * 10
-        for i in range(max_attempts):
-            if self.result_file.exists():
-                time.sleep(0.1) 
-                try:
-                    with open(self.result_file, 'r') as f:
-                        result = f.read().strip()
-                    self.result_file.unlink()
-                    return result
-                except:
-                    pass
-            time.sleep(0.1)
-        raise Exception(f"3ds Max timed out ({timeout}s). Is monitor.ms running?")
-    
+        return self.wait(self.submit(script), timeout)
+
+    def execute_many(self, scripts, timeout=30):
+        futures = [self.submit(s) for s in scripts]
+        return [self.wait(f, timeout) for f in futures]
+
+    def close(self):
+        self.channel.close()
+
     def test_connection(self):
         try:
             res = self.execute('print "Ping"', timeout=2)
@@ -41,21 +61,35 @@ class MaxScriptInterface:
         except:
             return False
 
-    def get_scene_objects(self):
-        script = """
-        (
-            local ss = stringStream ""
-            local names = for o in geometry collect o.name
-            for i = 1 to names.count do (
-                format "%" names[i] to:ss
-                if i < names.count do format "," to:ss
-            )
-            ss as string
-        )
-        """
-        response = self.execute(script)
-        if not response or "ERROR" in response: return []
-        return [x for x in response.split(',') if x.strip()]
+    def get_scene_objects(self, pattern="*"):
+        response = self.execute(f'sceneQuery.names pattern:{max_string(pattern)}')
+        if not response or response.startswith("ERROR"): return []
+        return json.loads(response)
+
+    def query_scene(self, since_rev=-1, pattern="*", page_size=500, timeout=60):
+        # Yields (header, objects) per page. The first page tells us how many objects
+        # match; the remaining pages are then requested all at once and streamed back
+        # in order as the monitor answers them.
+        first = self.execute(f'sceneQuery.query {since_rev} 0 {page_size} pattern:{max_string(pattern)}', timeout)
+        header, objects = self._parse_scene_page(first)
+        yield header, objects
+        futures = [self.submit(f'sceneQuery.query {since_rev} {offset} {page_size} pattern:{max_string(pattern)}')
+                   for offset in range(page_size, header['total'], page_size)]
+        for future in futures:
+            yield self._parse_scene_page(self.wait(future, timeout))
+
+    def _parse_scene_page(self, response):
+        if response.startswith("ERROR"):
+            raise Exception(f"Scene query failed: {response}")
+        lines = response.splitlines()
+        return json.loads(lines[0]), [json.loads(line) for line in lines[1:] if line.strip()]
+
+    def get_unit_scale(self):
+        # Centimetres per system unit, the unit the scene query's transforms are in.
+        try:
+            return 1.0 / float(self.execute('(units.decodeValue "1cm") as string'))
+        except (ValueError, ZeroDivisionError):
+            return 1.0
 
     def get_object_stats(self, object_name):
         script = f"""
@@ -81,22 +115,32 @@ class MaxScriptInterface:
         except ValueError:
             raise Exception(f"Could not parse data: {response}")
 
-    def export_fbx(self, object_name, export_path, do_lods=True, do_nanite=False):
+    def export_fbx(self, object_name, export_path, do_lods=True, do_nanite=False, lod_levels=None, complexity=None):
+        # lod_levels: LOD sizes in percent of LOD0 (LodPolicy); AssetPipeline's defaults if None.
+        # complexity: the budget rules' class -> GPU MB bounds, for the manifest's class.
         path = export_path.replace('\\', '\\\\')
         
         max_lod = "true" if do_lods else "false"
         max_nanite = "true" if do_nanite else "false"
+        max_levels = ""
+        if lod_levels is not None:
+            max_levels = " lodLevels:#(" + ", ".join(str(level) for level in lod_levels) + ")"
+        if complexity:
+            bounds = sorted(complexity.items(), key=lambda item: item[1])
+            max_levels += " complexity:#(" + ", ".join(f'#("{label}", {bound})' for label, bound in bounds) + ")"
         
         script = f"""
         (
             if pipeline != undefined then (
                 -- We now pass 4 arguments to MaxScript
-                pipeline.runAutomatedExport "{object_name}" "{path}" {max_lod} {max_nanite}
+                pipeline.runAutomatedExport "{object_name}" "{path}" {max_lod} {max_nanite}{max_levels}
             ) else (
                 "ERROR: AssetPipeline.ms not loaded!"
             )
         )
         """
-        res = self.execute(script, timeout=120)
+        with tracing.span("max_export", 'export', asset=object_name) as span:
+            res = self.execute(script, timeout=120)
         if "ERROR" in res: raise Exception(res)
+        tracing.max_stages(span, export_path.replace('.fbx', '.json'))
         return True
\ No newline at end of file
@@ -0,0 +1,259 @@
+import argparse
+import json
+import os
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from fbx_reader import FbxDocument, FbxError, fbx_stats, iter_fbx_files, lod_files
+
+# Typed geometry arrays next to each FBX (Asset.fbx -> Asset.mesh), read back with np.memmap.
+MAGIC = b"PAMESH\x00\x01"
+VERSION = 1
+SUFFIX = '.mesh'
+ALIGNMENT = 64
+HEADER = struct.Struct('<8sIII12x')        # 32 bytes
+ENTRY = struct.Struct('<16s8sQIQQI4x')     # 64 bytes
+MTIME_SLACK = 2.0  # seconds; FAT and some network shares store coarse timestamps
+
+
+class SidecarError(Exception):
+    pass
+
+
+def sidecar_path(fbx_path):
+    return Path(fbx_path).with_suffix(SUFFIX)
+
+
+def align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_sidecar(path, arrays, meta):
+    # arrays: name -> 1D or 2D numpy array, written in order after the table.
+    path = Path(path)
+    sections = dict(arrays, meta=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8))
+    offset = align(HEADER.size + ENTRY.size * len(sections))
+    entries, blobs = [], []
+    for name, array in sections.items():
+        if len(name.encode('ascii')) > 16:
+            raise SidecarError(f"section name too long: {name}")
+        array = np.ascontiguousarray(array)
+        rows, cols = (array.shape[0], array.shape[1]) if array.ndim == 2 else (array.shape[0], 0)
+        data = array.tobytes()
+        entries.append(ENTRY.pack(name.encode('ascii'), array.dtype.str.encode('ascii'), rows, cols, offset,
+                                  len(data), zlib.crc32(data)))
+        blobs.append((offset, data))
+        offset = align(offset + len(data))
+    table = b"".join(entries)
+
+    tmp = path.with_suffix(SUFFIX + '.tmp')
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(entries), zlib.crc32(table)))
+        f.write(table)
+        for start, data in blobs:
+            f.write(b"\x00" * (start - f.tell()))
+            f.write(data)
+    os.replace(tmp, path)
+    return path
+
+
+class MeshSidecar:
+    def __init__(self, path, verify=False):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise SidecarError(f"{self.path}: truncated header")
+            magic, self.version, count, table_crc = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise SidecarError(f"{self.path}: not a mesh sidecar")
+            if self.version > VERSION:
+                raise SidecarError(f"{self.path}: version {self.version} is newer than this reader ({VERSION})")
+            table = f.read(ENTRY.size * count)
+        if len(table) < ENTRY.size * count or zlib.crc32(table) != table_crc:
+            raise SidecarError(f"{self.path}: corrupt section table")
+        size = self.path.stat().st_size
+        self.sections = {}
+        for i in range(count):
+            name, dtype, rows, cols, offset, nbytes, crc = ENTRY.unpack_from(table, i * ENTRY.size)
+            name = name.rstrip(b"\x00").decode('ascii')
+            if offset + nbytes > size:
+                raise SidecarError(f"{self.path}: truncated section {name}")
+            self.sections[name] = (dtype.rstrip(b"\x00").decode('ascii'), rows, cols, offset, nbytes, crc)
+        self.arrays = {}
+        if 'meta' not in self.sections:
+            raise SidecarError(f"{self.path}: missing meta section")
+        meta = self.array('meta').tobytes()
+        if zlib.crc32(meta) != self.sections['meta'][5]:
+            raise SidecarError(f"{self.path}: checksum mismatch in section meta")
+        self.meta = json.loads(meta)
+        if verify:
+            self.verify()
+
+    def array(self, name):
+        # Read-only view straight onto the file; nothing is copied until it is touched.
+        if name not in self.arrays:
+            if name not in self.sections:
+                return None
+            dtype, rows, cols, offset, nbytes, crc = self.sections[name]
+            shape = (rows, cols) if cols else (rows,)
+            if nbytes == 0:
+                self.arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                self.arrays[name] = np.memmap(self.path, dtype=dtype, mode='r', offset=offset, shape=shape)
+        return self.arrays[name]
+
+    def verify(self):
+        # Checksums every section; this reads the whole file, so it is opt-in.
+        for name, (dtype, rows, cols, offset, nbytes, crc) in self.sections.items():
+            if zlib.crc32(memoryview(self.array(name)).cast('B')) != crc:
+                raise SidecarError(f"{self.path}: checksum mismatch in section {name}")
+        return True
+
+    @property
+    def positions(self):
+        return self.array('positions')
+
+    @property
+    def indices(self):
+        return self.array('indices')
+
+    @property
+    def normals(self):
+        return self.array('normals')
+
+    @property
+    def material_ids(self):
+        return self.array('material_ids')
+
+    def uv(self, channel=0):
+        return self.array(f'uv{channel}')
+
+    def uv_channels(self):
+        return sum(1 for name in self.sections if name.startswith('uv'))
+
+    def triangle_count(self):
+        return self.sections['indices'][1]
+
+    def vertex_count(self):
+        return self.sections['positions'][1]
+
+    def is_current(self, fbx_path):
+        # Written from this exact FBX: same size and (within filesystem precision) mtime.
+        try:
+            st = os.stat(fbx_path)
+        except OSError:
+            return False
+        source = self.meta.get('source', {})
+        return source.get('size') == st.st_size and abs(source.get('mtime', 0) - st.st_mtime) <= MTIME_SLACK
+
+
+def mesh_arrays(fbx_path):
+    # Every mesh in the file merged into one set of arrays; material IDs are offset by
+    # the slots of the meshes before them, as combine_meshes does on import.
+    parts = {'positions': [], 'indices': [], 'normals': [], 'material_ids': []}
+    vertex_offset = material_offset = 0
+    with FbxDocument(fbx_path) as doc:
+        meshes = list(doc.meshes())
+        uv_count = min((m.uv_set_count() for m in meshes), default=0)
+        uv_sets = [[] for _ in range(uv_count)]
+        have_normals = all(m.layers("LayerElementNormal") for m in meshes)
+        for mesh in meshes:
+            positions = mesh.positions()
+            corners = mesh.triangle_corners().ravel()
+            parts['positions'].append(positions.astype(np.float32))
+            parts['indices'].append(mesh.triangles() + vertex_offset)
+            if have_normals:
+                normals = mesh.layer_values("LayerElementNormal", "Normals", "NormalsIndex", 3)
+                parts['normals'].append(normals[corners].astype(np.float32))
+            for channel in range(uv_count):
+                uvs = mesh.layer_values("LayerElementUV", "UV", "UVIndex", 2, index=channel)
+                uv_sets[channel].append(uvs[corners].astype(np.float32))
+            ids = mesh.material_ids()
+            triangles = mesh.triangle_polygons()
+            parts['material_ids'].append((ids[triangles] if ids is not None else np.zeros(len(triangles), np.int64))
+                                         + material_offset)
+            vertex_offset += len(positions)
+            material_offset += max(mesh.material_slot_count(), 1)
+
+    arrays = {}
+    vertices = vertex_offset
+    arrays['positions'] = np.concatenate(parts['positions']) if meshes else np.empty((0, 3), np.float32)
+    indices = np.concatenate(parts['indices']) if meshes else np.empty((0, 3), np.int64)
+    arrays['indices'] = indices.astype(np.uint16 if vertices <= 0xFFFF else np.uint32)
+    if have_normals and meshes:
+        arrays['normals'] = np.concatenate(parts['normals'])
+    for channel, uvs in enumerate(uv_sets):
+        arrays[f'uv{channel}'] = np.concatenate(uvs)
+    ids = np.concatenate(parts['material_ids']) if meshes else np.empty(0, np.int64)
+    arrays['material_ids'] = ids.astype(np.uint16 if material_offset <= 0xFFFF else np.uint32)
+    return arrays
+
+
+def build_sidecar(fbx_path, path=None):
+    st = os.stat(fbx_path)
+    stats = fbx_stats(fbx_path, use_sidecar=False)
+    meta = {'source': {'file': Path(fbx_path).name, 'size': st.st_size, 'mtime': st.st_mtime}, 'stats': stats}
+    return write_sidecar(path or sidecar_path(fbx_path), mesh_arrays(fbx_path), meta)
+
+
+def current_sidecar(fbx_path):
+    # The sidecar for fbx_path if one exists and was written from this FBX, else None.
+    path = sidecar_path(fbx_path)
+    if not path.exists():
+        return None
+    try:
+        sidecar = MeshSidecar(path)
+    except (SidecarError, OSError, ValueError):
+        return None
+    return sidecar if sidecar.is_current(fbx_path) else None
+
+
+def open_sidecar(fbx_path, verify=False):
+    # Opens the current sidecar, (re)building it from the FBX first when needed.
+    sidecar = current_sidecar(fbx_path)
+    if sidecar is None:
+        build_sidecar(fbx_path)
+        sidecar = MeshSidecar(sidecar_path(fbx_path))
+    if verify:
+        sidecar.verify()
+    return sidecar
+
+
+def write_for_export(export_path, force=False):
+    # Sidecars for an exported FBX and its _LODn siblings; current ones are left alone.
+    written = []
+    for fbx_path in [Path(export_path)] + lod_files(export_path):
+        if force or current_sidecar(fbx_path) is None:
+            written.append(build_sidecar(fbx_path))
+    return written
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Write or check binary .mesh sidecars next to FBX exports")
+    parser.add_argument('paths', nargs='+', help="FBX files or directories to scan")
+    parser.add_argument('--force', action='store_true', help="rewrite sidecars that are still current")
+    parser.add_argument('--verify', action='store_true', help="checksum existing sidecars instead of writing")
+    args = parser.parse_args()
+
+    failed = 0
+    for fbx_path in iter_fbx_files(args.paths):
+        try:
+            if args.verify:
+                for path in [fbx_path] + lod_files(fbx_path):
+                    sidecar = MeshSidecar(sidecar_path(path), verify=True)
+                    state = "ok" if sidecar.is_current(path) else "stale"
+                    print(f"{sidecar.path}: {state}, {sidecar.triangle_count()} tris, "
+                          f"{sidecar.vertex_count()} verts, {sidecar.uv_channels()} UV sets")
+                    failed += state != "ok"
+            else:
+                for path in write_for_export(fbx_path, args.force):
+                    print(f"{path}: {path.stat().st_size} bytes")
+        except (SidecarError, FbxError, OSError, zlib.error) as e:
+            print(f"{fbx_path}: {e}", file=sys.stderr)
+            failed += 1
+    raise SystemExit(1 if failed else 0)
@@ -0,0 +1,29 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+# Core module loading and the JSON manifest next to each export (Asset.fbx -> Asset.json).
+CORE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'UnrealScripts', 'Core')
+
+
+def import_core(module_name):
+    if CORE_PATH not in sys.path:
+        sys.path.insert(0, CORE_PATH)
+    return __import__(module_name)
+
+
+def read_manifest(fbx_path):
+    try:
+        with open(Path(fbx_path).with_suffix('.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(fbx_path, manifest):
+    path = Path(fbx_path).with_suffix('.json')
+    tmp = path.with_suffix('.json.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp, path)
@@ -0,0 +1,72 @@
+import threading
+
+INCREMENTAL_PAGE = 1 << 30
+
+class SceneCache:
+    # Mirror of the Max scene built from sceneQuery. The first refresh pulls every
+    # object; later refreshes only transfer objects whose revision moved.
+    def __init__(self, interface, pattern="*", page_size=500):
+        self.interface = interface
+        self.pattern = pattern
+        self.page_size = page_size
+        self.epoch = None
+        self.revision = -1
+        self.objects = {}
+        self.order = []
+        self.by_name = {}
+        self.lock = threading.Lock()
+
+    def refresh(self):
+        with self.lock:
+            since = self.revision
+            # Incremental refreshes only carry changed objects, so one page is enough.
+            page_size = self.page_size if since == -1 else INCREMENTAL_PAGE
+            pages = self.interface.query_scene(since, self.pattern, page_size)
+            header, objects = next(pages)
+            if header['epoch'] != self.epoch:
+                # New or reset scene: handles are no longer meaningful, start over.
+                self.epoch = header['epoch']
+                self.objects = {}
+                if since != -1:
+                    pages.close()
+                    pages = self.interface.query_scene(-1, self.pattern, self.page_size)
+                    header, objects = next(pages)
+
+            live = set(header['handles'])
+            for handle in list(self.objects):
+                if handle not in live:
+                    del self.objects[handle]
+            self._merge(objects)
+            for _, objects in pages:
+                self._merge(objects)
+            self.order = header['handles']
+            self.by_name = {obj['name']: obj for obj in self.objects.values()}
+            self.revision = header['rev']
+            return len(self.order)
+
+    def _merge(self, objects):
+        for obj in objects:
+            self.objects[obj['handle']] = obj
+
+    def names(self):
+        return [self.objects[h]['name'] for h in self.order if h in self.objects]
+
+    def find(self, name):
+        return self.by_name.get(name)
+
+    def get_stats(self, name, refresh=True):
+        if refresh:
+            self.refresh()
+        obj = self.find(name)
+        if obj is None or 'error' in obj:
+            return self.interface.get_object_stats(name)
+        return {
+            'polygons': obj['tris'],
+            'vertices': obj['verts'],
+            'material_slots': obj.get('slots', 1),
+            'radius_cm': obj.get('radius'),
+            'material': obj['material'],
+            'material_hash': obj.get('materialHash'),
+            'geometry_hash': obj['hash'],
+            'transform': obj.get('transform'),
+        }
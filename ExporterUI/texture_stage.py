@@ -0,0 +1,434 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import config
+from pipeline_io import import_core, read_manifest, write_manifest
+
+# Texture audit from image headers and power-of-two DDS conditioning into a shared cache.
+MAX_TEXTURE_SIZE = 2048    # used when the budget rules have no 'texture_size' rule
+CONDITION_VERSION = 1      # bump when conditioned output changes, invalidating the cache
+POOL_THRESHOLD = 64        # below this many files a process pool costs more than it saves
+
+
+class TextureError(Exception):
+    pass
+
+
+def png_size(f):
+    head = f.read(26)
+    if head[12:16] != b'IHDR':
+        raise TextureError("PNG without IHDR chunk")
+    width, height = struct.unpack('>II', head[16:24])
+    return {'format': 'png', 'width': width, 'height': height, 'bit_depth': head[24]}
+
+
+def jpeg_size(f):
+    # Walks the marker segments up to the first start-of-frame; entropy-coded data
+    # only follows SOS, which comes after it.
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            raise TextureError("JPEG without a frame header")
+        marker = byte[0]
+        if marker == 0x01 or 0xd0 <= marker <= 0xd8:
+            continue
+        length = struct.unpack('>H', f.read(2))[0]
+        if marker in (0xc0, 0xc1, 0xc2, 0xc3, 0xc5, 0xc6, 0xc7, 0xc9, 0xca, 0xcb, 0xcd, 0xce, 0xcf):
+            precision, height, width = struct.unpack('>BHH', f.read(5))
+            return {'format': 'jpeg', 'width': width, 'height': height, 'bit_depth': precision}
+        if marker == 0xda:
+            raise TextureError("JPEG without a frame header")
+        f.seek(length - 2, os.SEEK_CUR)
+
+
+def tga_size(f):
+    head = f.read(18)
+    if len(head) < 18 or head[2] not in (1, 2, 3, 9, 10, 11):
+        raise TextureError("not a TGA file")
+    width, height = struct.unpack('<HH', head[12:16])
+    return {'format': 'tga', 'width': width, 'height': height, 'bit_depth': head[16]}
+
+
+def bmp_size(f):
+    head = f.read(26)
+    width, height = struct.unpack('<ii', head[18:26])
+    return {'format': 'bmp', 'width': width, 'height': abs(height)}
+
+
+def dds_size(f):
+    head = f.read(128)
+    if len(head) < 128:
+        raise TextureError("truncated DDS header")
+    height, width = struct.unpack('<II', head[12:20])
+    mips = struct.unpack('<I', head[28:32])[0] or 1
+    fourcc = head[84:88]
+    return {'format': 'dds', 'width': width, 'height': height, 'mips': mips,
+            'compression': fourcc.decode('ascii', 'replace') if fourcc.strip(b'\x00') else 'rgba'}
+
+
+def exr_size(f):
+    # The header is a list of (name, type, size, value) attributes ended by an empty name.
+    f.seek(8)
+
+    def c_string():
+        chars = bytearray()
+        while True:
+            ch = f.read(1)
+            if not ch:
+                raise TextureError("truncated EXR header")
+            if ch == b'\x00':
+                return chars.decode('ascii', 'replace')
+            chars += ch
+
+    while True:
+        name = c_string()
+        if not name:
+            raise TextureError("EXR without dataWindow")
+        c_string()
+        size = struct.unpack('<i', f.read(4))[0]
+        if name == 'dataWindow':
+            xmin, ymin, xmax, ymax = struct.unpack('<4i', f.read(16))
+            return {'format': 'exr', 'width': xmax - xmin + 1, 'height': ymax - ymin + 1}
+        f.seek(size, os.SEEK_CUR)
+
+
+SIGNATURES = [
+    (b'\x89PNG\r\n\x1a\n', png_size),
+    (b'\xff\xd8', jpeg_size),
+    (b'DDS ', dds_size),
+    (b'\x76\x2f\x31\x01', exr_size),
+    (b'BM', bmp_size),
+]
+
+
+def texture_info(path):
+    # Format and size from the header alone. TGA has no magic number, so it is
+    # recognised by its extension once the other signatures did not match.
+    with open(path, 'rb') as f:
+        magic = f.read(8)
+        for signature, reader in SIGNATURES:
+            if magic.startswith(signature):
+                f.seek(0)
+                info = reader(f)
+                break
+        else:
+            if not str(path).lower().endswith('.tga'):
+                raise TextureError("unknown image format")
+            f.seek(0)
+            info = tga_size(f)
+    info.setdefault('mips', 1)
+    info['path'] = str(path)
+    return info
+
+
+def read_info(path):
+    # texture_info that reports failures in the result, for use in worker processes.
+    try:
+        return texture_info(path)
+    except FileNotFoundError:
+        return {'path': str(path), 'error': "missing"}
+    except (OSError, struct.error, TextureError) as e:
+        return {'path': str(path), 'error': str(e) or type(e).__name__}
+
+
+def is_power_of_two(n):
+    return n > 0 and n & (n - 1) == 0
+
+
+def texture_issues(info, max_size=MAX_TEXTURE_SIZE):
+    # Same wording as the old MaterialAnalyzer.ms checks, keyed by file name.
+    name = os.path.basename(info['path'])
+    if 'error' in info:
+        return f"{name} is missing. " if info['error'] == "missing" else f"{name} could not be read ({info['error']}). "
+    size = f"{info['width']}x{info['height']}"
+    issues = ""
+    if info['width'] > max_size or info['height'] > max_size:
+        issues += f"{name} {size} is too large. "
+    if not (is_power_of_two(info['width']) and is_power_of_two(info['height'])):
+        issues += f"{name} {size} is NOT Power of Two. "
+    return issues
+
+
+def read_textures(paths, processes=None):
+    # Header reads for every distinct path, in a process pool when there are enough of
+    # them to pay for starting one.
+    unique = list(dict.fromkeys(str(p) for p in paths))
+    if processes == 1 or len(unique) < POOL_THRESHOLD:
+        return {p: read_info(p) for p in unique}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        chunk = max(1, len(unique) // ((processes or os.cpu_count() or 1) * 4))
+        return dict(zip(unique, pool.map(read_info, unique, chunksize=chunk)))
+
+
+def conditioned_size(width, height, max_size=MAX_TEXTURE_SIZE):
+    # Nearest power of two per side, then both sides scaled down together until the
+    # larger one fits the budget.
+    limit = 1 << int(math.log2(max_size))
+    width = 1 << max(0, round(math.log2(width)))
+    height = 1 << max(0, round(math.log2(height)))
+    while width > limit or height > limit:
+        width, height = max(1, width // 2), max(1, height // 2)
+    return width, height
+
+
+def load_pixels(path):
+    # RGBA float32 array (rows top to bottom). Uncompressed TGA is read directly; every
+    # other format needs Pillow, which is only imported here.
+    import numpy as np
+
+    with open(path, 'rb') as f:
+        head = f.read(18)
+        if str(path).lower().endswith('.tga') and len(head) == 18 and head[2] in (2, 3) and head[16] in (8, 24, 32):
+            width, height = struct.unpack('<HH', head[12:16])
+            channels = head[16] // 8
+            f.seek(18 + head[0] + (struct.unpack('<H', head[5:7])[0] * ((head[7] + 7) // 8) if head[1] else 0))
+            data = np.frombuffer(f.read(width * height * channels), dtype=np.uint8)
+            data = data.reshape(height, width, channels).astype(np.float32)
+            if not head[17] & 0x20:
+                data = data[::-1]
+            if channels == 1:
+                return np.concatenate([np.repeat(data, 3, axis=2), np.full((height, width, 1), 255, np.float32)], axis=2)
+            rgba = np.empty((height, width, 4), np.float32)
+            rgba[..., :3] = data[..., 2::-1]
+            rgba[..., 3] = data[..., 3] if channels == 4 else 255
+            return rgba
+    try:
+        from PIL import Image
+    except ImportError:
+        raise TextureError(f"Pillow is needed to decode {Path(path).suffix} textures")
+    with Image.open(path) as image:
+        return np.asarray(image.convert('RGBA'), dtype=np.float32)
+
+
+def resample_axis(pixels, size, axis):
+    # Area average when shrinking (exact box filter through prefix sums), linear
+    # interpolation when growing.
+    import numpy as np
+
+    old = pixels.shape[axis]
+    if size == old:
+        return pixels
+    moved = np.moveaxis(pixels, axis, 0)
+    if size < old:
+        prefix = np.concatenate([np.zeros((1,) + moved.shape[1:], np.float64), np.cumsum(moved, axis=0, dtype=np.float64)])
+        edges = np.arange(size + 1) * (old / size)
+        lower = np.floor(edges).astype(np.int64)
+        upper = np.minimum(lower + 1, old)
+        frac = (edges - lower).reshape((-1,) + (1,) * (moved.ndim - 1))
+        at_edges = prefix[lower] + (prefix[upper] - prefix[lower]) * frac
+        result = (at_edges[1:] - at_edges[:-1]) / (old / size)
+    else:
+        centres = np.clip((np.arange(size) + 0.5) * (old / size) - 0.5, 0, old - 1)
+        lower = np.floor(centres).astype(np.int64)
+        upper = np.minimum(lower + 1, old - 1)
+        frac = (centres - lower).reshape((-1,) + (1,) * (moved.ndim - 1))
+        result = moved[lower] * (1 - frac) + moved[upper] * frac
+    return np.moveaxis(result.astype(np.float32), 0, axis)
+
+
+def mip_chain(pixels):
+    levels = [pixels]
+    while pixels.shape[0] > 1 or pixels.shape[1] > 1:
+        if pixels.shape[0] > 1:
+            pixels = (pixels[0::2] + pixels[1::2]) * 0.5
+        if pixels.shape[1] > 1:
+            pixels = (pixels[:, 0::2] + pixels[:, 1::2]) * 0.5
+        levels.append(pixels)
+    return levels
+
+
+def write_dds(path, levels):
+    # Uncompressed B8G8R8A8 with the whole mip chain, which every DDS reader accepts.
+    import numpy as np
+
+    height, width = levels[0].shape[:2]
+    header = struct.pack('<4s7I44x8I5I', b'DDS ', 124, 0x1 | 0x2 | 0x4 | 0x8 | 0x1000 | 0x20000,
+                         height, width, width * 4, 0, len(levels),
+                         32, 0x40 | 0x1, 0, 32, 0x00ff0000, 0x0000ff00, 0x000000ff, 0xff000000,
+                         0x1000 | 0x400000 | 0x8, 0, 0, 0, 0)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(header)
+        for level in levels:
+            bgra = np.clip(level + 0.5, 0, 255).astype(np.uint8)[..., [2, 1, 0, 3]]
+            f.write(np.ascontiguousarray(bgra).tobytes())
+    os.replace(tmp, path)
+
+
+def source_key(path, max_size):
+    digest = hashlib.sha1(f"{CONDITION_VERSION}\n{max_size}\n".encode())
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def condition_texture(path, max_size=MAX_TEXTURE_SIZE, cache_dir=config.TEXTURE_CACHE_DIR):
+    # Returns where the conditioned copy of path lives in cache_dir, producing it only
+    # when no earlier run stored one for the same content and budget.
+    key = source_key(path, max_size)
+    target = Path(cache_dir) / key[:2] / f"{key}.dds"
+    if target.exists():
+        with open(target, 'rb') as f:
+            info = dds_size(f)
+        return {'source': str(path), 'path': str(target), 'width': info['width'], 'height': info['height'],
+                'mips': info['mips'], 'cached': True}
+    pixels = load_pixels(path)
+    width, height = conditioned_size(pixels.shape[1], pixels.shape[0], max_size)
+    pixels = resample_axis(resample_axis(pixels, height, 0), width, 1)
+    levels = mip_chain(pixels)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    write_dds(target, levels)
+    return {'source': str(path), 'path': str(target), 'width': width, 'height': height,
+            'mips': len(levels), 'cached': False}
+
+
+def condition_job(args):
+    try:
+        return condition_texture(*args)
+    except (OSError, ValueError, TextureError) as e:
+        return {'source': str(args[0]), 'error': str(e)}
+
+
+def asset_textures(fbx_path, manifest=None):
+    # The manifest's 'textures' list (written by MaterialAnalyzer.ms), else the texture
+    # objects in the FBX. Paths that do not exist as given are looked up next to the FBX,
+    # where they usually end up when exports are copied to another machine.
+    if manifest is not None and 'textures' in manifest:
+        paths = manifest['textures']
+    else:
+        from fbx_reader import FbxDocument
+        with FbxDocument(fbx_path) as doc:
+            paths = doc.texture_paths()
+    folder = Path(fbx_path).parent
+    resolved = []
+    for path in paths:
+        candidate = Path(path.replace('\\', os.sep))
+        if not candidate.is_absolute():
+            candidate = folder / candidate
+        if not candidate.exists() and (folder / candidate.name).exists():
+            candidate = folder / candidate.name
+        resolved.append(str(candidate))
+    return resolved
+
+
+class TextureStage:
+    # Budgets come from the rule set (metric 'texture_size', so categories and platforms
+    # can have their own), falling back to MAX_TEXTURE_SIZE. With a cache_dir, textures
+    # that fail the audit are also conditioned.
+    def __init__(self, rules=None, platform=None, cache_dir=None, processes=None):
+        BudgetRules = import_core('BudgetRules')
+        self.rules = rules or BudgetRules.RuleSet.load()
+        self.platform = platform or os.environ.get(BudgetRules.PLATFORM_ENV)
+        self.cache_dir = cache_dir
+        self.processes = processes
+
+    def max_size(self, fbx_path, manifest=None):
+        category = self.rules.category_of(Path(fbx_path).stem, manifest)
+        return int(self.rules.limit('texture_size', category, self.platform) or MAX_TEXTURE_SIZE)
+
+    def audit_exports(self, fbx_paths):
+        # One result per export: header reads for all distinct textures of the batch, then
+        # conditioning of the failing ones, both spread over worker processes.
+        assets = []
+        for fbx_path in fbx_paths:
+            manifest = read_manifest(fbx_path)
+            assets.append((str(fbx_path), manifest, asset_textures(fbx_path, manifest), self.max_size(fbx_path, manifest)))
+        infos = read_textures([p for _, _, paths, _ in assets for p in paths], self.processes)
+        conditioned = {}
+        if self.cache_dir is not None:
+            jobs = list(dict.fromkeys((p, max_size, str(self.cache_dir)) for _, _, paths, max_size in assets for p in paths
+                                      if 'error' not in infos[p] and texture_issues(infos[p], max_size)))
+            if self.processes == 1 or len(jobs) < 2:
+                done = [condition_job(job) for job in jobs]
+            else:
+                with ProcessPoolExecutor(max_workers=self.processes) as pool:
+                    done = list(pool.map(condition_job, jobs))
+            conditioned = {(job[0], job[1]): result for job, result in zip(jobs, done)}
+        return [self.asset_result(fbx_path, manifest, paths, max_size, infos, conditioned)
+                for fbx_path, manifest, paths, max_size in assets]
+
+    def audit_export(self, fbx_path, update_manifest=True):
+        # Single asset, in the calling thread (a handful of header reads), for the export
+        # engine: the manifest's texture_issues is replaced by the header-based audit.
+        manifest = read_manifest(fbx_path)
+        paths = asset_textures(fbx_path, manifest)
+        max_size = self.max_size(fbx_path, manifest)
+        infos = {p: read_info(p) for p in paths}
+        conditioned = {}
+        if self.cache_dir is not None:
+            for p in paths:
+                if 'error' not in infos[p] and texture_issues(infos[p], max_size):
+                    conditioned[(p, max_size)] = condition_job((p, max_size, str(self.cache_dir)))
+        result = self.asset_result(str(fbx_path), manifest, paths, max_size, infos, conditioned)
+        if update_manifest and manifest is not None:
+            manifest['texture_issues'] = result['issues']
+            manifest['texture_audit'] = result['textures']
+            write_manifest(fbx_path, manifest)
+        return result
+
+    def asset_result(self, fbx_path, manifest, paths, max_size, infos, conditioned):
+        textures = []
+        for p in paths:
+            entry = dict(infos[p], issues=texture_issues(infos[p], max_size))
+            if (p, max_size) in conditioned:
+                entry['conditioned'] = conditioned[(p, max_size)]
+            textures.append(entry)
+        return {'file': fbx_path, 'max_size': max_size, 'textures': textures,
+                'issues': "".join(t['issues'] for t in textures)}
+
+
+if __name__ == '__main__':
+    from fbx_reader import iter_fbx_files
+
+    parser = argparse.ArgumentParser(description="Audit (and condition) the textures of exported assets")
+    parser.add_argument('paths', nargs='+', help="FBX files or export directories")
+    parser.add_argument('--rules', help="budget rules JSON (default: $PIPELINE_BUDGETS or the built-in budgets)")
+    parser.add_argument('--platform', help="target platform for platform-specific budgets")
+    parser.add_argument('--condition', action='store_true', help="write power-of-two, mipped copies of failing textures")
+    parser.add_argument('--cache', default=config.TEXTURE_CACHE_DIR, help="conditioned texture cache directory")
+    parser.add_argument('--processes', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--update-manifests', action='store_true', help="write the audit into each JSON manifest")
+    parser.add_argument('--json', action='store_true', help="print JSON lines instead of a summary")
+    args = parser.parse_args()
+
+    stage = TextureStage(import_core('BudgetRules').RuleSet.load(args.rules), args.platform,
+                         args.cache if args.condition else None, args.processes)
+    started = time.perf_counter()
+    results = stage.audit_exports(iter_fbx_files(args.paths))
+    seconds = time.perf_counter() - started
+    for result in results:
+        if args.update_manifests:
+            manifest = read_manifest(result['file'])
+            if manifest is not None:
+                manifest['texture_issues'] = result['issues']
+                manifest['texture_audit'] = result['textures']
+                write_manifest(result['file'], manifest)
+        if args.json:
+            print(json.dumps(result))
+        elif result['issues']:
+            print(f"{result['file']}: {result['issues'].strip()}")
+            for texture in result['textures']:
+                done = texture.get('conditioned')
+                if done and 'error' not in done:
+                    print(f"   > {texture['path']} -> {done['path']} ({done['width']}x{done['height']}, "
+                          f"{done['mips']} mips{', cached' if done['cached'] else ''})")
+                elif done:
+                    print(f"   > {texture['path']}: {done['error']}")
+    count = len({t['path'] for r in results for t in r['textures']})
+    print(f"{len(results)} assets, {count} textures in {seconds:.2f}s; "
+          f"{sum(1 for r in results if r['issues'])} assets with texture issues", file=sys.stderr)
+    raise SystemExit(1 if any(r['issues'] for r in results) else 0)
@@ -0,0 +1,277 @@
+import argparse
+import atexit
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Set to a directory to turn tracing on in every pipeline process (the UI, batch tools
+# and the Unreal scripts); each process appends to its own file there.
+TRACE_DIR_ENV = 'PIPELINE_TRACE_DIR'
+
+FLUSH_INTERVAL = 1.0
+
+
+def default_process_name():
+    if 'unreal' in sys.modules:
+        return "UnrealEditor"
+    script = sys.argv[0] if sys.argv else ""
+    return Path(script).stem if script not in ("", "-", "-c") else "python"
+
+
+def now_us():
+    # Wall clock, so files written by different processes line up on one timeline.
+    return time.time() * 1e6
+
+
+class Span:
+    def __init__(self, name, cat, start_us, args):
+        self.name = name
+        self.cat = cat
+        self.start_us = start_us
+        self.args = args
+
+
+class Tracer:
+    # Chrome trace event format, JSON array flavour: one event per line and no closing
+    # bracket, which chrome://tracing and Perfetto both accept. A crash loses at most
+    # the last unflushed second.
+    def __init__(self, path, process_name=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fresh = not self.path.exists() or self.path.stat().st_size == 0
+        self.file = open(self.path, 'a', encoding='utf-8')
+        if fresh:
+            self.file.write("[\n")
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.pid = os.getpid()
+        self.thread_ids = {}
+        self.flushed_at = time.time()
+        self._write({'name': 'process_name', 'ph': 'M', 'pid': self.pid, 'tid': 0,
+                     'args': {'name': process_name or default_process_name()}})
+
+    def _write(self, event):
+        line = json.dumps(event, separators=(',', ':')) + ",\n"
+        with self.lock:
+            if self.file.closed:
+                return
+            self.file.write(line)
+            if time.time() - self.flushed_at >= FLUSH_INTERVAL:
+                self.file.flush()
+                self.flushed_at = time.time()
+
+    def _tid(self):
+        thread = threading.current_thread()
+        tid = self.thread_ids.get(thread.ident)
+        if tid is None:
+            tid = self.thread_ids[thread.ident] = len(self.thread_ids) + 1
+            self._write({'name': 'thread_name', 'ph': 'M', 'pid': self.pid, 'tid': tid, 'args': {'name': thread.name}})
+        return tid
+
+    def _context(self):
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = [{}]
+        return self.local.stack
+
+    @contextlib.contextmanager
+    def context(self, **args):
+        # asset/job IDs set here are attached to every span the thread records inside.
+        stack = self._context()
+        stack.append(dict(stack[-1], **args))
+        try:
+            yield
+        finally:
+            stack.pop()
+
+    @contextlib.contextmanager
+    def span(self, name, cat='pipeline', **args):
+        span = Span(name, cat, now_us(), dict(self._context()[-1], **args))
+        try:
+            yield span
+        except BaseException as e:
+            span.args['error'] = str(e) or type(e).__name__
+            raise
+        finally:
+            self.complete(name, span.start_us, now_us() - span.start_us, cat, **span.args)
+
+    def complete(self, name, start_us, dur_us, cat='pipeline', **args):
+        self._write({'name': name, 'cat': cat, 'ph': 'X', 'ts': round(start_us, 1), 'dur': round(max(dur_us, 0), 1),
+                     'pid': self.pid, 'tid': self._tid(), 'args': dict(self._context()[-1], **args)})
+
+    def instant(self, name, cat='pipeline', **args):
+        self._write({'name': name, 'cat': cat, 'ph': 'i', 's': 't', 'ts': round(now_us(), 1),
+                     'pid': self.pid, 'tid': self._tid(), 'args': dict(self._context()[-1], **args)})
+
+    def flush(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.flush()
+                self.flushed_at = time.time()
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+
+_tracer = None
+_configured = False
+_env_dir = None  # PIPELINE_TRACE_DIR as last read, while it (not configure()) decides
+_lock = threading.Lock()
+
+
+def configure(trace_dir=None, process_name=None):
+    # Explicit setup; otherwise spans follow PIPELINE_TRACE_DIR, re-read whenever it
+    # changes (the editor's Python lives for the whole session). Returns None (tracing
+    # off) when neither names a directory.
+    global _tracer, _configured, _env_dir
+    with _lock:
+        if _tracer is not None:
+            _tracer.close()
+        _env_dir = None if trace_dir else os.environ.get(TRACE_DIR_ENV, '')
+        trace_dir = trace_dir or _env_dir
+        _tracer = None
+        if trace_dir:
+            process_name = process_name or default_process_name()
+            path = Path(trace_dir) / f"{process_name}-{os.getpid()}-{int(time.time())}.trace.json"
+            _tracer = Tracer(path, process_name)
+            atexit.register(_tracer.close)
+        _configured = True
+        return _tracer
+
+
+def get_tracer():
+    if not _configured or (_env_dir is not None and os.environ.get(TRACE_DIR_ENV, '') != _env_dir):
+        configure()
+    return _tracer
+
+
+def flush():
+    # Events are otherwise flushed by the next one written after FLUSH_INTERVAL; call at
+    # the end of a unit of work in long-lived processes.
+    if _tracer is not None:
+        _tracer.flush()
+
+
+def span(name, cat='pipeline', **args):
+    tracer = get_tracer()
+    if tracer is None:
+        return contextlib.nullcontext(Span(name, cat, None, args))
+    return tracer.span(name, cat, **args)
+
+
+def context(**args):
+    tracer = get_tracer()
+    return tracer.context(**args) if tracer is not None else contextlib.nullcontext()
+
+
+def complete(name, start_us, dur_us, cat='pipeline', **args):
+    tracer = get_tracer()
+    if tracer is not None:
+        tracer.complete(name, start_us, dur_us, cat, **args)
+
+
+def max_stages(parent, manifest_path):
+    # runAutomatedExport writes its own stage timings (ms from the start of the export)
+    # into the manifest; they become child spans of the Python span that waited for it.
+    if get_tracer() is None or parent.start_us is None:
+        return
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            stages = json.load(f).get('stages', [])
+    except (OSError, ValueError):
+        return
+    for name, start_ms, end_ms in stages:
+        complete(name, parent.start_us + start_ms * 1000, (end_ms - start_ms) * 1000, 'max', **parent.args)
+
+
+def read_trace(path):
+    # Tolerates the missing closing bracket and a torn last line.
+    events = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip().rstrip(',')
+            if line in ('', '[', ']'):
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+    return events
+
+
+def trace_files(paths):
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            yield from sorted(path.glob("*.trace.json"))
+        else:
+            yield path
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def summarize(events, by='name'):
+    # Per-stage duration statistics in milliseconds over every complete event.
+    groups = {}
+    for event in events:
+        if event.get('ph') == 'X':
+            key = event['name'] if by == 'name' else f"{event.get('cat', '')}:{event['name']}"
+            groups.setdefault(key, []).append(event['dur'] / 1000.0)
+    rows = []
+    for key, durations in groups.items():
+        rows.append({
+            'stage': key,
+            'count': len(durations),
+            'total_ms': round(sum(durations), 3),
+            'p50_ms': round(percentile(durations, 50), 3),
+            'p90_ms': round(percentile(durations, 90), 3),
+            'p99_ms': round(percentile(durations, 99), 3),
+            'max_ms': round(max(durations), 3),
+        })
+    return sorted(rows, key=lambda r: r['total_ms'], reverse=True)
+
+
+def merge(paths, output):
+    events = [e for path in trace_files(paths) for e in read_trace(path)]
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    return len(events)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Summarize or merge pipeline trace files")
+    sub = parser.add_subparsers(dest='command', required=True)
+    summary_parser = sub.add_parser('summary', help="percentiles per stage across a batch")
+    summary_parser.add_argument('paths', nargs='+', help="trace files or directories")
+    summary_parser.add_argument('--by-category', action='store_true', help="group by category:name")
+    summary_parser.add_argument('--json', action='store_true')
+    merge_parser = sub.add_parser('merge', help="combine trace files into one for chrome://tracing or Perfetto")
+    merge_parser.add_argument('paths', nargs='+', help="trace files or directories")
+    merge_parser.add_argument('-o', '--output', required=True)
+    args = parser.parse_args()
+
+    if args.command == 'merge':
+        print(f"{merge(args.paths, args.output)} events -> {args.output}")
+    else:
+        rows = summarize([e for p in trace_files(args.paths) for e in read_trace(p)],
+                         by='category' if args.by_category else 'name')
+        if args.json:
+            print(json.dumps(rows, indent=2))
+        else:
+            print(f"{'stage':<32} {'count':>7} {'total ms':>12} {'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}")
+            for r in rows:
+                print(f"{r['stage']:<32} {r['count']:>7} {r['total_ms']:>12.1f} {r['p50_ms']:>10.2f} "
+                      f"{r['p90_ms']:>10.2f} {r['p99_ms']:>10.2f} {r['max_ms']:>10.2f}")
@@ -1,17 +1,52 @@
+import argparse
 import json
 import os
+import re
+import sys
+
+UNREAL_SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'UnrealScripts')
+
+# Forwarded into generated batch scripts so the editor uses the same settings.
+FORWARDED_ENV = ('PIPELINE_TRACE_DIR', 'PIPELINE_BUDGETS', 'PIPELINE_PLATFORM', 'PIPELINE_CATALOG')
+LOD_FILE = re.compile(r"_LOD\d+$", re.I)  # as in UnrealScripts/BatchImporter.py
+
+
+def lod_suffix(fbx_path):
+    # The '_LOD<n>' ending of an LOD file's name, else None.
+    match = LOD_FILE.search(os.path.splitext(os.path.basename(fbx_path))[0])
+    return match.group(0) if match else None
+
+
+def load_rules(path=None):
+    core_path = os.path.join(UNREAL_SCRIPTS_DIR, 'Core')
+    if core_path not in sys.path:
+        sys.path.insert(0, core_path)
+    import BudgetRules
+    return BudgetRules.RuleSet.load(path)
+
 
 class UnrealImporter:
-    def __init__(self):
+    def __init__(self, rules=None, platform=None):
         self.import_destination = "/Game/ImportedAssets"
+        self.rules = rules
+        self.platform = platform or os.environ.get('PIPELINE_PLATFORM')
+
+    def limit(self, asset_name, json_path, metric='triangles', bound='max'):
+        rules = self.rules or load_rules()
+        metadata = {}
+        if json_path and os.path.exists(json_path):
+            with open(json_path, 'r') as f:
+                metadata = json.load(f)
+        return rules.limit(metric, rules.category_of(asset_name, metadata), self.platform, bound=bound)
 
     def generate_import_script(self, fbx_path, json_path=None):
         asset_name = os.path.splitext(os.path.basename(fbx_path))[0]
         fbx_path_unix = fbx_path.replace('\\', '/')
         json_path_unix = fbx_path_unix.replace('.fbx', '.json')
 
-        if "_LOD" in fbx_path:
-            clean_name = fbx_path.split("_LOD")[0] + ".fbx"
+        suffix = lod_suffix(fbx_path)
+        if suffix:
+            clean_name = asset_name[:-len(suffix)] + os.path.splitext(fbx_path)[1]
             return f"""
 import unreal
 import os
@@ -20,17 +55,30 @@ unreal.log_error("Please select the BASE file instead: {os.path.basename(clean_n
 print("ERROR: Please import the base file, not the LOD.")
 """
 
+        max_poly_budget = self.limit(asset_name, json_path_unix)
+        pass_accuracy = self.limit(asset_name, json_path_unix, 'accuracy_score', 'min') or 0
+        exporter_dir = os.path.dirname(os.path.abspath(__file__)).replace('\\', '/')
+        env_lines = "\n".join(f'os.environ.setdefault("{name}", r"{os.environ[name]}")'
+                               for name in FORWARDED_ENV if os.environ.get(name))
         script = f"""
 import unreal
 import os
+import sys
 import json
-import webbrowser
+
+{env_lines}
+EXPORTER_DIR = r"{exporter_dir}"
+if EXPORTER_DIR not in sys.path:
+    sys.path.insert(0, EXPORTER_DIR)
+
+import tracing
 
 ASSET_NAME = "{asset_name}"
 FBX_PATH = r"{fbx_path_unix}"
 JSON_PATH = r"{json_path_unix}"
 DESTINATION = "{self.import_destination}"
-MAX_POLY_BUDGET = 50000
+MAX_POLY_BUDGET = {max_poly_budget}
+PASS_ACCURACY = {pass_accuracy}
 
 metadata = {{}}
 if os.path.exists(JSON_PATH):
@@ -53,7 +101,7 @@ else:
     print("Optimization Mode: STANDARD (LODs)")
 
 predicted_polys = metadata.get('polygons', 0)
-if predicted_polys > MAX_POLY_BUDGET:
+if MAX_POLY_BUDGET is not None and predicted_polys > MAX_POLY_BUDGET:
     unreal.log_warning("ASSET EXCEEDS POLYGON BUDGET! Proceeding with caution...")
 
 task = unreal.AssetImportTask()
@@ -75,90 +123,99 @@ options.static_mesh_import_data.auto_generate_collision = True
 options.static_mesh_import_data.build_nanite = enable_nanite
 
 task.options = options
-unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([task])
+with tracing.span("import_asset_tasks", 'unreal', assets=1):
+    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([task])
 
 asset_path = f"{{DESTINATION}}/{{ASSET_NAME}}"
 loaded_mesh = unreal.EditorAssetLibrary.load_asset(asset_path)
 
 imported_lods = 0
 
-if loaded_mesh:
+if loaded_mesh and (metadata.get('nanite_decision') or {{}}).get('keep_lods', True):
     base_dir = os.path.dirname(FBX_PATH)
     
-    for i in range(1, 4):
+    for i in range(1, 8):
         lod_filename = f"{{ASSET_NAME}}_LOD{{i}}.fbx"
         lod_full_path = os.path.join(base_dir, lod_filename).replace('\\\\', '/')
         
         if os.path.exists(lod_full_path):
             print(f"Found LOD{{i}}: {{lod_filename}}")
-            ret = unreal.EditorStaticMeshLibrary.import_lod(loaded_mesh, i, lod_full_path)
+            with tracing.span("import_lod", 'unreal', asset=ASSET_NAME, lod=i):
+                ret = unreal.EditorStaticMeshLibrary.import_lod(loaded_mesh, i, lod_full_path)
             if ret != -1: 
                 imported_lods += 1
                 print(f"Successfully imported LOD {{i}}")
         else:
             break
 
-actual_tris = 0
-data_source = "Unknown"
+screen_sizes = []
+if loaded_mesh and imported_lods and metadata.get('lod_levels'):
+    # LodPolicy's switch distances instead of Unreal's auto computed ones.
+    with tracing.span("screen_sizes", 'unreal', asset=ASSET_NAME):
+        sizes = [1.0] + [level['screen_size'] for level in metadata['lod_levels']]
+        try:
+            models = loaded_mesh.get_editor_property('source_models')
+            for model, size in zip(models, sizes):
+                model.set_editor_property('screen_size', unreal.PerPlatformFloat(default=size))
+            loaded_mesh.set_editor_property('auto_compute_lod_screen_size', False)
+            loaded_mesh.set_editor_property('source_models', models)
+            unreal.EditorAssetLibrary.save_loaded_asset(loaded_mesh)
+            screen_sizes = sizes[1:len(models)]
+            print(f"LOD screen sizes: {{screen_sizes}}")
+        except Exception as e:
+            unreal.log_warning(f"Could not set LOD screen sizes: {{e}}")
+
+with tracing.span("validate", 'unreal', asset=ASSET_NAME):
+    actual_tris = 0
+    data_source = "Unknown"
 
-if loaded_mesh:
-    try:
-        actual_tris = loaded_mesh.source_models[0].get_triangle_count()
-        data_source = "Source Model (Exact)"
-    except:
+    if loaded_mesh:
         try:
-            actual_tris = loaded_mesh.get_source_model(0).get_triangle_count()
-            data_source = "Source Model (Getter)"
+            actual_tris = loaded_mesh.source_models[0].get_triangle_count()
+            data_source = "Source Model (Exact)"
         except:
-            actual_tris = loaded_mesh.get_num_triangles(0)
-            data_source = "Render Mesh (Fallback)"
-
-accuracy = 100
-if predicted_polys > 0:
-    diff = abs(predicted_polys - actual_tris)
-    accuracy = max(0, 100 - (diff / predicted_polys * 100))
-
-status_color = "red"
-status_text = "REVIEW NEEDED"
-
-if accuracy > 90:
-    status_color = "green"
-    status_text = "PASSED"
-elif enable_nanite and actual_tris > 0:
-    status_color = "green" 
-    status_text = "PASSED (Nanite Optimized)"
-    accuracy = 100 
-else:
-    status_color = "red"
-    status_text = "FAILED"
-
-html_content = f'''
-<html>
-<body style="font-family: Arial; background-color: #333; color: white; padding: 20px;">
-    <h1>Pipeline Report: {{ASSET_NAME}}</h1>
-    <div style="background-color: #444; padding: 15px; border-radius: 5px;">
-        <h2>Status: <span style="color: {{status_color}}">{{status_text}}</span></h2>
-        <p>Accuracy Score: <strong>{{accuracy:.2f}}%</strong></p>
-    </div>
-    <br>
-    <table border="1" style="width:100%; border-collapse: collapse; text-align: left;">
-        <tr><th style="padding: 10px;">Metric</th><th style="padding: 10px;">Details</th></tr>
-        <tr><td style="padding: 10px;">Poly Count</td><td style="padding: 10px;">{{actual_tris}} (Pred: {{predicted_polys}})</td></tr>
-        <tr><td style="padding: 10px;">Data Source</td><td style="padding: 10px;">{{data_source}}</td></tr>
-        <tr><td style="padding: 10px;">LODs</td><td style="padding: 10px;">{{imported_lods}} imported</td></tr>
-        <tr><td style="padding: 10px;">Nanite</td><td style="padding: 10px;">{{"ENABLED" if enable_nanite else "Disabled"}}</td></tr>
-        <tr><td style="padding: 10px;">Texture Audit</td><td style="padding: 10px;">{{tex_issues if tex_issues else "OK"}}</td></tr>
-    </table>
-</body>
-</html>
-'''
-
-report_path = FBX_PATH.replace('.fbx', '_Report.html')
+            try:
+                actual_tris = loaded_mesh.get_source_model(0).get_triangle_count()
+                data_source = "Source Model (Getter)"
+            except:
+                actual_tris = loaded_mesh.get_num_triangles(0)
+                data_source = "Render Mesh (Fallback)"
+
+    expected_polys = predicted_polys
+    if enable_nanite and data_source == "Render Mesh (Fallback)":
+        # Only the Nanite fallback mesh is visible here; compare against its share.
+        expected_polys = predicted_polys * metadata.get('nanite_fallback_percent', 100) / 100.0
+
+    accuracy = 100
+    if expected_polys > 0:
+        diff = abs(expected_polys - actual_tris)
+        accuracy = max(0, 100 - (diff / expected_polys * 100))
+
+status_text = "PASSED" if accuracy >= PASS_ACCURACY else "FAILED"
+print(f"Status: {{status_text}} (accuracy {{accuracy:.2f}}%, {{actual_tris}} tris from {{data_source}}, "
+      f"{{imported_lods}} LODs)")
+
+# One result in the batch report shape; `python -m ExporterUI report <folder>` gathers
+# these into a single report instead of a page and browser tab per asset.
+result = {{
+    'asset': ASSET_NAME,
+    'fbx': FBX_PATH,
+    'predicted_polys': predicted_polys,
+    'actual_tris': actual_tris,
+    'data_source': data_source,
+    'lods': imported_lods,
+    'screen_sizes': [1.0] + screen_sizes if screen_sizes else None,
+    'nanite': bool(enable_nanite),
+    'texture_issues': tex_issues,
+    'accuracy': round(accuracy, 2),
+    'status': status_text,
+}}
+report_path = FBX_PATH.replace('.fbx', '_Report.json')
 with open(report_path, 'w') as f:
-    f.write(html_content)
+    json.dump({{'passed': int(status_text == "PASSED"), 'assets': [result]}}, f, indent=2)
 
-print(f"Report generated: {{report_path}}")
-webbrowser.open('file://' + os.path.realpath(report_path))
+print(f"Result written: {{report_path}}")
+tracing.flush()
 """
         return script
 
@@ -168,4 +225,69 @@ webbrowser.open('file://' + os.path.realpath(report_path))
         script_path = fbx_path.replace('.fbx', '_import.py')
         with open(script_path, 'w') as f:
             f.write(script_content)
-        return script_path
\ No newline at end of file
+        return script_path
+
+    def base_fbx_files(self, folder):
+        return sorted(os.path.join(folder, name).replace('\\', '/') for name in os.listdir(folder)
+                      if name.lower().endswith('.fbx') and not lod_suffix(name))
+
+    def generate_batch_import_script(self, fbx_paths, report_path=None):
+        # The work happens in UnrealScripts/BatchImporter.py; the generated script only
+        # carries the file list, so it stays small for thousands of assets.
+        paths = [p.replace('\\', '/') for p in fbx_paths if not lod_suffix(p)]
+        scripts_dir = UNREAL_SCRIPTS_DIR.replace('\\', '/')
+        env_lines = "\n".join(f'os.environ.setdefault("{name}", r"{os.environ[name]}")'
+                              for name in FORWARDED_ENV if os.environ.get(name))
+        return f"""
+import os
+import sys
+
+{env_lines}
+SCRIPTS_DIR = r"{scripts_dir}"
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
+
+import BatchImporter
+
+FBX_PATHS = {json.dumps(paths, indent=0)}
+
+BatchImporter.import_batch(FBX_PATHS, destination="{self.import_destination}", report_path={report_path!r})
+"""
+
+    def save_batch_import_script(self, fbx_paths, script_path, report_path=None):
+        with open(script_path, 'w') as f:
+            f.write(self.generate_batch_import_script(fbx_paths, report_path))
+        return script_path
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Write the Unreal Python script that imports exported FBX files")
+    parser.add_argument('path', help="an FBX file (single-asset script) or an export folder (batch script)")
+    parser.add_argument('--out', help="script path (default: <folder>/batch_import.py or <name>_import.py)")
+    parser.add_argument('--report', help="where the batch import writes its HTML report")
+    parser.add_argument('--destination', help="content folder to import into (default: /Game/ImportedAssets)")
+    parser.add_argument('--platform', help="target platform for platform-specific budgets")
+    args = parser.parse_args(argv)
+
+    importer = UnrealImporter(platform=args.platform)
+    if args.destination:
+        importer.import_destination = args.destination
+    if os.path.isdir(args.path):
+        fbx_files = importer.base_fbx_files(args.path)
+        if not fbx_files:
+            raise SystemExit(f"No FBX files in {args.path}")
+        script_path = importer.save_batch_import_script(
+            fbx_files, args.out or os.path.join(args.path, "batch_import.py"), args.report)
+        print(f"{script_path}: {len(fbx_files)} assets")
+    elif os.path.isfile(args.path):
+        script_path = importer.save_import_script(args.path)
+        if args.out:
+            os.replace(script_path, args.out)
+            script_path = args.out
+        print(script_path)
+    else:
+        raise SystemExit(f"{args.path} not found")
+
+
+if __name__ == '__main__':
+    main()
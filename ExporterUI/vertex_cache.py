@@ -0,0 +1,342 @@
+import argparse
+import json
+import os
+import sys
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from fbx_reader import FbxDocument, FbxError, iter_fbx_files, lod_files
+
+# Reorders exported triangles (Tipsify) and vertices for the GPU's post-transform vertex cache.
+CACHE_SIZE = 16
+OVERDRAW_THRESHOLD = 1.05  # accepted ACMR increase for the overdraw clusters
+
+
+def cache_misses(indices, vertex_count, cache_size=CACHE_SIZE):
+    # Vertices a FIFO cache transforms for indices (T, 3).
+    stamp = [-cache_size - 1] * vertex_count
+    misses = 0
+    for v in np.asarray(indices).ravel().tolist():
+        if misses - stamp[v] > cache_size:
+            stamp[v] = misses
+            misses += 1
+    return misses
+
+
+def used_vertices(indices, vertex_count):
+    return int(np.count_nonzero(np.bincount(np.asarray(indices).ravel(), minlength=vertex_count)))
+
+
+def cache_stats(indices, vertex_count, cache_size=CACHE_SIZE):
+    # ACMR: misses per triangle; ATVR: misses per used vertex (1.0 is ideal).
+    indices = np.asarray(indices)
+    misses = cache_misses(indices, vertex_count, cache_size)
+    used = used_vertices(indices, vertex_count)
+    return {
+        'acmr': round(misses / len(indices), 3) if len(indices) else 0.0,
+        'atvr': round(misses / used, 3) if used else 0.0,
+    }
+
+
+def tipsify(indices, vertex_count, cache_size=CACHE_SIZE):
+    # Triangle order, plus the positions in it where Tipsify had to jump to a vertex
+    # outside the cache (its hard boundaries). Sequential, so a Python loop: about
+    # 0.15-0.2M triangles/s with the cache stats (benchmarks/run.py's vcache case).
+    # Sorting by lowest vertex first changes nothing but where the lists below are read
+    # from: on shuffled input it makes the loop a third faster.
+    presort = np.argsort(np.asarray(indices).min(axis=1), kind='stable')
+    indices = np.asarray(indices, dtype=np.int64)[presort]
+    flat = indices.ravel()
+    counts = np.bincount(flat, minlength=vertex_count)
+    adjacency = (np.argsort(flat, kind='stable') // 3).tolist()
+    ends = np.cumsum(counts).tolist()
+    starts = [0] + ends[:-1]
+    live = counts.tolist()
+    corners = flat.tolist()
+    stamp = [0] * vertex_count
+    emitted = bytearray(len(indices))
+    order, dead_end, boundaries = [], [], []
+    time, cursor, fan = cache_size + 1, 0, 0
+    while fan >= 0:
+        pushed = len(dead_end)
+        for t in adjacency[starts[fan]:ends[fan]]:
+            if emitted[t]:
+                continue
+            emitted[t] = 1
+            order.append(t)
+            triangle = corners[3 * t:3 * t + 3]
+            dead_end += triangle
+            for v in triangle:
+                live[v] -= 1
+                if time - stamp[v] > cache_size:
+                    stamp[v] = time
+                    time += 1
+        # Next fan: the candidate longest in the cache that is still in it once all its
+        # remaining triangles are emitted.
+        fan, best = -1, -1
+        for v in dead_end[pushed:]:  # the vertices of the fan just emitted
+            if live[v]:
+                priority = time - stamp[v]
+                if priority + 2 * live[v] > cache_size:
+                    priority = 0
+                if priority > best:
+                    fan, best = v, priority
+        if fan < 0:
+            if order:
+                boundaries.append(len(order))
+            while dead_end:
+                v = dead_end.pop()
+                if live[v]:
+                    fan = v
+                    break
+            else:
+                while cursor < vertex_count:
+                    if live[cursor]:
+                        fan = cursor
+                        break
+                    cursor += 1
+    return presort[np.asarray(order, dtype=np.int64)], boundaries
+
+
+def overdraw_order(positions, indices, order, boundaries, cache_size=CACHE_SIZE, threshold=OVERDRAW_THRESHOLD):
+    # Reorders the clusters of a Tipsify order so that triangles facing away from the
+    # mesh centre, which tend to occlude the rest, are drawn first.
+    indices = np.asarray(indices, dtype=np.int64)[order]
+    corners = indices.ravel().tolist()
+    # FIFO cache that is emptied at every cluster start (floor), as the clusters will
+    # be drawn in another order.
+    stamp = [-1] * len(positions)
+    misses = 0
+    hard = sorted(set(boundaries) | {0, len(order)})
+    starts = []
+    for start, end in zip(hard, hard[1:]):
+        floor = misses
+        for v in corners[3 * start:3 * end]:
+            if stamp[v] < floor or misses - stamp[v] > cache_size:
+                stamp[v] = misses
+                misses += 1
+        limit = threshold * (misses - floor) / (end - start)
+        # Soft boundaries: a new cluster once the one so far is within threshold of the
+        # hard cluster's ACMR.
+        floor, cluster_misses = misses, 0
+        starts.append(start)
+        for t in range(start, end):
+            for v in corners[3 * t:3 * t + 3]:
+                if stamp[v] < floor or misses - stamp[v] > cache_size:
+                    stamp[v] = misses
+                    misses += 1
+                    cluster_misses += 1
+            if t + 1 < end and cluster_misses <= limit * (t + 1 - starts[-1]):
+                floor, cluster_misses = misses, 0
+                starts.append(t + 1)
+    cluster = np.zeros(len(order), dtype=np.int64)
+    cluster[starts[1:]] = 1
+    cluster = np.cumsum(cluster)
+
+    positions = np.asarray(positions, dtype=np.float64)
+    a, b, c = positions[indices[:, 0]], positions[indices[:, 1]], positions[indices[:, 2]]
+    normals = np.cross(b - a, c - a)  # area-weighted
+    areas = np.linalg.norm(normals, axis=1)
+    centroids = (a + b + c) / 3
+    total = np.maximum(areas.sum(), 1e-30)
+    centre = (centroids * areas[:, None]).sum(axis=0) / total
+    count = len(starts)
+    area = np.maximum(np.bincount(cluster, areas, minlength=count), 1e-30)
+    score = np.zeros(count)
+    for axis in range(3):
+        normal = np.bincount(cluster, normals[:, axis], minlength=count)
+        centroid = np.bincount(cluster, centroids[:, axis] * areas, minlength=count) / area
+        score += (centroid - centre[axis]) * normal
+    ranked = np.argsort(-score, kind='stable')
+    return order[np.argsort(np.argsort(ranked)[cluster], kind='stable')]
+
+
+def fetch_order(indices, vertex_count):
+    # Vertex permutation by first use in the index buffer; unused vertices go last.
+    flat = np.asarray(indices, dtype=np.int64).ravel()
+    first = np.full(vertex_count, len(flat), dtype=np.int64)
+    corners = np.argsort(flat, kind='stable')
+    ordered = flat[corners]
+    head = np.concatenate(([True], ordered[1:] != ordered[:-1])) if len(flat) else np.zeros(0, dtype=bool)
+    first[ordered[head]] = corners[head]
+    return np.argsort(first, kind='stable')
+
+
+def optimize_mesh(positions, indices, cache_size=CACHE_SIZE, overdraw=False, threshold=OVERDRAW_THRESHOLD):
+    # (triangle order, vertex order, before/after stats) for one mesh.
+    indices = np.asarray(indices, dtype=np.int64)
+    vertex_count = len(positions)
+    before = cache_stats(indices, vertex_count, cache_size)
+    order, boundaries = tipsify(indices, vertex_count, cache_size)
+    if overdraw:
+        order = overdraw_order(positions, indices, order, boundaries, cache_size, threshold)
+    vertex_order = fetch_order(indices[order], vertex_count)
+    after = cache_stats(indices[order], vertex_count, cache_size)
+    return order, vertex_order, {
+        'triangles': int(len(indices)),
+        'acmr_before': before['acmr'], 'acmr_after': after['acmr'],
+        'atvr_before': before['atvr'], 'atvr_after': after['atvr'],
+    }
+
+
+def layer_arrays(layer):
+    # (array node, mapping) for each array of a LayerElement* node that holds one entry
+    # per polygon vertex, polygon or control point: the data itself when the layer is
+    # Direct, its index array (UVIndex, NormalsIndex, Materials, ...) when indexed.
+    mapping = layer.value("MappingInformationType", "ByPolygonVertex")
+    indexed = layer.value("ReferenceInformationType", "Direct") in ("IndexToDirect", "Index")
+    for node in layer.children():
+        if node.num_props != 1 or node.name in ("MappingInformationType", "ReferenceInformationType"):
+            continue
+        if not indexed or node.name.endswith("Index") or node.name == "Materials":
+            yield node, mapping
+
+
+def reorder_mesh(mesh, triangle_order, vertex_order):
+    # Replacement arrays (node offset -> array) that draw mesh's triangles in
+    # triangle_order and store its control points in vertex_order, with every layer
+    # element and the edge list moved along.
+    pvi = mesh.polygon_vertex_index()
+    triangles = len(pvi) // 3
+    corner_order = (3 * triangle_order[:, None] + np.arange(3)).ravel()
+    remap = np.empty(len(vertex_order), dtype=np.int64)
+    remap[vertex_order] = np.arange(len(vertex_order))
+    polygon_vertex_index = remap[np.where(pvi < 0, ~pvi, pvi)[corner_order]].astype(pvi.dtype)
+    polygon_vertex_index[2::3] = ~polygon_vertex_index[2::3]
+    arrays = {
+        mesh.node.child("Vertices").offset: mesh.positions()[vertex_order].ravel(),
+        mesh.node.child("PolygonVertexIndex").offset: polygon_vertex_index,
+    }
+    edges = mesh.node.child("Edges")
+    if edges is not None and edges.num_props:
+        corner_remap = np.empty(len(corner_order), dtype=np.int64)
+        corner_remap[corner_order] = np.arange(len(corner_order))
+        values = edges.prop()
+        arrays[edges.offset] = corner_remap[values].astype(values.dtype)
+    orders = {'ByPolygonVertex': corner_order, 'ByPolygon': triangle_order,
+              'ByVertice': vertex_order, 'ByVertex': vertex_order, 'ByControlPoint': vertex_order}
+    for layer in mesh.node.children():
+        if not layer.name.startswith("LayerElement"):
+            continue
+        for node, mapping in layer_arrays(layer):
+            order = orders.get(mapping)
+            values = node.prop()
+            if order is None or not isinstance(values, np.ndarray):
+                continue  # AllSame, ByEdge (the edge list keeps its order)
+            if len(values) % len(order):
+                raise FbxError(f"{mesh.name}: {layer.name}/{node.name} has {len(values)} values "
+                               f"for {len(order)} {mapping} entries")
+            arrays[node.offset] = values.reshape(len(order), -1)[order].ravel()
+    return arrays
+
+
+def optimize_fbx(fbx_path, cache_size=CACHE_SIZE, overdraw=False, threshold=OVERDRAW_THRESHOLD):
+    # Reorders every mesh of a triangulated FBX in place. Control points stay where they
+    # are in files with skin clusters or blend shapes, which index them. Returns the
+    # stats of all meshes together.
+    fbx_path = Path(fbx_path)
+    tmp = fbx_path.with_name(fbx_path.name + '.tmp')
+    totals = {'triangles': 0, 'misses_before': 0.0, 'misses_after': 0.0,
+              'transforms_before': 0.0, 'transforms_after': 0.0, 'vertices': 0}
+    with FbxDocument(fbx_path) as doc:
+        keep_vertices = bool(doc.objects("Deformer")) or any(
+            g.num_props >= 3 and g.prop(2) == "Shape" for g in doc.objects("Geometry"))
+        arrays = {}
+        for mesh in doc.meshes():
+            if np.any(mesh.polygon_sizes() != 3):
+                raise FbxError(f"{fbx_path}: {mesh.name} is not triangulated")
+            positions = mesh.positions()
+            indices = mesh.triangles()
+            order, vertex_order, stats = optimize_mesh(positions, indices, cache_size, overdraw, threshold)
+            if keep_vertices:
+                vertex_order = np.arange(len(positions))
+            arrays.update(reorder_mesh(mesh, order, vertex_order))
+            used = used_vertices(indices, len(positions))
+            totals['triangles'] += stats['triangles']
+            totals['vertices'] += used
+            for when in ('before', 'after'):
+                totals[f'misses_{when}'] += stats[f'acmr_{when}'] * stats['triangles']
+                totals[f'transforms_{when}'] += stats[f'atvr_{when}'] * used
+        if arrays:
+            doc.write(tmp, arrays)
+    if arrays:
+        os.replace(tmp, fbx_path)
+    triangles, vertices = max(totals['triangles'], 1), max(totals['vertices'], 1)
+    return {
+        'file': str(fbx_path),
+        'triangles': totals['triangles'],
+        'acmr_before': round(totals['misses_before'] / triangles, 3),
+        'acmr_after': round(totals['misses_after'] / triangles, 3),
+        'atvr_before': round(totals['transforms_before'] / vertices, 3),
+        'atvr_after': round(totals['transforms_after'] / vertices, 3),
+    }
+
+
+def optimize_export(fbx_path, cache_size=CACHE_SIZE, overdraw=False, threshold=OVERDRAW_THRESHOLD, force=False):
+    # optimize_fbx() for an export and its _LODn siblings; the results go into the
+    # manifest as 'vertex_cache'. Nanite meshes are left alone (Nanite builds its own
+    # clusters) unless force is set. Sidecars written before are rebuilt.
+    from mesh_sidecar import current_sidecar, write_for_export
+    from pipeline_io import read_manifest, write_manifest
+    manifest = read_manifest(fbx_path)
+    if manifest is not None and manifest.get('enable_nanite') and not force:
+        return None
+    paths = [Path(fbx_path)] + lod_files(fbx_path)
+    had_sidecars = [current_sidecar(path) is not None for path in paths]
+    lods = [optimize_fbx(path, cache_size, overdraw, threshold) for path in paths]
+    if any(had_sidecars):
+        write_for_export(fbx_path, force=True)
+    report = {'cache_size': cache_size, 'overdraw': overdraw,
+              'lods': [{k: v for k, v in lod.items() if k != 'file'} for lod in lods]}
+    if manifest is not None:
+        manifest['vertex_cache'] = report
+        write_manifest(fbx_path, manifest)
+    return report
+
+
+def optimize_many(paths, processes=None, cache_size=CACHE_SIZE, overdraw=False, threshold=OVERDRAW_THRESHOLD,
+                  force=False):
+    # Exports are independent, so each one is reordered in its own worker process.
+    # Yields (path, future) in input order.
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [(p, pool.submit(optimize_export, p, cache_size, overdraw, threshold, force)) for p in paths]
+        yield from futures
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Reorder FBX exports for the GPU vertex cache")
+    parser.add_argument('paths', nargs='+', help="FBX files or directories to scan")
+    parser.add_argument('--cache-size', type=int, default=CACHE_SIZE, help="FIFO cache entries to optimize for")
+    parser.add_argument('--overdraw', action='store_true', help="also sort triangle clusters to reduce overdraw")
+    parser.add_argument('--threshold', type=float, default=OVERDRAW_THRESHOLD,
+                        help="ACMR increase accepted for the overdraw clusters")
+    parser.add_argument('--force', action='store_true', help="also reorder Nanite exports")
+    parser.add_argument('--processes', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--json', action='store_true', help="print JSON lines instead of a table")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for fbx_path, future in optimize_many(list(iter_fbx_files(args.paths)), args.processes, args.cache_size,
+                                          args.overdraw, args.threshold, args.force):
+        try:
+            report = future.result()
+        except (FbxError, OSError, ValueError, KeyError, zlib.error) as e:
+            print(f"{fbx_path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        if args.json:
+            print(json.dumps({'file': str(fbx_path), 'vertex_cache': report}))
+        elif report is None:
+            print(f"{fbx_path}: Nanite, skipped")
+        else:
+            for lod, stats in enumerate(report['lods']):
+                print(f"{fbx_path} LOD{lod}: {stats['triangles']} tris, ACMR {stats['acmr_before']} -> "
+                      f"{stats['acmr_after']}, ATVR {stats['atvr_before']} -> {stats['atvr_after']}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
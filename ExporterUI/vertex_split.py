@@ -0,0 +1,196 @@
+import argparse
+import json
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from fbx_reader import FbxError, iter_fbx_files, lod_files
+
+# Render-vertex and draw-section counts of exported meshes, split as the UE static mesh build does.
+NORMAL_STEPS = 4096   # normal components closer than 1/4096 count as equal
+UV_STEPS = 1024       # UE's THRESH_UVS_ARE_SAME is 1/1024
+WORST = 5
+SEED = 0xcbf29ce484222325
+PRIME = 0x100000001b3
+
+
+def load_arrays(fbx_path):
+    # Sidecar arrays when a current .mesh exists (np.memmap), else decoded from the FBX.
+    from mesh_sidecar import current_sidecar, mesh_arrays
+    sidecar = current_sidecar(fbx_path)
+    if sidecar is None:
+        return mesh_arrays(fbx_path)
+    arrays = {'positions': sidecar.positions, 'indices': sidecar.indices, 'material_ids': sidecar.material_ids}
+    if 'normals' in sidecar.sections:
+        arrays['normals'] = sidecar.normals
+    for channel in range(sidecar.uv_channels()):
+        arrays[f'uv{channel}'] = sidecar.uv(channel)
+    return arrays
+
+
+def combine(columns, count):
+    # FNV-style fold of integer columns into one uint64 per row, with a shift after each
+    # multiply so high bits reach the low ones.
+    h = np.full(count, SEED, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for column in columns:
+            h ^= np.ascontiguousarray(column, dtype=np.int64).view(np.uint64)
+            h *= np.uint64(PRIME)
+            h ^= h >> np.uint64(29)
+    return h
+
+
+def distinct(hashes):
+    # Number of distinct values; a plain sort beats np.unique's hash table here.
+    ordered = np.sort(hashes)
+    return int(len(ordered) and 1 + np.count_nonzero(ordered[1:] != ordered[:-1]))
+
+
+def first_occurrences(hashes):
+    # Index of the first row of every distinct value.
+    order = np.argsort(hashes, kind='stable')
+    ordered = hashes[order]
+    return order[np.concatenate(([True], ordered[1:] != ordered[:-1]))] if len(order) else order
+
+
+def corner_attributes(arrays):
+    # Attribute name -> integer columns, one row per triangle corner (3T).
+    indices = np.asarray(arrays['indices'], dtype=np.int64)
+    triangles = len(indices)
+    attributes = {'material': [np.repeat(np.asarray(arrays['material_ids'], dtype=np.int64), 3)]}
+    if 'normals' in arrays:
+        quantized = np.rint(np.asarray(arrays['normals'], dtype=np.float32) * NORMAL_STEPS).astype(np.int64)
+        attributes['normal'] = list(quantized.T)
+    channel = 0
+    while f'uv{channel}' in arrays:
+        quantized = np.rint(np.asarray(arrays[f'uv{channel}'], dtype=np.float64) * UV_STEPS).astype(np.int64)
+        attributes[f'uv{channel}'] = list(quantized.T)
+        channel += 1
+    if 'uv0' in arrays and triangles:
+        # Sign of each triangle's area in UV space: the tangent frame's handedness.
+        uv = np.asarray(arrays['uv0'], dtype=np.float64).reshape(triangles, 3, 2)
+        e1, e2 = uv[:, 1] - uv[:, 0], uv[:, 2] - uv[:, 0]
+        attributes['mirrored_uv'] = [np.repeat(e1[:, 0] * e2[:, 1] - e1[:, 1] * e2[:, 0] < 0, 3)]
+    return indices.ravel(), attributes
+
+
+def seam_edges(corners, hashes):
+    # Per attribute, the number of manifold edges whose two triangles disagree at either
+    # end: the seams that cause the splits. corners: position index per triangle corner.
+    triangles = len(corners) // 3
+    a = corners.reshape(triangles, 3)
+    b = np.roll(a, -1, axis=1)
+    swap = (a > b).ravel()
+    a, b = a.ravel(), b.ravel()
+    start, end = np.where(swap, b, a), np.where(swap, a, b)
+    corner = np.arange(3 * triangles).reshape(triangles, 3)
+    corner_a, corner_b = corner.ravel(), np.roll(corner, -1, axis=1).ravel()
+    corner_start, corner_end = np.where(swap, corner_b, corner_a), np.where(swap, corner_a, corner_b)
+    order = np.lexsort((end, start))
+    start, end = start[order], end[order]
+    pair = np.flatnonzero((start[1:] == start[:-1]) & (end[1:] == end[:-1]))
+    first_start, first_end = corner_start[order][pair], corner_end[order][pair]
+    second_start, second_end = corner_start[order][pair + 1], corner_end[order][pair + 1]
+    return {name: int(np.count_nonzero((h[first_start] != h[second_start]) | (h[first_end] != h[second_end])))
+            for name, h in hashes.items()}
+
+
+def analyze(arrays, worst=WORST):
+    positions = np.asarray(arrays['positions'])
+    material_ids = np.asarray(arrays['material_ids'], dtype=np.int64)
+    corners, attributes = corner_attributes(arrays)
+    count = len(corners)
+    full = combine([corners] + [c for columns in attributes.values() for c in columns], count)
+    first = first_occurrences(full)
+    render_vertices = len(first)
+
+    causes, hashes = {}, {}
+    for name in attributes:
+        rest = [c for other, columns in attributes.items() if other != name for c in columns]
+        causes[name] = render_vertices - distinct(combine([corners] + rest, count))
+        hashes[name] = combine(attributes[name], count)
+
+    splits = np.bincount(corners[first], minlength=len(positions))
+    used = int(np.count_nonzero(splits))
+    worst_vertices = np.argsort(-splits, kind='stable')[:worst]
+    # Unassigned faces can carry negative IDs, so sections are counted by index into the
+    # distinct IDs rather than by ID.
+    section_ids, section = np.unique(material_ids, return_inverse=True)
+    section_triangles = np.bincount(section, minlength=len(section_ids))
+    section_vertices = np.bincount(section[first // 3], minlength=len(section_ids))
+    return {
+        'triangles': int(len(material_ids)),
+        'positions': used,
+        'render_vertices': int(render_vertices),
+        'split_ratio': round(render_vertices / used, 3) if used else 0.0,
+        'sections': [{'material': int(m), 'triangles': int(t), 'vertices': int(v)}
+                     for m, t, v in zip(section_ids, section_triangles, section_vertices)],
+        'draw_calls': int(len(section_ids)),
+        'causes': causes,
+        'seam_edges': seam_edges(corners, hashes) if count else {},
+        'worst_vertices': [{'vertex': int(v), 'position': [round(float(c), 3) for c in positions[v]],
+                            'copies': int(splits[v])} for v in worst_vertices if splits[v] > 1],
+    }
+
+
+def analyze_export(fbx_path, worst=WORST):
+    # analyze() for the FBX and each _LODn sibling, plus the per-LOD summary that goes
+    # into the manifest as 'render_stats'.
+    lods = [dict(analyze(load_arrays(path), worst), file=str(path)) for path in [Path(fbx_path)] + lod_files(fbx_path)]
+    base = lods[0]
+    return {
+        'render_vertices': [lod['render_vertices'] for lod in lods],
+        'positions': [lod['positions'] for lod in lods],
+        'draw_calls': [lod['draw_calls'] for lod in lods],
+        'split_ratio': base['split_ratio'],
+        'causes': base['causes'],
+        'seam_edges': base['seam_edges'],
+        'worst_vertices': base['worst_vertices'],
+        'lods': lods,
+    }
+
+
+def update_manifest(fbx_path, worst=WORST):
+    from pipeline_io import read_manifest, write_manifest
+    report = analyze_export(fbx_path, worst)
+    manifest = read_manifest(fbx_path)
+    if manifest is not None:
+        manifest['render_stats'] = {k: v for k, v in report.items() if k != 'lods'}
+        write_manifest(fbx_path, manifest)
+    return report
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Render vertices, sections and seams of FBX exports")
+    parser.add_argument('paths', nargs='+', help="FBX files or directories to scan")
+    parser.add_argument('--worst', type=int, default=WORST, help="most split vertices to list")
+    parser.add_argument('--write', action='store_true', help="record the results as 'render_stats' in each manifest")
+    parser.add_argument('--json', action='store_true', help="print JSON lines instead of a table")
+    args = parser.parse_args(argv)
+
+    failed = 0
+    for fbx_path in iter_fbx_files(args.paths):
+        try:
+            report = update_manifest(fbx_path, args.worst) if args.write else analyze_export(fbx_path, args.worst)
+        except (FbxError, OSError, ValueError, KeyError, zlib.error) as e:
+            print(f"{fbx_path}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        if args.json:
+            print(json.dumps(dict(report, file=str(fbx_path))))
+            continue
+        for lod, stats in enumerate(report['lods']):
+            causes = ", ".join(f"{name} +{extra}" for name, extra in stats['causes'].items() if extra)
+            print(f"{stats['file']}: {stats['triangles']} tris, {stats['positions']} positions -> "
+                  f"{stats['render_vertices']} render vertices (x{stats['split_ratio']}), "
+                  f"{stats['draw_calls']} draw calls" + (f"; {causes}" if causes else ""))
+            if lod == 0:
+                for vertex in stats['worst_vertices']:
+                    print(f"    vertex {vertex['vertex']} at {vertex['position']}: {vertex['copies']} copies")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,346 @@
+import json
+import os
+import re
+import sys
+import time
+import webbrowser
+
+import unreal #type:ignore
+
+scripts_path = os.path.dirname(os.path.abspath(__file__))
+core_path = os.path.join(scripts_path, 'Core')
+for path in (scripts_path, core_path):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+exporter_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ExporterUI')
+if exporter_path not in sys.path:
+    sys.path.insert(0, exporter_path)
+
+import BudgetRules #type:ignore
+import InstancePlacer #type:ignore
+import tracing #type:ignore
+
+DESTINATION = "/Game/ImportedAssets"
+MAX_LODS = 7  # MAX_STATIC_MESH_LODS is 8, LOD0 included
+LOD_FILE = re.compile(r"_LOD\d+$", re.I)  # Asset_LOD2.fbx, attached to Asset.fbx
+REPORT_NAME = "Batch_Import_Report.html"  # one per export folder, updated by every batch
+
+
+class ImportEntry:
+    def __init__(self, fbx_path, metadata):
+        self.fbx_path = fbx_path
+        self.asset_name = os.path.splitext(os.path.basename(fbx_path))[0]
+        self.metadata = metadata
+        self.task = None
+        self.mesh = None
+        self.lod_paths = []
+        self.imported_lods = 0
+        self.screen_sizes = None  # applied from the manifest's lod_levels (LodPolicy)
+        self.instances = 0  # copies placed from the folder's instancing map
+        self.cancelled = False  # imported, but the batch was cancelled before its LODs
+        self.result = None
+
+
+def load_metadata(fbx_path):
+    json_path = fbx_path[:-len('.fbx')] + '.json'
+    if not os.path.exists(json_path):
+        return {}
+    with open(json_path, 'r') as f:
+        return json.load(f)
+
+
+def lod_paths(fbx_path, metadata=None):
+    # A 'nanite' decision drops the LOD chain: Nanite builds its own fallback mesh.
+    decision = (metadata or {}).get('nanite_decision') or {}
+    if decision.get('keep_lods') is False:
+        return []
+    base = fbx_path[:-len('.fbx')]
+    found = []
+    for i in range(1, MAX_LODS + 1):
+        path = f"{base}_LOD{i}.fbx"
+        if not os.path.exists(path):
+            break
+        found.append(path)
+    return found
+
+
+def apply_screen_sizes(mesh, metadata):
+    # Switch distances from the manifest's 'lod_levels' instead of Unreal's auto computed
+    # ones; returns the sizes set, LOD0 first, or None if the manifest has none.
+    levels = metadata.get('lod_levels')
+    if not levels:
+        return None
+    sizes = [1.0] + [level['screen_size'] for level in levels]
+    try:
+        models = mesh.get_editor_property('source_models')
+        for model, size in zip(models, sizes):
+            model.set_editor_property('screen_size', unreal.PerPlatformFloat(default=size))
+        mesh.set_editor_property('auto_compute_lod_screen_size', False)
+        mesh.set_editor_property('source_models', models)
+    except Exception as e:
+        unreal.log_warning(f"PIPELINE: could not set LOD screen sizes: {e}")
+        return None
+    return sizes[:len(models)]
+
+
+def import_options(enable_nanite, node_space=False):
+    # node_space keeps the mesh in its own pivot space instead of baking the node's
+    # world transform in, for meshes that InstancePlacer places several times.
+    options = unreal.FbxImportUI()
+    options.import_mesh = True
+    options.import_materials = True
+    options.import_textures = False
+    options.static_mesh_import_data.combine_meshes = True
+    options.static_mesh_import_data.auto_generate_collision = True
+    options.static_mesh_import_data.build_nanite = enable_nanite
+    options.static_mesh_import_data.transform_vertex_to_absolute = not node_space
+    return options
+
+
+def build_tasks(entries, destination, instanced=()):
+    # One factory/options pair per Nanite/instancing setting, shared by every task that uses it.
+    shared = {}
+    tasks = []
+    for entry in entries:
+        setting = (bool(entry.metadata.get('enable_nanite', False)), entry.fbx_path in instanced)
+        if setting not in shared:
+            shared[setting] = (unreal.FbxFactory(), import_options(*setting))
+        factory, options = shared[setting]
+
+        task = unreal.AssetImportTask()
+        task.filename = entry.fbx_path
+        task.destination_path = destination
+        task.automated = True
+        task.replace_existing = True
+        task.save = False  # saved together after the LODs are attached
+        task.factory = factory
+        task.options = options
+        entry.task = task
+        tasks.append(task)
+    return tasks
+
+
+def find_imported_mesh(entry, destination):
+    paths = list(entry.task.get_editor_property('imported_object_paths') or [])
+    paths.append(f"{destination}/{entry.asset_name}")
+    for path in paths:
+        asset = unreal.EditorAssetLibrary.load_asset(path)
+        if isinstance(asset, unreal.StaticMesh):
+            return asset
+    return None
+
+
+def source_triangles(mesh):
+    try:
+        return mesh.source_models[0].get_triangle_count(), "Source Model (Exact)"
+    except Exception:
+        try:
+            return mesh.get_source_model(0).get_triangle_count(), "Source Model (Getter)"
+        except Exception:
+            return mesh.get_num_triangles(0), "Render Mesh (Fallback)"
+
+
+def evaluate(entry, rules, platform=None):
+    metadata = entry.metadata
+    predicted_polys = metadata.get('polygons', 0)
+    enable_nanite = metadata.get('enable_nanite', False)
+    tex_issues = metadata.get('texture_issues', "")
+    category = rules.category_of(entry.asset_name, metadata)
+    over_budget = [r.name for r in rules.check({'triangles': predicted_polys}, category, platform)]
+    result = {
+        'asset': entry.asset_name,
+        'fbx': entry.fbx_path,
+        'predicted_polys': predicted_polys,
+        'actual_tris': 0,
+        'data_source': "Unknown",
+        'lods': entry.imported_lods,
+        'screen_sizes': entry.screen_sizes,
+        'nanite': bool(enable_nanite),
+        'texture_issues': tex_issues,
+        'vertex_cache': (metadata.get('vertex_cache') or {}).get('lods', [None])[0],
+        'instances': entry.instances,
+        'category': category,
+        'over_budget': bool(over_budget),
+        'budget_violations': over_budget,
+        'accuracy': 0.0,
+        'status': "IMPORT FAILED",
+    }
+    if entry.mesh is None:
+        return result
+    if entry.cancelled:
+        result['status'] = "CANCELLED"
+        return result
+
+    actual_tris, result['data_source'] = source_triangles(entry.mesh)
+    result['actual_tris'] = actual_tris
+    expected = predicted_polys
+    if enable_nanite and result['data_source'] == "Render Mesh (Fallback)":
+        # Only the Nanite fallback mesh is visible here; compare against its share.
+        expected = predicted_polys * metadata.get('nanite_fallback_percent', 100) / 100.0
+    accuracy = 100
+    if expected > 0:
+        accuracy = max(0, 100 - (abs(expected - actual_tris) / expected * 100))
+    status = "FAILED" if rules.check({'accuracy_score': accuracy}, category, platform) else "PASSED"
+    result['accuracy'] = round(accuracy, 2)
+    result['status'] = status
+    return result
+
+
+def write_report(results, report_path, seconds, rules=None, platform=None):
+    # The results as JSON next to the report, merged by FBX with what earlier batches
+    # wrote there, then the paginated HTML report (ExporterUI/batch_report.py) over every
+    # export folder in it; it reads the JSON back through the asset catalog together
+    # with the manifests.
+    import batch_report #type:ignore
+    json_path = report_path[:-len('.html')] + '.json'
+    assets = {}
+    try:
+        with open(json_path, 'r') as f:
+            assets = {r['fbx']: r for r in json.load(f).get('assets', [])}
+    except (OSError, ValueError, KeyError):
+        pass
+    assets.update((r['fbx'], r) for r in results)
+    assets = list(assets.values())
+    passed = sum(1 for r in assets if r['status'].startswith("PASSED"))
+    with open(json_path + '.tmp', 'w') as f:
+        json.dump({'seconds': round(seconds, 3), 'passed': passed, 'assets': assets}, f, indent=2)
+    os.replace(json_path + '.tmp', json_path)
+    roots = sorted({os.path.dirname(r['fbx']) for r in assets})
+    return batch_report.update_report(roots, report_path, rules=rules, platform=platform, imports=[json_path],
+                                      note=f"Imported {len(results)} assets in {seconds:.1f}s")
+
+
+def report_groups(results):
+    # One report per export folder at a fixed path, so every batch from that folder
+    # updates the same report instead of starting a new one.
+    groups = {}
+    for result in results:
+        folder = os.path.dirname(result['fbx'])
+        groups.setdefault(os.path.join(folder, REPORT_NAME).replace('\\', '/'), []).append(result)
+    return groups
+
+
+def load_instancing(entries):
+    # fbx path -> (instancing map, file name) for every entry its folder's map lists.
+    maps, instanced = {}, {}
+    for entry in entries:
+        folder, file_name = os.path.split(entry.fbx_path)
+        if folder not in maps:
+            maps[folder] = InstancePlacer.load_map(folder)
+        if maps[folder] and file_name in maps[folder].get('meshes', {}):
+            instanced[entry.fbx_path] = (maps[folder], file_name)
+    return instanced
+
+
+def place_instances(entries, instanced):
+    by_map = {}
+    for entry in entries:
+        if entry.fbx_path in instanced and entry.mesh is not None:
+            instancing, file_name = instanced[entry.fbx_path]
+            by_map.setdefault(id(instancing), (instancing, {}))[1][file_name] = entry.mesh
+            entry.instances = len(instancing['meshes'][file_name]['instances'])
+    placed = updated = 0
+    for instancing, meshes in by_map.values():
+        p, u = InstancePlacer.place_instances(instancing, meshes)
+        placed, updated = placed + p, updated + u
+    if placed or updated:
+        unreal.get_editor_subsystem(unreal.LevelEditorSubsystem).save_current_level()
+    return placed, updated
+
+
+def import_batch(fbx_paths, destination=DESTINATION, report_path=None, open_report=True, rules=None, platform=None,
+                 instances=True):
+    # All assets go through one import_asset_tasks call with saving deferred; LODs are
+    # attached once every base mesh exists and everything is written in a single save
+    # pass, so the editor's per-call overhead is paid once per batch instead of per asset.
+    # Meshes listed in their folder's instancing.json are placed once per copy.
+    start = time.time()
+    rules = rules or BudgetRules.RuleSet.load()
+    platform = platform or os.environ.get(BudgetRules.PLATFORM_ENV)
+    entries = []
+    for fbx_path in fbx_paths:
+        fbx_path = fbx_path.replace('\\', '/')
+        if LOD_FILE.search(os.path.splitext(os.path.basename(fbx_path))[0]):
+            continue  # attached to its base asset below
+        if not os.path.exists(fbx_path):
+            unreal.log_error(f"PIPELINE: FBX file not found: {fbx_path}")
+            continue
+        entry = ImportEntry(fbx_path, load_metadata(fbx_path))
+        entry.lod_paths = lod_paths(fbx_path, entry.metadata)
+        entries.append(entry)
+    if not entries:
+        print("--- PIPELINE BATCH: nothing to import ---")
+        return []
+
+    print(f"--- PIPELINE BATCH START: {len(entries)} assets ---")
+    instanced = load_instancing(entries) if instances else {}
+    tasks = build_tasks(entries, destination, instanced)
+    with tracing.span("import_asset_tasks", 'unreal', assets=len(tasks)):
+        unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks(tasks)
+
+    lod_total = sum(len(e.lod_paths) for e in entries)
+    with unreal.ScopedSlowTask(len(entries) + lod_total, "Attaching LODs") as slow_task:
+        slow_task.make_dialog(True)
+        cancelled = False
+        for entry in entries:
+            entry.mesh = find_imported_mesh(entry, destination)
+            if cancelled:
+                # Already imported with saving deferred; saved below without its LODs.
+                entry.cancelled = True
+                continue
+            slow_task.enter_progress_frame(1, entry.asset_name)
+            if entry.mesh is None:
+                unreal.log_error(f"PIPELINE: import failed for {entry.fbx_path}")
+                continue
+            for i, lod_path in enumerate(entry.lod_paths, start=1):
+                slow_task.enter_progress_frame(1)
+                with tracing.span("import_lod", 'unreal', asset=entry.asset_name, lod=i):
+                    if unreal.EditorStaticMeshLibrary.import_lod(entry.mesh, i, lod_path) != -1:
+                        entry.imported_lods += 1
+            if entry.imported_lods:
+                with tracing.span("screen_sizes", 'unreal', asset=entry.asset_name):
+                    entry.screen_sizes = apply_screen_sizes(entry.mesh, entry.metadata)
+            if slow_task.should_cancel():
+                unreal.log_warning("PIPELINE: batch cancelled, remaining assets are saved without LODs")
+                cancelled = True
+
+    meshes = [e.mesh for e in entries if e.mesh is not None]
+    if meshes:
+        with tracing.span("save", 'unreal', assets=len(meshes)):
+            unreal.EditorAssetLibrary.save_loaded_assets(meshes, False)
+    if instanced:
+        with tracing.span("place_instances", 'unreal') as span:
+            span.args['placed'], span.args['updated'] = place_instances(entries, instanced)
+        print(f"Instances: {span.args['placed']} placed, {span.args['updated']} updated")
+
+    results = []
+    for entry in entries:
+        with tracing.span("validate", 'unreal', asset=entry.asset_name):
+            entry.result = evaluate(entry, rules, platform)
+        results.append(entry.result)
+        if entry.result['texture_issues']:
+            unreal.log_warning(f"TEXTURE VALIDATION FAILED ({entry.asset_name}): {entry.result['texture_issues']}")
+        if entry.result['over_budget']:
+            violations = "; ".join(entry.result['budget_violations'])
+            unreal.log_warning(f"{entry.asset_name} EXCEEDS POLYGON BUDGET! ({violations})")
+
+    seconds = time.time() - start
+    reports = {report_path: results} if report_path else report_groups(results)
+    with tracing.span("report", 'unreal', reports=len(reports)):
+        for path, group in reports.items():
+            write_report(group, path, seconds, rules, platform)
+    passed = sum(1 for r in results if r['status'].startswith("PASSED"))
+    print(f"--- PIPELINE BATCH DONE: {passed}/{len(results)} passed, {lod_total} LOD files, {seconds:.1f}s ---")
+    for path in reports:
+        print(f"Report generated: {path}")
+    tracing.flush()
+    if open_report:
+        webbrowser.open('file://' + os.path.realpath(next(iter(reports))))
+    return results
+
+
+if __name__ == '__main__':
+    # UnrealEditor-Cmd <project> -run=pythonscript -script="BatchImporter.py <list file>"
+    with open(sys.argv[1], 'r') as f:
+        import_batch([line.strip() for line in f if line.strip()], open_report=False)
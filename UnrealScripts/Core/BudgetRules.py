@@ -0,0 +1,156 @@
+import fnmatch
+import json
+import os
+
+# Declarative budget rules; the most specific rule for a metric wins.
+RULES_ENV = 'PIPELINE_BUDGETS'     # JSON file replacing DEFAULT_RULES
+PLATFORM_ENV = 'PIPELINE_PLATFORM'
+
+DEFAULT_RULES = {
+    # Upper bound in MB of GPU memory for each complexity class; above the last one
+    # an asset is "Very High".
+    'complexity': {'Low': 1, 'Medium': 5, 'High': 20},
+    # Asset name patterns per category, for manifests without a 'category' field.
+    'categories': {},
+    'rules': [
+        {'metric': 'triangles', 'max': 50000},
+        {'metric': 'triangles', 'lod': 1, 'max': 25000},
+        {'metric': 'triangles', 'lod': 2, 'max': 12500},
+        {'metric': 'triangles', 'lod': 3, 'max': 6000},
+        {'metric': 'accuracy_score', 'min': 85},
+        # Largest texture side in pixels (ExporterUI/texture_stage.py).
+        {'metric': 'texture_size', 'max': 2048},
+        # Material sections of LOD0, measured by ExporterUI/vertex_split.py.
+        {'metric': 'draw_calls', 'max': 8},
+    ],
+}
+
+
+class BudgetRule:
+    def __init__(self, metric, max=None, min=None, category=None, platform=None, lod=0, name=None):
+        if (max is None) == (min is None):
+            raise ValueError(f"rule for {metric} needs exactly one of max/min")
+        self.metric = metric
+        self.bound = 'max' if max is not None else 'min'
+        self.value = max if max is not None else min
+        self.category = category
+        self.platform = platform
+        self.lod = lod or 0
+        self.specificity = (category is not None) * 2 + (platform is not None)
+        self.name = name or self.default_name()
+
+    def default_name(self):
+        scope = [s for s in (self.category, self.platform) if s]
+        return (f"{self.column} {'<=' if self.bound == 'max' else '>='} {self.value}"
+                + (f" [{', '.join(scope)}]" if scope else ""))
+
+    @property
+    def column(self):
+        return self.metric if not self.lod else f"{self.metric}_lod{self.lod}"
+
+    def applies(self, category, platform):
+        return self.category in (None, category) and self.platform in (None, platform)
+
+    def violated(self, value):
+        return value > self.value if self.bound == 'max' else value < self.value
+
+
+class RuleSet:
+    def __init__(self, rules=None, categories=None, complexity=None, nanite=None, lods=None):
+        spec = DEFAULT_RULES if rules is None else {'rules': rules}
+        self.rules = [r if isinstance(r, BudgetRule) else BudgetRule(**r) for r in spec['rules']]
+        self.categories = dict(DEFAULT_RULES['categories'] if categories is None else categories)
+        self.complexity = dict(DEFAULT_RULES['complexity'] if complexity is None else complexity)
+        self.nanite = dict(nanite or {})  # NaniteAdvisor policy overrides
+        self.lods = dict(lods or {})      # LodPolicy overrides
+        # (column, bound) -> candidate rules, least specific first, so later ones override.
+        self.groups = {}
+        for rule in sorted(self.rules, key=lambda r: r.specificity):
+            self.groups.setdefault((rule.column, rule.bound), []).append(rule)
+
+    @classmethod
+    def from_dict(cls, spec):
+        return cls(spec.get('rules', DEFAULT_RULES['rules']), spec.get('categories'), spec.get('complexity'),
+                   spec.get('nanite'), spec.get('lods'))
+
+    @classmethod
+    def load(cls, path=None):
+        # path, else $PIPELINE_BUDGETS, else the defaults above.
+        path = path or os.environ.get(RULES_ENV)
+        if not path:
+            return cls()
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+    def category_of(self, asset_name, metadata=None):
+        if metadata and metadata.get('category'):
+            return metadata['category']
+        for category, patterns in self.categories.items():
+            if any(fnmatch.fnmatchcase(asset_name, p) for p in patterns):
+                return category
+        return None
+
+    def rule_for(self, column, bound, category=None, platform=None):
+        chosen = None
+        for rule in self.groups.get((column, bound), []):
+            if rule.applies(category, platform):
+                chosen = rule
+        return chosen
+
+    def limit(self, metric, category=None, platform=None, lod=0, bound='max'):
+        rule = self.rule_for(metric if not lod else f"{metric}_lod{lod}", bound, category, platform)
+        return rule.value if rule else None
+
+    def check(self, values, category=None, platform=None):
+        # One asset: values maps column -> number. Returns the violated rules.
+        violated = []
+        for (column, bound) in self.groups:
+            value = values.get(column)
+            rule = self.rule_for(column, bound, category, platform)
+            if value is not None and rule is not None and rule.violated(value):
+                violated.append(rule)
+        return violated
+
+    def classify(self, memory_mb):
+        for label, bound in sorted(self.complexity.items(), key=lambda item: item[1]):
+            if memory_mb <= bound:
+                return label
+        return "Very High"
+
+    def evaluate(self, columns, categories=None, platform=None):
+        # Whole batch at once: columns maps column -> sequence with one value per asset
+        # (NaN or None where unknown, which never violates). Returns a per-asset
+        # 'passed' array, and for every violated rule the indices of its offenders.
+        import numpy as np
+
+        count = len(next(iter(columns.values()))) if columns else 0
+        labels = np.asarray([c or "" for c in categories] if categories is not None else [""] * count, dtype=object)
+        names, codes = np.unique(labels, return_inverse=True)
+        passed = np.ones(count, dtype=bool)
+        violations = {}
+        for (column, bound), candidates in self.groups.items():
+            if column not in columns:
+                continue
+            values = np.asarray(columns[column], dtype=np.float64)
+            limits = np.full(count, np.nan)
+            owners = np.full(count, -1)
+            for index, rule in enumerate(candidates):
+                if rule.platform not in (None, platform):
+                    continue
+                if rule.category is None:
+                    mask = slice(None)
+                else:
+                    where = np.flatnonzero(names == rule.category)
+                    if not len(where):
+                        continue
+                    mask = codes == where[0]
+                limits[mask] = rule.value
+                owners[mask] = index
+            with np.errstate(invalid='ignore'):
+                bad = values > limits if bound == 'max' else values < limits
+            if bad.any():
+                passed &= ~bad
+                for index in np.unique(owners[bad]):
+                    offenders = np.flatnonzero(bad & (owners == index))
+                    violations[candidates[index].name] = offenders
+        return {'passed': passed, 'violations': violations}
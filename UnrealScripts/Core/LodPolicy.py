@@ -0,0 +1,91 @@
+import math
+
+# Picks each asset's LOD chain: LOD count, reduction per LOD and Unreal screen sizes.
+DEFAULT_POLICY = {
+    'pixel_error': 1.0,
+    'platform_pixel_error': {'Mobile': 2.0, 'Android': 2.0, 'iOS': 2.0, 'Switch': 1.5},
+    'feature_cm': 10.0,
+    'screen_step': 0.4,
+    'min_step': 0.25,       # a LOD keeps at least this share of the previous LOD's triangles...
+    'max_step': 0.6,        # ...and at most this share, or it is not worth a switch
+    'min_triangles': 300,
+    'min_screen_size': 0.02,
+    'max_lods': 7,          # MAX_STATIC_MESH_LODS is 8, LOD0 included
+}
+
+SPHERE_ERROR = 3.63      # 29 / 8
+HALF_WIDTH = 960.0       # pixels, half of the 1920 wide reference view
+SCREEN_MULTIPLE = 0.889  # max(0.5 * proj[0][0], 0.5 * proj[1][1]) at 90 degrees, 16:9
+SCREEN_CAP = 0.9         # a LOD switches at most at this share of the previous switch
+
+
+class LodPolicy:
+    def __init__(self, policy=None):
+        self.policy = dict(DEFAULT_POLICY, **(policy or {}))
+
+    @classmethod
+    def from_rules(cls, rules):
+        return cls(getattr(rules, 'lods', None))
+
+    def pixel_error(self, platform=None):
+        return float(self.policy['platform_pixel_error'].get(platform, self.policy['pixel_error']))
+
+    def deviation_scale(self, triangles, radius_cm):
+        # K in cm: reducing to fraction f of the triangles deviates by K (1/f - 1).
+        feature = min(radius_cm, self.policy['feature_cm'])
+        return SPHERE_ERROR * radius_cm * radius_cm / (feature * triangles)
+
+    def screen_size(self, radius_cm, deviation_cm, pixel_error):
+        distance = deviation_cm * HALF_WIDTH / pixel_error + radius_cm
+        return 2 * SCREEN_MULTIPLE * radius_cm / max(1.0, distance)
+
+    def deviation_at(self, radius_cm, screen_size, pixel_error):
+        # Inverse of screen_size(): the deviation that covers pixel_error at screen_size.
+        return max(0.0, pixel_error * (2 * SCREEN_MULTIPLE * radius_cm / screen_size - radius_cm) / HALF_WIDTH)
+
+    def plan(self, triangles, radius_cm, platform=None):
+        # LOD chain for an asset of LOD0 triangles and bounding sphere radius (cm).
+        # 'reductions' are percents of LOD0 for LOD1.., 'screen_sizes' start at LOD0's 1.0.
+        policy = self.policy
+        pixel_error = self.pixel_error(platform)
+        plan = {
+            'triangles': [int(triangles)],
+            'reductions': [],
+            'screen_sizes': [1.0],
+            'radius_cm': round(float(radius_cm), 2) if radius_cm else None,
+            'pixel_error': pixel_error,
+            'reasons': [],
+        }
+        if not radius_cm or radius_cm <= 0 or triangles <= 0:
+            plan['reasons'].append("no bounds or triangles: no LODs")
+            plan['lod_count'] = 0
+            return plan
+        scale = self.deviation_scale(triangles, radius_cm)
+        while len(plan['reductions']) < policy['max_lods']:
+            previous = plan['triangles'][-1]
+            target = plan['screen_sizes'][-1] * policy['screen_step']
+            deviation = self.deviation_at(radius_cm, target, pixel_error)
+            wanted = triangles * scale / (scale + deviation)
+            count = int(min(max(wanted, policy['min_step'] * previous), policy['max_step'] * previous))
+            if count < policy['min_triangles']:
+                plan['reasons'].append(f"LOD{len(plan['triangles'])} would have {count} triangles "
+                                       f"(< {policy['min_triangles']})")
+                break
+            size = self.screen_size(radius_cm, scale * (triangles / count - 1), pixel_error)
+            size = min(size, plan['screen_sizes'][-1] * SCREEN_CAP)
+            if size < policy['min_screen_size']:
+                plan['reasons'].append(f"LOD{len(plan['triangles'])} would switch at screen size {size:.3f} "
+                                       f"(< {policy['min_screen_size']})")
+                break
+            plan['triangles'].append(count)
+            plan['reductions'].append(round(100.0 * count / triangles, 2))
+            plan['screen_sizes'].append(round(size, 4))
+        else:
+            plan['reasons'].append(f"max_lods {policy['max_lods']} reached")
+        plan['lod_count'] = len(plan['reductions'])
+        return plan
+
+
+def sphere_radius(bounds_cm):
+    # Bounding sphere radius of an axis-aligned box extent, as Unreal's bounds use.
+    return 0.5 * math.sqrt(sum(float(v) ** 2 for v in bounds_cm))
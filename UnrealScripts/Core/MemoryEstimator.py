@@ -0,0 +1,102 @@
+# GPU memory of a static mesh as UE5 builds it: LOD buffers, Nanite data and collision.
+
+MB = 1024 * 1024
+
+POSITION_BYTES = 12         # FPositionVertexBuffer, float3
+TANGENT_BYTES = 8           # TangentX + TangentZ, packed normals
+TANGENT_BYTES_HIGH = 16     # bUseHighPrecisionTangentBasis
+UV_BYTES = 4                # half2 per channel
+UV_BYTES_FULL = 8           # bUseFullPrecisionUVs
+COLOR_BYTES = 4             # FColorVertexBuffer, only built when the mesh has colors
+
+# Epic's average for encoded Nanite data, counted as if every page were resident: an
+# upper bound, since the streaming pool caps what actually stays in memory.
+NANITE_BYTES_PER_TRIANGLE = 14.4
+CONVEX_HULL_BYTES = 32 * 12 + 62 * 3 * 2  # up to 32 hull vertices, faces as 16-bit indices
+COMPLEX_COLLISION_OVERHEAD = 1.3  # BVH on top of the cooked triangle mesh
+
+# Triangle share of each LOD in the chain the pipeline exports (see MeshDecimator.ms),
+# used when only LOD0 counts are known.
+LOD_REDUCTIONS = (100, 50, 25, 12)
+
+COMPONENTS = ('positions', 'tangents', 'uvs', 'colors', 'indices', 'nanite', 'nanite_fallback', 'collision')
+
+
+class VertexFormat:
+    def __init__(self, uv_channels=1, colors=False, high_precision_tangents=False, full_precision_uvs=False):
+        self.uv_channels = max(1, uv_channels or 1)
+        self.colors = colors
+        self.high_precision_tangents = high_precision_tangents
+        self.full_precision_uvs = full_precision_uvs
+
+    def bytes_per_vertex(self):
+        return {
+            'positions': POSITION_BYTES,
+            'tangents': TANGENT_BYTES_HIGH if self.high_precision_tangents else TANGENT_BYTES,
+            'uvs': (UV_BYTES_FULL if self.full_precision_uvs else UV_BYTES) * self.uv_channels,
+            'colors': COLOR_BYTES if self.colors else 0,
+        }
+
+
+def index_bytes(vertices):
+    # The build picks 16-bit indices whenever every index fits.
+    return 2 if vertices <= 0xFFFF else 4
+
+
+def lod_chain(triangles, vertices, lod_count=1, reductions=None):
+    # Counts for lod_count LODs when only LOD0 is known. reductions: percent of LOD0 for
+    # each LOD after it (LodPolicy's), instead of LOD_REDUCTIONS.
+    shares = LOD_REDUCTIONS if reductions is None else (100,) + tuple(reductions)
+    count = min(max(1, lod_count), len(shares))
+    return [(int(triangles * p / 100), int(vertices * p / 100)) for p in shares[:count]]
+
+
+class MemoryEstimator:
+    def __init__(self, vertex_format=None, depth_only_indices=True):
+        self.vertex_format = vertex_format or VertexFormat()
+        # LOD0 also gets a depth-only index buffer by default.
+        self.depth_only_indices = depth_only_indices
+
+    def lod_bytes(self, triangles, vertices, lod_index=0):
+        per_vertex = self.vertex_format.bytes_per_vertex()
+        breakdown = {name: size * vertices for name, size in per_vertex.items()}
+        index_buffers = 2 if lod_index == 0 and self.depth_only_indices else 1
+        breakdown['indices'] = triangles * 3 * index_bytes(vertices) * index_buffers
+        return breakdown
+
+    def collision_bytes(self, triangles, vertices, hulls=1, complex_collision=True):
+        total = hulls * CONVEX_HULL_BYTES
+        if complex_collision:
+            total += (vertices * POSITION_BYTES + triangles * 3 * 4) * COMPLEX_COLLISION_OVERHEAD
+        return int(total)
+
+    def estimate(self, lods, nanite=False, nanite_fallback_percent=100, collision_hulls=1, complex_collision=True):
+        # lods: [(triangles, vertices), ...] starting at LOD0. With Nanite the imported
+        # LODs are not built; the GPU holds the Nanite pages and one fallback mesh.
+        components = dict.fromkeys(COMPONENTS, 0)
+        per_lod = []
+        base_triangles, base_vertices = lods[0] if lods else (0, 0)
+        if nanite:
+            components['nanite'] = int(base_triangles * NANITE_BYTES_PER_TRIANGLE)
+            ratio = nanite_fallback_percent / 100.0
+            fallback = self.lod_bytes(int(base_triangles * ratio), int(base_vertices * ratio))
+            components['nanite_fallback'] = sum(fallback.values())
+            per_lod.append(dict(fallback, lod=0, total=components['nanite_fallback']))
+        else:
+            for i, (triangles, vertices) in enumerate(lods):
+                breakdown = self.lod_bytes(triangles, vertices, i)
+                for name, size in breakdown.items():
+                    components[name] += size
+                per_lod.append(dict(breakdown, lod=i, total=sum(breakdown.values())))
+        components['collision'] = self.collision_bytes(base_triangles, base_vertices, collision_hulls,
+                                                       complex_collision)
+
+        gpu_bytes = sum(size for name, size in components.items() if name != 'collision')
+        return {
+            'components': components,
+            'lods': per_lod,
+            'gpu_bytes': gpu_bytes,
+            'total_bytes': gpu_bytes + components['collision'],
+            'gpu_mb': round(gpu_bytes / MB, 4),
+            'total_mb': round((gpu_bytes + components['collision']) / MB, 4),
+        }
@@ -0,0 +1,120 @@
+try:
+    from .MemoryEstimator import MemoryEstimator, VertexFormat, lod_chain
+except ImportError:
+    from MemoryEstimator import MemoryEstimator, VertexFormat, lod_chain #type:ignore
+
+# Chooses per asset between Nanite, the LOD chain or both, with the reasons that counted.
+DEFAULT_POLICY = {
+    'min_triangles': 5000,           # below this, cluster culling does not pay for the fallback mesh
+    'high_triangles': 100000,        # film-quality density; LOD transitions get expensive to author
+    'dense_triangles_per_m2': 10000,  # per m2 of bounding-box surface: triangles near pixel size
+    'sparse_triangles_per_m2': 500,  # large, simple surfaces where LOD swaps are cheap
+    'many_instances': 20,            # copies that Nanite culls and draws per cluster, not per mesh
+    'fallback_percent': 100,         # Nanite fallback mesh, in percent of LOD0 triangles
+    'nanite_score': 2,
+    # Targets without Nanite; assets going to them keep their LODs next to the Nanite data.
+    'lod_platforms': ['Mobile', 'Android', 'iOS', 'Switch'],
+}
+
+NANITE = "nanite"
+LODS = "lods"
+BOTH = "both"
+
+
+def surface_m2(bounds_cm):
+    x, y, z = (max(float(v), 1.0) / 100.0 for v in bounds_cm)
+    return 2 * (x * y + y * z + x * z)
+
+
+class NaniteAdvisor:
+    def __init__(self, policy=None):
+        self.policy = dict(DEFAULT_POLICY, **(policy or {}))
+
+    @classmethod
+    def from_rules(cls, rules):
+        return cls(getattr(rules, 'nanite', None))
+
+    def memory(self, stats):
+        # (Nanite + fallback, classic LOD chain) GPU megabytes for the asset.
+        vertex_format = VertexFormat(uv_channels=stats.get('uv_sets', 1), colors=stats.get('vertex_colors', False))
+        estimator = MemoryEstimator(vertex_format)
+        triangles, vertices = stats['triangles'], stats.get('vertices') or stats['triangles'] // 2
+        lod_triangles = stats.get('lod_triangles') or []
+        if len(lod_triangles) > 1:
+            lods = [(t, int(vertices * t / max(triangles, 1))) for t in lod_triangles]
+            lods[0] = (triangles, vertices)
+        else:
+            lods = lod_chain(triangles, vertices, 4)
+        nanite = estimator.estimate(lods[:1], nanite=True, nanite_fallback_percent=self.policy['fallback_percent'])
+        classic = estimator.estimate(lods)
+        return nanite, classic
+
+    def decide(self, stats, platform=None):
+        # stats: 'triangles' and 'vertices' of LOD0, optionally 'lod_triangles' (LOD0
+        # first), 'bounds_cm' (x, y, z extent), 'uv_sets', 'vertex_colors',
+        # 'masked_slots', 'translucent_slots' and 'instances'.
+        policy = self.policy
+        triangles = stats['triangles']
+        nanite_memory, lod_memory = self.memory(stats)
+        bounds = stats.get('bounds_cm')
+        density = triangles / surface_m2(bounds) if bounds else None
+        metrics = {
+            'triangles': triangles,
+            'triangles_per_m2': round(density, 1) if density is not None else None,
+            'bounds_cm': [round(float(v), 2) for v in bounds] if bounds else None,
+            'nanite_mb': nanite_memory['gpu_mb'],
+            'fallback_mb': round(nanite_memory['components']['nanite_fallback'] / (1024 * 1024), 4),
+            'lod_chain_mb': lod_memory['gpu_mb'],
+            'masked_slots': stats.get('masked_slots', 0),
+            'translucent_slots': stats.get('translucent_slots', 0),
+            'instances': stats.get('instances', 1),
+        }
+        reasons = []
+        score = 0
+
+        if metrics['translucent_slots']:
+            reasons.append(f"{metrics['translucent_slots']} translucent material slot(s): Nanite does not render translucency")
+            return self.result(LODS, None, reasons, metrics, platform)
+        if triangles < policy['min_triangles']:
+            reasons.append(f"{triangles} triangles < {policy['min_triangles']}: too few for Nanite's fallback and "
+                           "cluster overhead to pay off")
+            return self.result(LODS, None, reasons, metrics, platform)
+
+        def signal(points, text):
+            nonlocal score
+            score += points
+            reasons.append(f"{'+' if points > 0 else ''}{points} {text}")
+
+        if triangles >= policy['high_triangles']:
+            signal(2, f"{triangles} triangles >= {policy['high_triangles']}")
+        if density is not None:
+            if density >= policy['dense_triangles_per_m2']:
+                signal(1, f"{density:.0f} triangles/m2 >= {policy['dense_triangles_per_m2']}: "
+                          "triangles near pixel size at distance")
+            elif density < policy['sparse_triangles_per_m2']:
+                signal(-1, f"{density:.0f} triangles/m2 < {policy['sparse_triangles_per_m2']}: large, simple surfaces")
+        if nanite_memory['gpu_mb'] <= lod_memory['gpu_mb']:
+            signal(1, f"Nanite {nanite_memory['gpu_mb']:.2f} MB (with fallback) <= LOD chain {lod_memory['gpu_mb']:.2f} MB")
+        else:
+            signal(-1, f"Nanite {nanite_memory['gpu_mb']:.2f} MB (with fallback) > LOD chain {lod_memory['gpu_mb']:.2f} MB")
+        if metrics['masked_slots']:
+            signal(-1, f"{metrics['masked_slots']} masked material slot(s) need Nanite's slower programmable raster")
+        if metrics['instances'] >= policy['many_instances']:
+            signal(1, f"{metrics['instances']} instances >= {policy['many_instances']}")
+        mode = NANITE if score >= policy['nanite_score'] else LODS
+        reasons.append(f"score {score} {'>=' if mode == NANITE else '<'} {policy['nanite_score']}")
+        return self.result(mode, score, reasons, metrics, platform)
+
+    def result(self, mode, score, reasons, metrics, platform):
+        if mode == NANITE and platform in self.policy['lod_platforms']:
+            mode = BOTH
+            reasons.append(f"{platform} has no Nanite: LODs kept as well")
+        return {
+            'mode': mode,
+            'enable_nanite': mode in (NANITE, BOTH),
+            'keep_lods': mode in (LODS, BOTH),
+            'score': score,
+            'reasons': reasons,
+            'metrics': metrics,
+            'platform': platform,
+        }
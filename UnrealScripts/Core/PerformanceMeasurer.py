@@ -1,25 +1,140 @@
 import unreal #type:ignore
 
+try:
+    from .MemoryEstimator import MemoryEstimator, VertexFormat, lod_chain
+except ImportError:
+    from MemoryEstimator import MemoryEstimator, VertexFormat, lod_chain #type:ignore
+
+# Written by UStaticMesh::GetAssetRegistryTags when the asset is saved, so they can be
+# read from the registry without loading the mesh.
+TRIANGLES_TAG = 'Triangles'
+VERTICES_TAG = 'Vertices'
+LODS_TAG = 'LODs'
+UV_CHANNELS_TAG = 'UVChannels'
+NANITE_TAG = 'NaniteEnabled'
+COLLISION_TAG = 'CollisionPrims'
+
+# Fallback loads between garbage collections when measuring a folder.
+GC_INTERVAL = 50
+
+
+def _tag_int(asset_data, tag):
+    value = asset_data.get_tag_value(tag)
+    try:
+        return int(str(value).replace(',', ''))
+    except (TypeError, ValueError):
+        return None
+
+
+def _asset_class(asset_data):
+    try:
+        return str(asset_data.asset_class_path.asset_name)
+    except AttributeError:
+        return str(asset_data.asset_class)
+
+
 class PerformanceMeasurer:
+    def __init__(self, use_registry=True, gc_interval=GC_INTERVAL):
+        self.use_registry = use_registry
+        self.gc_interval = gc_interval
+        self.loads = 0
+
     def measure_asset(self, asset_path):
+        if not self.use_registry:
+            return self._measure_loaded(asset_path)
+
+        asset_data = unreal.EditorAssetLibrary.find_asset_data(asset_path)
+        if not asset_data.is_valid():
+            unreal.log_error(f"PerformanceMeasurer: Asset not found at {asset_path}")
+            return None
+        if _asset_class(asset_data) != 'StaticMesh':
+            unreal.log_warning(f"PerformanceMeasurer: Asset {asset_path} is not a Static Mesh")
+            return None
+        return self.stats_from_tags(asset_data) or self._measure_loaded(asset_path)
+
+    def stats_from_tags(self, asset_data):
+        # None when the asset was saved without the tags (e.g. by an older engine
+        # version), in which case the caller has to load it. The tags only carry LOD0
+        # counts, so the rest of the chain is assumed to follow the exported reductions.
+        triangles = _tag_int(asset_data, TRIANGLES_TAG)
+        vertices = _tag_int(asset_data, VERTICES_TAG)
+        if triangles is None or vertices is None:
+            return None
+        collision = _tag_int(asset_data, COLLISION_TAG)
+        return self._stats(lod_chain(triangles, vertices, _tag_int(asset_data, LODS_TAG) or 1), source='registry',
+                           uv_channels=_tag_int(asset_data, UV_CHANNELS_TAG),
+                           nanite=str(asset_data.get_tag_value(NANITE_TAG)).lower() == 'true',
+                           collision_hulls=1 if collision is None else collision)
+
+    def measure_folder(self, folder, recursive=True):
+        # Yields (asset path, stats) one mesh at a time. Only meshes without registry tags
+        # are loaded, and the loaded ones are released every gc_interval loads, so memory
+        # stays flat however large the folder is.
+        registry = unreal.AssetRegistryHelpers.get_asset_registry()
+        loads_since_gc = 0
+        for asset_data in registry.get_assets_by_path(folder, recursive=recursive):
+            if _asset_class(asset_data) != 'StaticMesh':
+                continue
+            asset_path = str(asset_data.package_name)
+            stats = self.stats_from_tags(asset_data) if self.use_registry else None
+            if stats is None:
+                stats = self._measure_loaded(asset_path)
+                loads_since_gc += 1
+                if loads_since_gc >= self.gc_interval:
+                    unreal.SystemLibrary.collect_garbage()
+                    loads_since_gc = 0
+            if stats is not None:
+                yield asset_path, stats
+        if loads_since_gc:
+            unreal.SystemLibrary.collect_garbage()
+
+    def _measure_loaded(self, asset_path):
         if not unreal.EditorAssetLibrary.does_asset_exist(asset_path):
             unreal.log_error(f"PerformanceMeasurer: Asset not found at {asset_path}")
             return None
 
         asset = unreal.EditorAssetLibrary.load_asset(asset_path)
+        self.loads += 1
 
         if isinstance(asset, unreal.StaticMesh):
-            triangles = asset.get_num_triangles(0)
-            vertices = asset.get_num_vertices(0)
+            lods = [(asset.get_num_triangles(i), asset.get_num_vertices(i)) for i in range(max(1, asset.get_num_lods()))]
+            return self._stats(lods, source='load', **self._loaded_details(asset))
 
-            memory_bytes = vertices * 64
-            memory_mb = memory_bytes / (1024 * 1024)
+        unreal.log_warning(f"PerformanceMeasurer: Asset {asset_path} is not a Static Mesh")
+        return None
 
-            return {
-                'triangles': triangles,
-                'vertices': vertices,
-                'memory_mb': round(memory_mb, 4)
-            }
+    def _loaded_details(self, asset):
+        # Properties that moved between engine versions; whatever is missing keeps its default.
+        details = {}
+        try:
+            details['uv_channels'] = asset.get_num_uv_channels(0)
+        except Exception:
+            pass
+        try:
+            nanite_settings = asset.get_editor_property('nanite_settings')
+            details['nanite'] = bool(nanite_settings.enabled)
+            details['nanite_fallback_percent'] = nanite_settings.fallback_percent_triangles * 100
+        except Exception:
+            pass
+        try:
+            details['collision_hulls'] = unreal.EditorStaticMeshLibrary.get_simple_collision_count(asset)
+        except Exception:
+            pass
+        return details
 
-        unreal.log_warning(f"PerformanceMeasurer: Asset {asset_path} is not a Static Mesh")
-        return None
\ No newline at end of file
+    def _stats(self, lods, source, uv_channels=None, nanite=False, nanite_fallback_percent=100, collision_hulls=1):
+        estimator = MemoryEstimator(VertexFormat(uv_channels=uv_channels))
+        memory = estimator.estimate(lods, nanite=nanite, nanite_fallback_percent=nanite_fallback_percent,
+                                    collision_hulls=collision_hulls)
+        triangles, vertices = lods[0]
+
+        return {
+            'triangles': triangles,
+            'vertices': vertices,
+            'memory_mb': memory['gpu_mb'],
+            'memory': memory,
+            'lods': len(lods),
+            'uv_channels': uv_channels,
+            'nanite': nanite,
+            'source': source,
+        }
@@ -0,0 +1,254 @@
+import hashlib
+import json
+import os
+import tempfile
+from statistics import NormalDist
+
+try:
+    from .BudgetRules import RuleSet
+    from .MemoryEstimator import MemoryEstimator, lod_chain
+except ImportError:
+    from BudgetRules import RuleSet #type:ignore
+    from MemoryEstimator import MemoryEstimator, lod_chain #type:ignore
+
+# Pre-export cost prediction, calibrated incrementally on the pipeline's measured exports.
+MODEL_ENV = 'PIPELINE_PREDICTOR'   # model file used by load()/save() when no path is given
+DEFAULT_MODEL = os.path.join(tempfile.gettempdir(), "3dsMaxPipeline", "predictor.json")
+MODEL_VERSION = 1
+
+TARGETS = ('triangles', 'gpu_vertices', 'memory_mb', 'draw_sections')
+FEATURES = ('bias', 'log_polygons', 'log_vertices', 'log_slots', 'lods', 'nanite')
+RIDGE = 1.0  # pulls the correction toward 0 (the analytic estimate) while samples are few
+
+
+def manifest_columns(manifests):
+    # Predictor inputs from export manifests (AssetPipeline.ms). lod_reductions: LOD
+    # sizes in percent of LOD0 when LodPolicy chose them, else None for the defaults.
+    return {
+        'polygons': [m.get('polygons', 0) for m in manifests],
+        'vertices': [m.get('vertices', 0) for m in manifests],
+        'material_slots': [m.get('material_slots', 1) for m in manifests],
+        'lods': [bool(m.get('lod_count', 0)) for m in manifests],
+        'nanite': [bool(m.get('enable_nanite', False)) for m in manifests],
+        'lod_reductions': [[level['reduction'] for level in m['lod_levels']] if m.get('lod_levels') else None
+                           for m in manifests],
+    }
+
+
+def sample_digest(metadata, measured):
+    # What one asset contributes to training: its predictor inputs and measured targets.
+    columns = manifest_columns([metadata])
+    sample = [[columns[name][0] for name in sorted(columns)], [measured.get(t) for t in TARGETS]]
+    return hashlib.sha1(json.dumps(sample, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+class PerformancePredictor:
+    def __init__(self, rules=None, confidence=0.9):
+        import numpy as np
+
+        self.rules = rules or RuleSet.load()
+        self.confidence = confidence
+        size = len(FEATURES)
+        self.xtx = np.zeros((size, size))
+        self.xty = np.zeros((size, len(TARGETS)))
+        self.yty = np.zeros(len(TARGETS))
+        self.samples = 0
+        self.learned = {}  # asset key -> sample_digest of what was learned from it
+        self.fitted = None
+
+    def design(self, columns):
+        import numpy as np
+
+        polygons = np.asarray(columns['polygons'], dtype=np.float64)
+        count = len(polygons)
+
+        def column(name, default):
+            return np.asarray(columns.get(name, [default] * count), dtype=np.float64)
+
+        return np.column_stack([
+            np.ones(count),
+            np.log1p(polygons),
+            np.log1p(column('vertices', 0)),
+            np.log1p(np.maximum(column('material_slots', 1), 1)),
+            column('lods', 0),
+            column('nanite', 0),
+        ])
+
+    def estimate(self, columns):
+        # The uncalibrated estimate for every target.
+        import numpy as np
+
+        polygons = np.asarray(columns['polygons'], dtype=np.float64)
+        count = len(polygons)
+        vertices = np.asarray(columns.get('vertices', [0] * count), dtype=np.float64)
+        slots = np.asarray(columns.get('material_slots', [1] * count), dtype=np.float64)
+        lods = columns.get('lods', [False] * count)
+        nanite = columns.get('nanite', [False] * count)
+        reductions = columns.get('lod_reductions', [None] * count)
+        estimator = MemoryEstimator()
+        # The whole chain (MAX_STATIC_MESH_LODS caps it at 8) when the asset has LODs.
+        memory = [estimator.estimate(lod_chain(int(t), int(v), 8 if l else 1, r), nanite=bool(n))['gpu_mb']
+                  for t, v, l, n, r in zip(polygons, vertices, lods, nanite, reductions)]
+        return {
+            'triangles': np.maximum(polygons, 1),
+            'gpu_vertices': np.maximum(vertices, 1),
+            'memory_mb': np.maximum(np.asarray(memory, dtype=np.float64), 1e-6),
+            'draw_sections': np.maximum(slots, 1),
+        }
+
+    def observe(self, columns, measured):
+        # columns as for predict_batch; measured maps each target to the measured values
+        # of the same assets (None or NaN where a target was not measured).
+        import numpy as np
+
+        x = self.design(columns)
+        base = self.estimate(columns)
+        y = np.column_stack([np.asarray([np.nan if v is None else v for v in measured.get(t, [None] * len(x))],
+                                        dtype=np.float64) for t in TARGETS])
+        y = np.log(np.maximum(y, 1e-6)) - np.log(np.column_stack([base[t] for t in TARGETS]))
+        known = ~np.isnan(y).any(axis=1)
+        x, y = x[known], y[known]
+        self.xtx += x.T @ x
+        self.xty += x.T @ y
+        self.yty += (y * y).sum(axis=0)
+        self.samples += len(x)
+        self.fitted = None
+        return len(x)
+
+    def observe_exports(self, pairs, keys=None):
+        # (manifest, measure_fbx result) pairs, as fbx_reader.validate_export produces.
+        # keys: one ID per pair (the FBX path); a pair already learned under its key with
+        # the same inputs and measurements is skipped.
+        pairs = list(pairs)
+        if keys is not None:
+            fresh = []
+            for key, (metadata, measured) in zip(keys, pairs):
+                digest = sample_digest(metadata, measured)
+                if self.learned.get(key) != digest:
+                    self.learned[key] = digest
+                    fresh.append((metadata, measured))
+            pairs = fresh
+        measured = {t: [m.get(t) for _, m in pairs] for t in TARGETS}
+        return self.observe(manifest_columns([metadata for metadata, _ in pairs]), measured) if pairs else 0
+
+    def fit(self):
+        import numpy as np
+
+        if self.fitted is None:
+            size = len(FEATURES)
+            inverse = np.linalg.inv(self.xtx + RIDGE * np.eye(size))
+            beta = inverse @ self.xty
+            sse = self.yty - 2 * (beta * self.xty).sum(axis=0) + (beta * (self.xtx @ beta)).sum(axis=0)
+            dof = self.samples - size
+            sigma = np.sqrt(np.maximum(sse, 0) / dof) if dof > 0 else None
+            self.fitted = (beta, inverse, sigma)
+        return self.fitted
+
+    def predict_batch(self, columns):
+        # Per target: 'value' and, once the model has more samples than features, the
+        # 'low'/'high' bounds of the prediction interval at self.confidence.
+        import numpy as np
+
+        x = self.design(columns)
+        base = self.estimate(columns)
+        beta, inverse, sigma = self.fit()
+        correction = x @ beta
+        spread = None
+        if sigma is not None:
+            z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+            leverage = np.einsum('ij,jk,ik->i', x, inverse, x)
+            spread = z * np.sqrt(1 + leverage)[:, None] * sigma[None, :]
+        result = {}
+        for i, target in enumerate(TARGETS):
+            value = base[target] * np.exp(correction[:, i])
+            result[target] = {
+                'value': value,
+                'low': value * np.exp(-spread[:, i]) if spread is not None else None,
+                'high': value * np.exp(spread[:, i]) if spread is not None else None,
+            }
+        result['complexity'] = [self.rules.classify(m) for m in result['memory_mb']['value']]
+        result['calibrated'] = self.samples
+        return result
+
+    def predict(self, polygons, vertices, material_slots=1, lods=True, nanite=False, lod_reductions=None):
+        batch = self.predict_batch({'polygons': [polygons], 'vertices': [vertices],
+                                    'material_slots': [material_slots], 'lods': [lods], 'nanite': [nanite],
+                                    'lod_reductions': [lod_reductions]})
+        prediction = {'complexity': batch['complexity'][0], 'calibrated': batch['calibrated']}
+        for target in TARGETS:
+            prediction[target] = {key: None if values is None else round(float(values[0]), 4)
+                                  for key, values in batch[target].items()}
+        return prediction
+
+    def screen(self, columns, categories=None, platform=None):
+        # Budget check before export: an asset fails only if even the low end of its
+        # interval (the point estimate while uncalibrated) breaks a triangle or memory rule.
+        # Same return shape as RuleSet.evaluate.
+        batch = self.predict_batch(columns)
+        low = {target: batch[target]['low'] if batch[target]['low'] is not None else batch[target]['value']
+               for target in ('triangles', 'memory_mb')}
+        return self.rules.evaluate(low, categories, platform)
+
+    def errors(self, columns, measured):
+        # Mean absolute percentage error per target, model vs. uncalibrated estimate,
+        # and how often the measured value fell inside the interval.
+        import numpy as np
+
+        base = self.estimate(columns)
+        batch = self.predict_batch(columns)
+        report = {}
+        for target in TARGETS:
+            actual = np.asarray(measured[target], dtype=np.float64)
+            predicted = batch[target]
+            report[target] = {
+                'estimate_mape': round(float(np.mean(np.abs(base[target] - actual) / actual)) * 100, 2),
+                'model_mape': round(float(np.mean(np.abs(predicted['value'] - actual) / actual)) * 100, 2),
+                'coverage': None if predicted['low'] is None else round(float(np.mean(
+                    (actual >= predicted['low']) & (actual <= predicted['high']))), 3),
+            }
+        return report
+
+    def to_dict(self):
+        return {
+            'version': MODEL_VERSION,
+            'features': list(FEATURES),
+            'targets': list(TARGETS),
+            'samples': self.samples,
+            'xtx': self.xtx.tolist(),
+            'xty': self.xty.tolist(),
+            'yty': self.yty.tolist(),
+            'learned': self.learned,
+        }
+
+    @classmethod
+    def from_dict(cls, state, rules=None, confidence=0.9):
+        import numpy as np
+
+        predictor = cls(rules, confidence)
+        if (state.get('version') == MODEL_VERSION and state.get('features') == list(FEATURES)
+                and state.get('targets') == list(TARGETS)):
+            predictor.xtx = np.asarray(state['xtx'], dtype=np.float64)
+            predictor.xty = np.asarray(state['xty'], dtype=np.float64)
+            predictor.yty = np.asarray(state['yty'], dtype=np.float64)
+            predictor.samples = state['samples']
+            predictor.learned = dict(state.get('learned', {}))
+        return predictor
+
+    @classmethod
+    def load(cls, path=None, rules=None, confidence=0.9):
+        # path, else $PIPELINE_PREDICTOR, else DEFAULT_MODEL; an untrained model if missing.
+        path = path or os.environ.get(MODEL_ENV) or DEFAULT_MODEL
+        try:
+            with open(path, 'r') as f:
+                return cls.from_dict(json.load(f), rules, confidence)
+        except (OSError, ValueError):
+            return cls(rules, confidence)
+
+    def save(self, path=None):
+        path = path or os.environ.get(MODEL_ENV) or DEFAULT_MODEL
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp, path)
+        return path
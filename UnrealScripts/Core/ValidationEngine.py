@@ -1,6 +1,12 @@
+try:
+    from .BudgetRules import RuleSet
+except ImportError:
+    from BudgetRules import RuleSet #type:ignore
+
+
 class ValidationEngine:
-    def __init__(self):
-        pass
+    def __init__(self, rules=None):
+        self.rules = rules or RuleSet.load()
     
     def validate_predictions(self, metadata, actual_stats):        
         predicted_polys = metadata['polygons']
@@ -18,15 +24,40 @@ class ValidationEngine:
             'accuracy_score': accuracy_score,
             'predicted_complexity': predicted_complexity,
             'actual_complexity': actual_complexity,
-            'memory_mb': actual_memory
+            'memory_mb': actual_memory,
+            'memory_breakdown': actual_stats.get('memory', {}).get('components', {}),
+            'actual_triangles': actual_polys,
+            'lod_triangles': actual_stats.get('lod_triangles', [])
+        }
+
+    def validate_batch(self, columns, categories=None, platform=None):
+        # Column-wise validate_predictions for a whole library plus the budget rules:
+        # columns holds 'polygons' (predicted), 'triangles' and 'memory_mb' (measured)
+        # with one entry per asset, and optionally 'triangles_lod1'... for LOD budgets.
+        import numpy as np
+
+        predicted = np.asarray(columns['polygons'], dtype=np.float64)
+        actual = np.asarray(columns['triangles'], dtype=np.float64)
+        memory = np.asarray(columns['memory_mb'], dtype=np.float64)
+        poly_error = np.zeros(len(predicted))
+        np.divide(np.abs(predicted - actual) * 100, predicted, out=poly_error, where=predicted > 0)
+        accuracy_score = 100 - poly_error
+
+        bounds = sorted(self.rules.complexity.items(), key=lambda item: item[1])
+        labels = np.array([label for label, _ in bounds] + ["Very High"], dtype=object)
+        actual_complexity = labels[np.searchsorted([bound for _, bound in bounds], memory, side='left')]
+        actual_complexity[np.isnan(memory)] = None  # not measured
+
+        budget = self.rules.evaluate(dict(columns, poly_error=poly_error, accuracy_score=accuracy_score),
+                                     categories, platform)
+        return {
+            'poly_error': poly_error,
+            'accuracy_score': accuracy_score,
+            'actual_complexity': actual_complexity,
+            'memory_mb': memory,
+            'passed': budget['passed'],
+            'violations': budget['violations'],
         }
     
     def _classify_complexity(self, memory_mb):
-        if memory_mb <= 1:
-            return "Low"
-        elif memory_mb <= 5:
-            return "Medium"
-        elif memory_mb <= 20:
-            return "High"
-        else:
-            return "Very High"
\ No newline at end of file
+        return self.rules.classify(memory_mb)
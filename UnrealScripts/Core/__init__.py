@@ -1,4 +1,9 @@
+from .BudgetRules import BudgetRule, RuleSet
+from .LodPolicy import LodPolicy
+from .MemoryEstimator import MemoryEstimator, VertexFormat
+from .NaniteAdvisor import NaniteAdvisor
 from .PerformanceMeasurer import PerformanceMeasurer
+from .PerformancePredictor import PerformancePredictor
 from .ValidationEngine import ValidationEngine
 
-__all__ = ['PerformanceMeasurer', 'ValidationEngine']
+__all__ = ['BudgetRule', 'LodPolicy', 'MemoryEstimator', 'NaniteAdvisor', 'PerformanceMeasurer', 'PerformancePredictor', 'RuleSet', 'ValidationEngine', 'VertexFormat']
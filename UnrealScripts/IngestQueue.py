@@ -0,0 +1,131 @@
+import json
+import os
+import sys
+import tempfile
+import time
+
+import unreal #type:ignore
+
+scripts_path = os.path.dirname(os.path.abspath(__file__))
+if scripts_path not in sys.path:
+    sys.path.insert(0, scripts_path)
+
+import BatchImporter #type:ignore
+import tracing #type:ignore
+
+# Editor side of ExporterUI/ingest_daemon.py; start once per session: import IngestQueue; IngestQueue.start()
+QUEUE_DIR = os.path.join(tempfile.gettempdir(), "3dsMaxPipeline", "ingest")
+BATCH_SUFFIX = '.batch.json'
+DONE_SUFFIX = '.done.json'
+POLL_INTERVAL = 0.5
+KEEP_DONE_SECONDS = 24 * 3600
+
+
+def pending_batches(queue_dir=QUEUE_DIR):
+    if not os.path.isdir(queue_dir):
+        return []
+    names = set(os.listdir(queue_dir))
+    return sorted(os.path.join(queue_dir, name) for name in names
+                  if name.endswith(BATCH_SUFFIX) and name[:-len(BATCH_SUFFIX)] + DONE_SUFFIX not in names)
+
+
+def prune_completed(queue_dir=QUEUE_DIR, keep_seconds=KEEP_DONE_SECONDS):
+    # Deletes batch/done pairs answered more than keep_seconds ago, batch file first.
+    if not os.path.isdir(queue_dir):
+        return 0
+    pruned = 0
+    cutoff = time.time() - keep_seconds
+    for name in os.listdir(queue_dir):
+        if not name.endswith(DONE_SUFFIX):
+            continue
+        done_path = os.path.join(queue_dir, name)
+        try:
+            if os.path.getmtime(done_path) > cutoff:
+                continue
+            batch_path = done_path[:-len(DONE_SUFFIX)] + BATCH_SUFFIX
+            if os.path.exists(batch_path):
+                os.remove(batch_path)
+            os.remove(done_path)
+            pruned += 1
+        except OSError:
+            continue
+    return pruned
+
+
+def process_batch(batch_path, destination=BatchImporter.DESTINATION):
+    with open(batch_path, 'r') as f:
+        batch = json.load(f)
+    started = time.time()
+    base = batch_path[:-len(BATCH_SUFFIX)]
+    try:
+        # Reports go to each export folder's Batch_Import_Report.html, one per folder
+        # however many batches feed it.
+        results = BatchImporter.import_batch([a['fbx'] for a in batch['assets']], destination, open_report=False)
+    finally:
+        tracing.flush()
+    done = {'batch': batch['batch'], 'submitted': batch.get('submitted'), 'started': started,
+            'finished': time.time(), 'results': results}
+    with open(base + '.tmp', 'w') as f:
+        json.dump(done, f)
+    os.replace(base + '.tmp', base + DONE_SUFFIX)
+    return done
+
+
+def process_pending(queue_dir=QUEUE_DIR, destination=BatchImporter.DESTINATION):
+    processed = []
+    prune_completed(queue_dir)
+    for batch_path in pending_batches(queue_dir):
+        try:
+            processed.append(process_batch(batch_path, destination))
+        except Exception as e:
+            unreal.log_error(f"PIPELINE INGEST: {os.path.basename(batch_path)} failed: {e}")
+            base = batch_path[:-len(BATCH_SUFFIX)]
+            with open(base + DONE_SUFFIX, 'w') as f:
+                json.dump({'batch': os.path.basename(base), 'finished': time.time(), 'error': str(e), 'results': []}, f)
+    return processed
+
+
+class IngestQueue:
+    def __init__(self, queue_dir=QUEUE_DIR, destination=BatchImporter.DESTINATION, interval=POLL_INTERVAL):
+        self.queue_dir = queue_dir
+        self.destination = destination
+        self.interval = interval
+        self.elapsed = 0.0
+        self.handle = None
+
+    def tick(self, delta_seconds):
+        self.elapsed += delta_seconds
+        if self.elapsed < self.interval:
+            return
+        self.elapsed = 0.0
+        process_pending(self.queue_dir, self.destination)
+
+    def start(self):
+        if self.handle is None:
+            self.handle = unreal.register_slate_post_tick_callback(self.tick)
+            unreal.log(f"PIPELINE INGEST: watching {self.queue_dir}")
+
+    def stop(self):
+        if self.handle is not None:
+            unreal.unregister_slate_post_tick_callback(self.handle)
+            self.handle = None
+
+
+_queue = None
+
+
+def start(queue_dir=QUEUE_DIR, destination=BatchImporter.DESTINATION):
+    global _queue
+    if _queue is None:
+        _queue = IngestQueue(queue_dir, destination)
+    _queue.start()
+    return _queue
+
+
+def stop():
+    if _queue is not None:
+        _queue.stop()
+
+
+if __name__ == '__main__':
+    start(sys.argv[1] if len(sys.argv) > 1 else QUEUE_DIR)
@@ -0,0 +1,71 @@
+import json
+import math
+import os
+
+import unreal #type:ignore
+
+# Places the copies listed in instancing.json as StaticMeshActors sharing one imported mesh.
+INSTANCING_MAP = "instancing.json"
+OUTLINER_FOLDER = "PipelineInstances"
+
+
+def load_map(folder):
+    path = os.path.join(folder, INSTANCING_MAP)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def max_to_unreal(transform, unit_scale=1.0):
+    # Max node transform (rows: X, Y, Z axes, translation; right-handed) to Unreal's
+    # left-handed frame, flipping Y the way the FBX importer does: M' = S M S with
+    # S = diag(1, -1, 1). Returns location, unit X and Z axes and per-axis scale.
+    rows = [transform[i:i + 3] for i in range(0, 12, 3)]
+    flip = (1, -1, 1)
+    axes = [[flip[i] * flip[j] * rows[i][j] for j in range(3)] for i in range(3)]
+    location = [rows[3][j] * flip[j] * unit_scale for j in range(3)]
+    scale = [math.sqrt(sum(c * c for c in axis)) or 1.0 for axis in axes]
+    x, y, z = [[c / s for c in axis] for axis, s in zip(axes, scale)]
+    determinant = (x[0] * (y[1] * z[2] - y[2] * z[1]) - x[1] * (y[0] * z[2] - y[2] * z[0])
+                   + x[2] * (y[0] * z[1] - y[1] * z[0]))
+    if determinant < 0:
+        # Mirrored copy: a rotation plus a negative X scale.
+        x = [-c for c in x]
+        scale[0] = -scale[0]
+    return location, x, z, scale
+
+
+def make_transform(transform, unit_scale=1.0):
+    location, x_axis, z_axis, scale = max_to_unreal(transform, unit_scale)
+    rotation = unreal.MathLibrary.make_rot_from_xz(unreal.Vector(*x_axis), unreal.Vector(*z_axis))
+    return unreal.Transform(unreal.Vector(*location), rotation, unreal.Vector(*scale))
+
+
+def place_instances(instancing, meshes, folder=OUTLINER_FOLDER):
+    # meshes maps the FBX file name of each instanced mesh to its imported StaticMesh.
+    # Returns (placed, updated) actor counts.
+    actors = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+    existing = {}
+    for actor in actors.get_all_level_actors():
+        if isinstance(actor, unreal.StaticMeshActor) and str(actor.get_folder_path()).startswith(folder):
+            existing[actor.get_actor_label()] = actor
+    unit_scale = instancing.get('unit_scale', 1.0)
+    placed = updated = 0
+    for file_name, group in instancing.get('meshes', {}).items():
+        mesh = meshes.get(file_name)
+        if mesh is None:
+            continue
+        for instance in group['instances']:
+            transform = make_transform(instance['transform'], unit_scale)
+            actor = existing.get(instance['name'])
+            if actor is None:
+                actor = actors.spawn_actor_from_object(mesh, transform.translation)
+                actor.set_actor_label(instance['name'])
+                actor.set_folder_path(f"{folder}/{group['mesh']}")
+                placed += 1
+            else:
+                actor.static_mesh_component.set_static_mesh(mesh)
+                updated += 1
+            actor.set_actor_transform(transform, False, True)
+    return placed, updated
@@ -7,8 +7,13 @@ core_path = os.path.join(os.path.dirname(__file__), 'Core')
 if core_path not in sys.path:
     sys.path.insert(0, core_path)
 
+exporter_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'ExporterUI')
+if exporter_path not in sys.path:
+    sys.path.insert(0, exporter_path)
+
 import PerformanceMeasurer #type:ignore
 import ValidationEngine #type:ignore
+import tracing #type:ignore
 
 def import_asset_with_metadata(fbx_path):    
     print(f"Looking for: {fbx_path}")
@@ -32,7 +37,8 @@ def import_asset_with_metadata(fbx_path):
     import_task.set_editor_property('save', True)
     import_task.set_editor_property('replace_existing', True)
 
-    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([import_task])
+    with tracing.span("import_asset_tasks", 'unreal', asset=metadata['asset']):
+        unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([import_task])
 
     print("ASSET IMPORTED")
     print("==============")
@@ -49,9 +55,10 @@ def import_asset_with_metadata(fbx_path):
     asset_name = os.path.splitext(os.path.basename(fbx_path))[0]
     asset_path = f"/Game/ImportedAssets/{asset_name}"
     
-    actual_stats = measurer.measure_asset(asset_path)
+    with tracing.span("validate", 'unreal', asset=asset_name):
+        actual_stats = measurer.measure_asset(asset_path)
+        results = validator.validate_predictions(metadata, actual_stats) if actual_stats else None
     if actual_stats:
-        results = validator.validate_predictions(metadata, actual_stats)
         
         print("\nVALIDATION RESULTS")
         print("==================")
@@ -0,0 +1,52 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ExporterUI"))
+
+from decimator import DEFAULT_LOD_LEVELS, ProgressiveMesh, geometric_error  # noqa: E402
+from synthetic import grid_mesh, sphere_mesh  # noqa: E402
+
+MESHES = {'grid': grid_mesh, 'sphere': sphere_mesh}
+
+
+def bench(name, triangles, percents=DEFAULT_LOD_LEVELS, compare_rebuild=False):
+    positions, faces = MESHES[name](triangles)
+    start = time.perf_counter()
+    mesh = ProgressiveMesh.build(positions, faces, min(percents) / 100.0)
+    simplify_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    lods = mesh.levels(percents)
+    extract_seconds = time.perf_counter() - start
+
+    print(f"{name}: {len(faces)} tris, {mesh.steps} collapses in {simplify_seconds:.2f}s "
+          f"({(len(faces) - mesh.faces_after[-1]) / simplify_seconds:,.0f} tris/s), "
+          f"{len(percents)} levels extracted in {extract_seconds * 1000:.1f}ms")
+    for percent, lod in zip(percents, lods):
+        error = geometric_error(positions, lod)
+        print(f"   LOD {percent:>3}%: {len(lod.faces):>8} tris  mean {error['mean']:.5f}  "
+              f"rms {error['rms']:.5f}  max {error['max']:.5f} ({error['relative_max']:.3%} of bounds)")
+
+    if compare_rebuild:
+        # What generateLOD does today: one simplification from the full mesh per level.
+        start = time.perf_counter()
+        for percent in percents:
+            ProgressiveMesh.build(positions, faces, percent / 100.0)
+        rebuild_seconds = time.perf_counter() - start
+        print(f"   per-level rebuild: {rebuild_seconds:.2f}s vs one progressive pass "
+              f"{simplify_seconds + extract_seconds:.2f}s")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Decimator throughput and geometric error on synthetic meshes")
+    parser.add_argument('--triangles', type=int, nargs='+', default=[20000, 100000])
+    parser.add_argument('--meshes', nargs='+', default=sorted(MESHES), choices=sorted(MESHES))
+    parser.add_argument('--levels', default="50,25,12")
+    parser.add_argument('--compare-rebuild', action='store_true', help="also time one simplification per level")
+    args = parser.parse_args()
+
+    percents = tuple(int(p) for p in args.levels.split(','))
+    for triangles in args.triangles:
+        for name in args.meshes:
+            bench(name, triangles, percents, args.compare_rebuild)
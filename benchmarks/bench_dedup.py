@@ -0,0 +1,115 @@
+import argparse
+import contextlib
+import io
+import math
+import random
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+for path in (HERE, HERE / "stubs", ROOT / "ExporterUI", ROOT / "UnrealScripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import unreal  # noqa: E402  (the stub)
+import BatchImporter  # noqa: E402
+from batch_engine import BatchExportEngine, DONE  # noqa: E402
+from bench_import import EDITOR_COSTS  # noqa: E402
+from fake_monitor import FakeMonitor, FakeScene  # noqa: E402
+from fake_pipeline import FakeExporter  # noqa: E402
+from instancing import dedup_summary  # noqa: E402
+from max_interface import MaxScriptInterface  # noqa: E402
+from scene_cache import SceneCache  # noqa: E402
+from synthetic import grid_mesh, sphere_mesh  # noqa: E402
+
+# Rough editor prices for placing actors, on top of bench_import's table (seconds).
+PLACEMENT_COSTS = {'spawn_actor': 0.002, 'set_actor_transform': 0.0002, 'save_current_level': 0.5}
+
+
+def kitbash_scene(props, copies, uniques, triangles):
+    # `props` meshes with `copies` copies each, scattered, rotated about Z and sometimes
+    # mirrored, plus `uniques` one-off meshes.
+    random.seed(5)
+    meshes, scene = {}, []
+    for p in range(props + uniques):
+        builder = sphere_mesh if p % 2 else grid_mesh
+        positions, faces = builder(triangles + p * 10)
+        for c in range(copies if p < props else 1):
+            angle = random.uniform(0, 2 * math.pi)
+            cos, sin = math.cos(angle), math.sin(angle)
+            mirror = -1 if c % 7 == 6 else 1
+            transform = [cos * mirror, sin * mirror, 0, -sin, cos, 0, 0, 0, 1,
+                         random.uniform(-5000, 5000), random.uniform(-5000, 5000), 0]
+            name = f"{'Bolt' if p < props else 'Unique'}_{p:02d}_{c:03d}"
+            meshes[name] = (positions, faces)
+            scene.append((name, len(faces), len(positions), f"hash{p}", transform))
+    return meshes, scene
+
+
+def export(interface, names, out, dedup):
+    engine = BatchExportEngine(interface, SceneCache(interface))
+    start = time.perf_counter()
+    engine.add_objects(names, out, dedup=dedup)
+    summary = engine.run()
+    seconds = time.perf_counter() - start
+    if summary.get(DONE) != len(engine.jobs):
+        raise RuntimeError(f"export finished with {summary}")
+    disk = sum(p.stat().st_size for p in Path(out).iterdir())
+    return engine, seconds, disk
+
+
+def import_folder(out):
+    unreal.reset()
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = BatchImporter.import_batch([str(p) for p in sorted(Path(out).glob("*.fbx"))], open_report=False)
+    costs = dict(EDITOR_COSTS, **PLACEMENT_COSTS)
+    return results, sum(costs.get(k, 0) * v for k, v in unreal.calls.items()), dict(unreal.calls)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export/import cost of a kitbashed scene with and without dedup")
+    parser.add_argument('--props', type=int, default=10, help="distinct meshes that are copied")
+    parser.add_argument('--copies', type=int, default=30)
+    parser.add_argument('--uniques', type=int, default=20, help="meshes that appear once")
+    parser.add_argument('--triangles', type=int, default=5000)
+    args = parser.parse_args()
+
+    meshes, objects = kitbash_scene(args.props, args.copies, args.uniques, args.triangles)
+    with tempfile.TemporaryDirectory() as tmp, FakeMonitor(Path(tmp) / "channel") as monitor:
+        os.environ['PIPELINE_CATALOG'] = str(Path(tmp) / "catalog.db")  # not the user's catalog
+        scene = FakeScene()
+        for name, tris, verts, geometry_hash, transform in objects:
+            scene.add(name, tris, verts, geometry_hash=geometry_hash, transform=transform)
+        scene.install(monitor)
+        FakeExporter(meshes).install(monitor)
+        interface = MaxScriptInterface(Path(tmp) / "channel")
+        names = [o[0] for o in objects]
+
+        _, plain_seconds, plain_disk = export(interface, names, Path(tmp) / "plain", False)
+        engine, dedup_seconds, dedup_disk = export(interface, names, Path(tmp) / "dedup", True)
+        interface.close()
+        summary = dedup_summary(engine.instancing)
+        print(f"{summary['objects']} objects -> {summary['unique_meshes']} unique meshes "
+              f"(x{summary['duplication_ratio']}, {summary['instanced_groups']} instanced)")
+        print(f"export: {plain_seconds:.2f}s, {plain_disk / 2 ** 20:.1f} MB without dedup; "
+              f"{dedup_seconds:.2f}s, {dedup_disk / 2 ** 20:.1f} MB with dedup")
+
+        _, plain_cost, plain_calls = import_folder(Path(tmp) / "plain")
+        results, dedup_cost, dedup_calls = import_folder(Path(tmp) / "dedup")
+        placed = {a.get_actor_label(): a for a in unreal.actors}
+        instanced = sum(len(g.members) for g in engine.instancing if len(g.members) > 1)
+        if len(placed) != instanced:
+            raise SystemExit(f"placed {len(placed)} actors for {instanced} instances")
+        for name, _, _, _, transform in objects:
+            actor = placed.get(name)
+            if actor is not None:
+                location = actor.transform.translation
+                assert (round(location.x, 3), round(location.y, 3)) == (round(transform[9], 3), round(-transform[10], 3))
+        print(f"import: {plain_calls['imported_assets']} meshes, {plain_calls['import_lod']} LODs, "
+              f"~{plain_cost:.0f}s editor time without dedup; {dedup_calls['imported_assets']} meshes, "
+              f"{dedup_calls['import_lod']} LODs, {dedup_calls['spawn_actor']} actors placed, "
+              f"~{dedup_cost:.0f}s with dedup")
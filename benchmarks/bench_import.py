@@ -0,0 +1,85 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import webbrowser
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent / "stubs"))
+sys.path.insert(0, str(ROOT / "ExporterUI"))
+
+import unreal  # noqa: E402  (the stub)
+from unreal_importer import UnrealImporter  # noqa: E402
+
+# Rough editor costs in seconds, to turn call counts into an estimate of editor time.
+# Measure your own project and pass --costs to replace them.
+EDITOR_COSTS = {
+    'import_asset_tasks': 0.3,
+    'imported_assets': 0.05,
+    'import_lod': 0.2,
+    'save_calls': 0.1,
+    'saved_assets': 0.01,
+    'browser_tabs': 0.5,
+}
+
+
+def make_assets(folder, count, lods=3):
+    paths = []
+    for i in range(count):
+        name = f"Prop_{i:05d}"
+        polygons = 1000 + (i * 37) % 20000
+        fbx = folder / f"{name}.fbx"
+        fbx.write_bytes(b"Kaydara FBX Binary  \x00")
+        (folder / f"{name}.json").write_text(json.dumps({
+            'asset': name, 'polygons': polygons, 'vertices': polygons // 2, 'complexity': "Low",
+            'material': "None", 'texture_count': 0, 'estimated_objects': 1, 'enable_nanite': i % 10 == 0,
+        }))
+        for lod in range(1, lods + 1):
+            (folder / f"{name}_LOD{lod}.fbx").write_bytes(b"Kaydara FBX Binary  \x00")
+        paths.append(str(fbx))
+    return paths
+
+
+def run_script(source):
+    exec(compile(source, "<import script>", "exec"), {'__name__': '__main__'})
+
+
+def measure(label, body, costs):
+    unreal.reset()
+    tabs = []
+    original_open = webbrowser.open
+    webbrowser.open = lambda url, *args, **kwargs: tabs.append(url) or True
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            body()
+        seconds = time.perf_counter() - start
+    finally:
+        webbrowser.open = original_open
+    counts = dict(unreal.calls, browser_tabs=len(tabs))
+    editor = sum(costs.get(k, 0) * v for k, v in counts.items())
+    print(f"{label:<10} python {seconds:6.2f}s  est. editor {editor:9.1f}s  "
+          + "  ".join(f"{k}={counts.get(k, 0)}" for k in costs))
+    return editor
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Per-asset vs batched Unreal import against the stub unreal module")
+    parser.add_argument('--assets', type=int, default=2000)
+    parser.add_argument('--lods', type=int, default=3)
+    parser.add_argument('--costs', help="JSON object overriding EDITOR_COSTS")
+    args = parser.parse_args()
+    costs = dict(EDITOR_COSTS, **json.loads(args.costs)) if args.costs else EDITOR_COSTS
+
+    importer = UnrealImporter()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['PIPELINE_CATALOG'] = str(Path(tmp) / "catalog.db")  # not the user's catalog
+        paths = make_assets(Path(tmp), args.assets, args.lods)
+        per_asset = measure("per-asset", lambda: [run_script(importer.generate_import_script(p)) for p in paths], costs)
+        batch = measure("batch", lambda: run_script(importer.generate_batch_import_script(paths)), costs)
+    print(f"estimated editor time saved: {per_asset - batch:.0f}s ({per_asset / max(batch, 1e-9):.1f}x)")
@@ -0,0 +1,79 @@
+import argparse
+import contextlib
+import io
+import json
+import random
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+for path in (HERE, HERE / "stubs", ROOT / "ExporterUI", ROOT / "UnrealScripts"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import unreal  # noqa: E402  (the stub)
+import IngestQueue  # noqa: E402
+from ingest_daemon import IngestDaemon, QueueTarget  # noqa: E402
+from synthetic import grid_mesh, write_fbx  # noqa: E402
+
+LOD_LEVELS = (50, 25, 12)
+
+
+def export_asset(folder, name, positions, faces):
+    # Same write order as runAutomatedExport: base FBX, LODs, then the manifest.
+    write_fbx(folder / f"{name}.fbx", positions, faces, name)
+    for i, percent in enumerate(LOD_LEVELS, start=1):
+        write_fbx(folder / f"{name}_LOD{i}.fbx", positions, faces[:len(faces) * percent // 100], name)
+    (folder / f"{name}.json").write_text(json.dumps({
+        'asset': name, 'polygons': len(faces), 'vertices': len(positions), 'complexity': "Low",
+        'lod_count': len(LOD_LEVELS), 'enable_nanite': False, 'texture_issues': "",
+    }))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Export-to-import latency through the ingest daemon and the stub editor")
+    parser.add_argument('--assets', type=int, default=40)
+    parser.add_argument('--triangles', type=int, default=20000)
+    parser.add_argument('--gap', type=float, default=0.1, help="mean seconds between exports (bursts are random)")
+    parser.add_argument('--settle', type=float, default=0.5)
+    parser.add_argument('--batch-window', type=float, default=1.0)
+    args = parser.parse_args()
+
+    positions, faces = grid_mesh(args.triangles)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['PIPELINE_CATALOG'] = str(Path(tmp) / "catalog.db")  # not the user's catalog
+        exports, queue = Path(tmp) / "exports", Path(tmp) / "queue"
+        exports.mkdir()
+        daemon = IngestDaemon([exports], QueueTarget(queue), args.settle, args.batch_window,
+                              on_event=lambda kind, message: print(f"[{kind.upper():>9}] {message}", flush=True))
+        daemon.baseline()
+        watcher = threading.Thread(target=daemon.run, daemon=True)
+        watcher.start()
+        editor = IngestQueue.start(str(queue))
+        random.seed(1)
+
+        def artist():
+            for i in range(args.assets):
+                export_asset(exports, f"Prop_{i:03d}", positions, faces)
+                time.sleep(random.expovariate(1.0 / args.gap))
+
+        writer = threading.Thread(target=artist)
+        writer.start()
+        deadline = time.time() + 60
+        while time.time() < deadline and len(daemon.latencies) < args.assets:
+            with contextlib.redirect_stdout(io.StringIO()):
+                unreal.tick(0.1)
+            time.sleep(0.1)
+        writer.join()
+        daemon.stop()
+        editor.stop()
+
+    summary = daemon.latency_summary()
+    print(f"{summary['assets']}/{args.assets} assets imported; export->import p50 {summary['p50_s']}s, "
+          f"p90 {summary['p90_s']}s, max {summary['max_s']}s")
+    raise SystemExit(0 if summary['assets'] == args.assets else 1)
@@ -0,0 +1,75 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+for path in (HERE, ROOT / "ExporterUI"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from pipeline_io import import_core  # noqa: E402
+
+# (name, LOD0 triangles, bounding sphere radius in cm)
+CASES = [
+    ("Bolt", 500, 3),
+    ("Cup", 1200, 6),
+    ("Crate", 2000, 60),
+    ("Chair", 8000, 60),
+    ("Barrel", 20000, 50),
+    ("Car", 120000, 250),
+    ("Statue", 500000, 150),
+    ("Building", 2000000, 1500),
+]
+FIXED = (50, 25, 12)
+SCREEN_SIZES = (0.5, 0.2, 0.05)  # triangles drawn when the asset covers this much of the screen
+
+
+def fixed_plan(policy, triangles, radius, platform):
+    # The fixed chain, switched where each LOD's deviation reaches the same pixel error.
+    pixel_error = policy.pixel_error(platform)
+    scale = policy.deviation_scale(triangles, radius)
+    counts = [int(triangles * p / 100) for p in FIXED]
+    sizes = [policy.screen_size(radius, scale * (triangles / c - 1), pixel_error) for c in counts]
+    return {'triangles': [triangles] + counts, 'screen_sizes': [1.0] + sizes}
+
+
+def drawn(plan, screen_size):
+    # Triangles of the LOD in use at screen_size: the last one switched in above it.
+    lod = max(i for i, size in enumerate(plan['screen_sizes']) if i == 0 or size >= screen_size)
+    return plan['triangles'][lod]
+
+
+def gpu_mb(estimator, plan):
+    return estimator.estimate([(t, t // 2) for t in plan['triangles']])['gpu_mb']
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Screen-size LOD policy vs fixed 50/25/12 percent LODs")
+    parser.add_argument('--platform', default=None, help="e.g. Mobile allows more pixel error")
+    args = parser.parse_args()
+
+    policy = import_core('LodPolicy').LodPolicy()
+    estimator = import_core('MemoryEstimator').MemoryEstimator()
+    start = time.perf_counter()
+    plans = [policy.plan(triangles, radius, args.platform) for _, triangles, radius in CASES]
+    seconds = time.perf_counter() - start
+
+    totals = {'policy': [0, 0.0], 'fixed': [0, 0.0]}
+    for (name, triangles, radius), plan in zip(CASES, plans):
+        fixed = fixed_plan(policy, triangles, radius, args.platform)
+        print(f"{name:9} {triangles:>8} tris r={radius:>5} cm: {plan['lod_count']} LODs "
+              f"{plan['reductions']} at {plan['screen_sizes'][1:]}")
+        print(f"{'':9} fixed 50/25/12 would switch at {[round(s, 4) for s in fixed['screen_sizes'][1:]]}")
+        for label, chain in (('policy', plan), ('fixed', fixed)):
+            mb = gpu_mb(estimator, chain)
+            totals[label][0] += sum(chain['triangles'][1:])
+            totals[label][1] += mb
+            print(f"{'':9} {label:6} drawn at " + ", ".join(f"{s}: {drawn(chain, s)}" for s in SCREEN_SIZES)
+                  + f"; LOD triangles {sum(chain['triangles'][1:])}, {mb:.2f} MB")
+        for reason in plan['reasons']:
+            print(f"{'':9} {reason}")
+    for label, (tris, mb) in totals.items():
+        print(f"{label:6}: {tris} LOD triangles stored, {mb:.2f} MB for all assets")
+    print(f"planned {len(CASES)} assets in {seconds * 1e6 / len(CASES):.1f} us each")
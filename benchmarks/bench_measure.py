@@ -0,0 +1,56 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent / "stubs"))
+sys.path.insert(0, str(ROOT / "UnrealScripts" / "Core"))
+
+import unreal  # noqa: E402  (the stub)
+from PerformanceMeasurer import PerformanceMeasurer  # noqa: E402
+
+FOLDER = "/Game/ImportedAssets"
+
+# Rough editor costs in seconds: a full static mesh load against a registry lookup.
+EDITOR_COSTS = {'load_asset': 0.05, 'find_asset_data': 0.00005, 'get_assets_by_path': 0.01, 'collect_garbage': 0.2}
+
+
+def populate(count, untagged):
+    unreal.reset()
+    for i in range(count):
+        path = f"{FOLDER}/Prop_{i:05d}"
+        triangles = 1000 + (i * 37) % 20000
+        mesh = unreal.StaticMesh(path, triangles, triangles // 2, has_tags=(i % 100) >= untagged * 100)
+        unreal.assets[path] = mesh
+    return sorted(unreal.assets)
+
+
+def measure(label, body):
+    unreal.loaded.clear()
+    unreal.peak_loaded = 0
+    unreal.calls.clear()
+    start = time.perf_counter()
+    results = body()
+    seconds = time.perf_counter() - start
+    editor = sum(EDITOR_COSTS.get(k, 0) * v for k, v in unreal.calls.items())
+    print(f"{label:<18} {len(results):>6} meshes  python {seconds:5.2f}s  est. editor {editor:8.1f}s  "
+          f"loads={unreal.calls['load_asset']:<6} peak resident={unreal.peak_loaded}")
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load-based vs asset-registry measurement against the stub unreal module")
+    parser.add_argument('--assets', type=int, default=20000)
+    parser.add_argument('--untagged', type=float, default=0.05, help="fraction of meshes saved without registry tags")
+    args = parser.parse_args()
+
+    paths = populate(args.assets, args.untagged)
+    loading = PerformanceMeasurer(use_registry=False)
+    registry = PerformanceMeasurer()
+    legacy = measure("load every asset", lambda: {p: loading.measure_asset(p) for p in paths})
+    tagged = measure("registry per asset", lambda: {p: registry.measure_asset(p) for p in paths})
+    folder = measure("registry folder", lambda: dict(registry.measure_folder(FOLDER)))
+    mismatched = [p for p in paths if (legacy[p]['triangles'], legacy[p]['vertices'])
+                  != (folder[p]['triangles'], folder[p]['vertices'])]
+    print(f"counts match: {not mismatched}")
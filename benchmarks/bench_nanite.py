@@ -0,0 +1,56 @@
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+for path in (HERE, ROOT / "ExporterUI"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from fbx_reader import advise_nanite  # noqa: E402
+from synthetic import grid_mesh, sphere_mesh, write_fbx  # noqa: E402
+
+# (name, builder, triangles, size in cm, manifest extras)
+CASES = [
+    ("Crate", sphere_mesh, 800, 100, {}),
+    ("Statue", sphere_mesh, 250000, 200, {}),
+    ("Rock", sphere_mesh, 60000, 40, {}),
+    ("Terrain", grid_mesh, 60000, 10000, {}),
+    ("Foliage", grid_mesh, 40000, 150, {'masked_slots': 1}),
+    ("Window", grid_mesh, 20000, 200, {'translucent_slots': 1}),
+]
+
+
+def write_case(folder, name, builder, triangles, size, extras):
+    positions, faces = builder(triangles)
+    positions = positions * size
+    fbx_path = Path(folder) / f"{name}.fbx"
+    write_fbx(fbx_path, positions, faces, name=name)
+    with open(fbx_path.with_suffix('.json'), 'w') as f:
+        json.dump(dict({'name': name, 'predicted_tris': len(faces), 'predicted_verts': len(positions)}, **extras), f)
+    return fbx_path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Nanite vs LOD decisions for a set of synthetic assets")
+    parser.add_argument('--platform', default=None, help="e.g. Mobile keeps LODs next to Nanite")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [write_case(tmp, *case) for case in CASES]
+        start = time.perf_counter()
+        decisions = [advise_nanite(p, platform=args.platform) for p in paths]
+        seconds = time.perf_counter() - start
+        for path, decision in zip(paths, decisions):
+            m = decision['metrics']
+            print(f"{path.stem:10} {m['triangles']:>7} tris  {m['triangles_per_m2'] or 0:>9.0f}/m2  "
+                  f"nanite {m['nanite_mb']:.2f} MB vs lods {m['lod_chain_mb']:.2f} MB -> {decision['mode']}")
+            for reason in decision['reasons']:
+                print(f"    {reason}")
+            stored = json.loads(path.with_suffix('.json').read_text())
+            assert stored['nanite_decision']['mode'] == decision['mode']
+        print(f"decided {len(paths)} assets in {seconds * 1000:.0f} ms")
@@ -0,0 +1,78 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+for path in (HERE, ROOT / "UnrealScripts" / "Core"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from MemoryEstimator import MemoryEstimator  # noqa: E402
+from PerformancePredictor import PerformancePredictor  # noqa: E402
+
+
+def history(count, seed):
+    # Simulated (scene counts, measured) pairs. Render vertices split along UV seams and
+    # hard edges (more with more material slots), some slots are unused, and the LOD
+    # chain keeps more vertices than its triangle share, so the analytic estimates are off
+    # in ways a model can learn.
+    rng = np.random.default_rng(seed)
+    polygons = np.exp(rng.uniform(np.log(500), np.log(500000), count)).astype(int)
+    vertices = (polygons * rng.uniform(0.5, 0.6, count)).astype(int)
+    slots = rng.integers(1, 7, count)
+    lods = rng.random(count) < 0.8
+    split = (1.3 + 0.15 * slots) * np.exp(rng.normal(0, 0.1, count))
+    columns = {'polygons': polygons, 'vertices': vertices, 'material_slots': slots,
+               'lods': lods, 'nanite': np.zeros(count, dtype=bool)}
+    triangles = polygons * np.exp(rng.normal(0, 0.005, count))
+    gpu_vertices = vertices * split
+    sections = np.maximum(1, slots - rng.binomial(slots - 1, 0.2))
+    estimator = MemoryEstimator()
+    memory = []
+    for t, v, l in zip(triangles, gpu_vertices, lods):
+        chain = [(t * p, v * p ** 0.8) for p in ((1, 0.5, 0.25, 0.12) if l else (1,))]
+        memory.append(estimator.estimate([(int(a), int(b)) for a, b in chain])['gpu_mb'])
+    measured = {'triangles': triangles, 'gpu_vertices': gpu_vertices, 'memory_mb': np.asarray(memory),
+                'draw_sections': sections}
+    return columns, measured
+
+
+def take(columns, start, stop):
+    return {k: v[start:stop] for k, v in columns.items()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Accuracy of the calibrated performance predictor on simulated history")
+    parser.add_argument('--train', default="25,100,1000,10000", help="comma separated training set sizes")
+    parser.add_argument('--test', type=int, default=2000)
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.train.split(',')]
+    columns, measured = history(max(sizes), seed=1)
+    test_columns, test_measured = history(args.test, seed=2)
+    predictor = PerformancePredictor()
+    seen = 0
+    print(f"{'samples':>8}  " + "  ".join(f"{t:>24}" for t in ('triangles', 'gpu_vertices', 'memory_mb', 'draw_sections')))
+    print(f"{'':>8}  " + "  ".join(f"{'est% / model% / cover':>24}" for _ in range(4)))
+    observe_seconds = 0.0
+    for size in sizes:
+        start = time.perf_counter()
+        predictor.observe(take(columns, seen, size), take(measured, seen, size))  # only the new samples
+        observe_seconds += time.perf_counter() - start
+        seen = size
+        report = predictor.errors(test_columns, test_measured)
+        cells = []
+        for target, r in report.items():
+            coverage = '-' if r['coverage'] is None else f"{r['coverage']:.2f}"
+            cells.append(f"{r['estimate_mape']:>8.1f} / {r['model_mape']:>5.1f} / {coverage:>4}")
+        print(f"{size:>8}  " + "  ".join(f"{c:>24}" for c in cells))
+
+    start = time.perf_counter()
+    predictor.predict_batch(test_columns)
+    predict_seconds = time.perf_counter() - start
+    print(f"training: {seen / observe_seconds:,.0f} samples/s; prediction: {args.test / predict_seconds:,.0f} assets/s; "
+          f"model file {len(str(predictor.to_dict()))} bytes")
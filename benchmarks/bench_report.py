@@ -0,0 +1,81 @@
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+for path in (HERE, ROOT / "ExporterUI"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from asset_catalog import AssetCatalog  # noqa: E402
+from batch_report import BatchReport, update_report  # noqa: E402
+
+ISSUES = ["", "", "", "Wall_D.png 4096x4096 is too large. ", "Trim_N.tga 300x200 is NOT Power of Two. ",
+          "Decal.png is missing. "]
+
+
+def write_manifest(folder, i, rng, polygons=None):
+    name = f"Prop_{i:05d}"
+    with open(folder / f"{name}.json", 'w') as f:
+        json.dump({'asset': name, 'polygons': polygons or rng.randint(200, 60000), 'vertices': 0,
+                   'complexity': "Low", 'lod_count': 3, 'texture_issues': rng.choice(ISSUES)}, f)
+
+
+def make_batch(folder, count, seed=0):
+    # Manifests with empty FBX files (the report reads no geometry) and one batch import
+    # report covering every other asset.
+    rng = random.Random(seed)
+    folder.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        (folder / f"Prop_{i:05d}.fbx").touch()
+        write_manifest(folder, i, rng)
+    results = [{'fbx': str(folder / f"Prop_{i:05d}.fbx"), 'status': "PASSED" if rng.random() < 0.95 else "FAILED",
+                'actual_tris': 0, 'accuracy': rng.uniform(85, 100), 'lods': 3} for i in range(0, count, 2)]
+    with open(folder / "Batch_Import_Report.json", 'w') as f:
+        json.dump({'assets': results}, f)
+
+
+def timed(label, *args, **kwargs):
+    start = time.perf_counter()
+    summary = update_report(*args, **kwargs)
+    print(f"  {label:<22} {time.perf_counter() - start:6.2f}s  {summary['written']:>4} pages written, "
+          f"{summary['unchanged']:>4} unchanged")
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Batch report generation: full, incremental and peak memory")
+    parser.add_argument('--sizes', default="3000,30000", help="comma separated asset counts")
+    parser.add_argument('--changed', type=int, default=10, help="manifests re-exported between runs")
+    args = parser.parse_args()
+
+    for count in (int(s) for s in args.sizes.split(',')):
+        with tempfile.TemporaryDirectory() as tmp:
+            folder, db = Path(tmp) / "exports", Path(tmp) / "catalog.db"
+            make_batch(folder, count)
+            report = folder / "Batch_Report.html"
+            print(f"{count} assets (before: {count} HTML files and {count} browser tabs)")
+            summary = timed("full", [str(folder)], report, db)
+            files = sum(1 for _ in (folder / "Batch_Report_pages").rglob("*.html")) + 2
+            print(f"  -> {files} files: index, summary JSON and {len(summary['pages'])} pages")
+            timed("unchanged", [str(folder)], report, db)
+            time.sleep(0.01)  # a new mtime for the re-exported manifests
+            rng = random.Random(1)
+            for i in rng.sample(range(count), args.changed):
+                write_manifest(folder, i, rng)
+            timed(f"{args.changed} changed", [str(folder)], report, db)
+
+            with AssetCatalog(db) as catalog:
+                tracemalloc.start()
+                BatchReport(catalog).write(folder / "Fresh_Report.html", [str(folder)])  # a full write
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            print(f"  peak Python memory while writing: {peak / 2 ** 20:.1f} MB "
+                  f"(catalog {os.path.getsize(db) / 2 ** 20:.1f} MB on disk)")
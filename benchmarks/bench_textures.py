@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import random
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ExporterUI"))
+
+import numpy as np  # noqa: E402
+
+from texture_stage import TextureStage, read_textures, texture_info  # noqa: E402
+
+SIZES = [(512, 512), (1024, 1024), (2048, 2048), (4096, 4096), (1000, 1000), (2048, 1024), (1500, 900)]
+
+
+def chunk(kind, data):
+    return struct.pack('>I', len(data)) + kind + data + b'\0\0\0\0'  # CRC is not checked by the reader
+
+
+def write_png(path, width, height, body):
+    with open(path, 'wb') as f:
+        f.write(b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0))
+                + chunk(b'IDAT', body) + chunk(b'IEND', b''))
+
+
+def write_jpeg(path, width, height, body):
+    app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\0\x01\x01\0\0\x01\0\x01\0\0'
+    dqt = b'\xff\xdb' + struct.pack('>H', 67) + bytes(65)
+    sof = b'\xff\xc0' + struct.pack('>HBHHB', 17, 8, height, width, 3) + bytes(9)
+    sos = b'\xff\xda' + struct.pack('>H', 12) + bytes(10)
+    with open(path, 'wb') as f:
+        f.write(b'\xff\xd8' + app0 + dqt + sof + sos + body + b'\xff\xd9')
+
+
+def write_exr(path, width, height, body):
+    def attribute(name, kind, value):
+        return name + b'\0' + kind + b'\0' + struct.pack('<i', len(value)) + value
+    window = struct.pack('<4i', 0, 0, width - 1, height - 1)
+    header = (b'\x76\x2f\x31\x01' + struct.pack('<I', 2)
+              + attribute(b'channels', b'chlist', b'R\0' + struct.pack('<iBxxxii', 1, 0, 1, 1) + b'\0')
+              + attribute(b'compression', b'compression', b'\x03')
+              + attribute(b'dataWindow', b'box2i', window) + attribute(b'displayWindow', b'box2i', window) + b'\0')
+    with open(path, 'wb') as f:
+        f.write(header + body)
+
+
+def write_tga(path, pixels):
+    height, width = pixels.shape[:2]
+    with open(path, 'wb') as f:
+        f.write(struct.pack('<BBB5xHHHHBB', 0, 0, 2, 0, 0, width, height, 32, 0x28))
+        f.write(np.ascontiguousarray(pixels[..., [2, 1, 0, 3]]).tobytes())
+
+
+WRITERS = {'.png': write_png, '.jpg': write_jpeg, '.exr': write_exr}
+
+
+def make_library(folder, assets, textures_per_asset, texture_pool, file_kb):
+    # Exports sharing a pool of textures, like a kit of props sharing trim sheets.
+    random.seed(7)
+    body = os.urandom(file_kb * 1024)
+    textures = []
+    for i in range(texture_pool):
+        extension = list(WRITERS)[i % len(WRITERS)]
+        width, height = SIZES[i % len(SIZES)]
+        path = folder / "textures" / f"T_{i:04d}{extension}"
+        path.parent.mkdir(exist_ok=True)
+        WRITERS[extension](path, width, height, body)
+        textures.append(str(path))
+    fbx_paths = []
+    for i in range(assets):
+        fbx = folder / f"Prop_{i:04d}.fbx"
+        fbx.write_bytes(b"")
+        fbx.with_suffix('.json').write_text(json.dumps({
+            'asset': fbx.stem, 'polygons': 1000, 'texture_issues': "",
+            'textures': random.sample(textures, textures_per_asset)}))
+        fbx_paths.append(fbx)
+    return fbx_paths, textures
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Header-only texture audit and conditioning cache")
+    parser.add_argument('--assets', type=int, default=500)
+    parser.add_argument('--textures-per-asset', type=int, default=8)
+    parser.add_argument('--pool', type=int, default=1500, help="distinct texture files shared by the assets")
+    parser.add_argument('--file-kb', type=int, default=2048, help="size of every generated texture file")
+    parser.add_argument('--condition', type=int, default=16, help="TGA textures to condition (cold, then cached)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        fbx_paths, textures = make_library(folder, args.assets, args.textures_per_asset, args.pool, args.file_kb)
+        stage = TextureStage()
+
+        _, full_seconds = timed(lambda: [Path(p).read_bytes() for p in textures])
+        _, serial_seconds = timed(lambda: [texture_info(p) for p in textures])
+        _, pool_seconds = timed(lambda: read_textures(textures))
+        results, audit_seconds = timed(lambda: stage.audit_exports(fbx_paths))
+        flagged = sum(1 for r in results if r['issues'])
+        print(f"{len(textures)} textures of {args.file_kb} KB: reading whole files {full_seconds:.2f}s, "
+              f"headers {serial_seconds:.3f}s serial / {pool_seconds:.3f}s in a process pool")
+        print(f"{len(fbx_paths)} assets x {args.textures_per_asset} textures audited in {audit_seconds:.3f}s, "
+              f"{flagged} with issues")
+
+        rng = np.random.default_rng(3)
+        sources = []
+        for i in range(args.condition):
+            width, height = SIZES[4 + i % 3]
+            path = folder / "textures" / f"T_src_{i:02d}.tga"
+            write_tga(path, rng.integers(0, 256, (height, width, 4), dtype=np.uint8))
+            sources.append(path)
+        for i, fbx in enumerate(fbx_paths[:args.condition]):
+            manifest = json.loads(fbx.with_suffix('.json').read_text())
+            manifest['textures'] = [str(sources[i])]
+            fbx.with_suffix('.json').write_text(json.dumps(manifest))
+        conditioning = TextureStage(stage.rules, cache_dir=folder / "cache")
+        cold, cold_seconds = timed(lambda: conditioning.audit_exports(fbx_paths[:args.condition]))
+        warm, warm_seconds = timed(lambda: conditioning.audit_exports(fbx_paths[:args.condition]))
+        outputs = [t['conditioned'] for r in cold for t in r['textures'] if 'conditioned' in t]
+        errors = [o['error'] for o in outputs if 'error' in o]
+        if errors:
+            raise SystemExit(f"conditioning failed: {errors[0]}")
+        for output in outputs:
+            info = texture_info(output['path'])
+            assert (info['width'], info['height'], info['mips']) == (output['width'], output['height'], output['mips'])
+        hits = sum(1 for r in warm for t in r['textures'] if t.get('conditioned', {}).get('cached'))
+        print(f"conditioned {len(outputs)} TGA textures ({outputs[0]['width']}x{outputs[0]['height']}, "
+              f"{outputs[0]['mips']} mips) in {cold_seconds:.2f}s; again from the cache in {warm_seconds:.3f}s "
+              f"({hits} hits)")
@@ -0,0 +1,44 @@
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+for path in (HERE, ROOT / "ExporterUI"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from synthetic import grid_mesh, sphere_mesh, write_fbx  # noqa: E402
+from vertex_cache import optimize_fbx  # noqa: E402
+
+# Triangle orders an export can arrive in: row by row as a modelled plane or primitive
+# comes out of Max, and shuffled as ProOptimizer LODs and welded scans do.
+MESHES = {'grid': grid_mesh, 'sphere': sphere_mesh}
+ORDERS = ('rows', 'shuffled')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Vertex-cache reordering of synthetic FBX exports")
+    parser.add_argument('--sizes', default="10000,100000,1000000", help="comma separated triangle counts")
+    parser.add_argument('--overdraw', action='store_true', help="also order clusters for overdraw")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(',')):
+            for mesh, make in MESHES.items():
+                positions, faces = make(size)
+                for order in ORDERS:
+                    if order == 'shuffled':
+                        faces = faces[np.random.default_rng(size).permutation(len(faces))]
+                    path = Path(tmp) / f"{mesh}_{order}_{size}.fbx"
+                    write_fbx(path, positions, faces)
+                    start = time.perf_counter()
+                    stats = optimize_fbx(path, overdraw=args.overdraw)
+                    seconds = time.perf_counter() - start
+                    print(f"{stats['triangles']:>8} tris {mesh:<6} {order:<8}: ACMR {stats['acmr_before']:.3f} -> "
+                          f"{stats['acmr_after']:.3f}, ATVR {stats['atvr_before']:.3f} -> {stats['atvr_after']:.3f}; "
+                          f"{seconds:.2f}s ({stats['triangles'] / seconds / 1e6:.2f}M tris/s)")
@@ -0,0 +1,70 @@
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+for path in (HERE, ROOT / "ExporterUI"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+from fbx_reader import fbx_stats  # noqa: E402
+from mesh_sidecar import build_sidecar  # noqa: E402
+from synthetic import grid_mesh, write_fbx  # noqa: E402
+from vertex_split import analyze_export  # noqa: E402
+
+
+def authored_mesh(triangles, charts, materials):
+    # A grid authored like a game asset: UVs cut into charts x charts islands (every
+    # other one mirrored), a faceted (hard-edged) band, and one material per strip.
+    positions, faces = grid_mesh(triangles)
+    corners = faces.ravel()
+    p = positions[corners].reshape(-1, 3, 3)
+    face_normals = np.cross(p[:, 1] - p[:, 0], p[:, 2] - p[:, 0])
+    face_normals /= np.linalg.norm(face_normals, axis=1, keepdims=True)
+    smooth = np.zeros_like(positions)
+    np.add.at(smooth, faces, face_normals[:, None, :])
+    smooth /= np.linalg.norm(smooth, axis=1, keepdims=True)
+    centre = p.mean(axis=1)
+    hard = (centre[:, 0] > 0.4) & (centre[:, 0] < 0.6)
+    normals = np.where(np.repeat(hard, 3)[:, None], np.repeat(face_normals, 3, axis=0), smooth[corners])
+
+    chart = np.minimum((centre[:, :2] * charts).astype(int), charts - 1)
+    uv = positions[corners, :2].reshape(-1, 3, 2) * charts - chart[:, None, :]
+    mirrored = (chart.sum(axis=1) % 2 == 1)
+    uv[mirrored, :, 0] = 1 - uv[mirrored, :, 0]
+    uv = (uv + 1.1 * chart[:, None, :]) / (1.1 * charts)
+    material_ids = np.minimum((centre[:, 1] * materials).astype(int), materials - 1)
+    return positions, faces, normals, uv.reshape(-1, 2), material_ids
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Render-vertex analysis of authored synthetic meshes")
+    parser.add_argument('--sizes', default="10000,100000,1000000", help="comma separated triangle counts")
+    parser.add_argument('--charts', type=int, default=8, help="UV islands per side")
+    parser.add_argument('--materials', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (int(s) for s in args.sizes.split(',')):
+            positions, faces, normals, uvs, material_ids = authored_mesh(size, args.charts, args.materials)
+            path = Path(tmp) / f"Mesh_{size}.fbx"
+            write_fbx(path, positions, faces, normals=normals, uvs=uvs, material_ids=material_ids)
+            start = time.perf_counter()
+            report = analyze_export(path)
+            from_fbx = time.perf_counter() - start
+            build_sidecar(path)
+            start = time.perf_counter()
+            analyze_export(path)
+            from_sidecar = time.perf_counter() - start
+            lod = report['lods'][0]
+            causes = ", ".join(f"{k} +{v}" for k, v in lod['causes'].items())
+            print(f"{lod['triangles']:>8} tris: {fbx_stats(path)['vertices']} control points -> "
+                  f"{lod['render_vertices']} render vertices (x{lod['split_ratio']}), {lod['draw_calls']} draw calls; "
+                  f"{causes}")
+            print(f"{'':>14}seam edges {lod['seam_edges']}; {from_fbx:.2f}s from FBX, {from_sidecar:.2f}s from sidecar "
+                  f"({lod['triangles'] / from_sidecar / 1e6:.1f}M tris/s)")
@@ -0,0 +1,62 @@
+import json
+import time
+
+from synthetic import write_fbx
+
+DEFAULT_LOD_LEVELS = (50, 25, 12)
+
+
+class FakeExporter:
+    # Stands in for AssetPipeline.runAutomatedExport on a FakeMonitor: writes the base
+    # FBX, _LODn files cut from the same mesh and a manifest shaped like the one the
+    # MaxScript writes, including its "stages" timings.
+    def __init__(self, meshes, lod_levels=DEFAULT_LOD_LEVELS):
+        self.meshes = meshes  # object name -> (positions, faces)
+        self.lod_levels = lod_levels
+        self.exported = 0
+
+    def install(self, monitor):
+        monitor.add_handler(r'runAutomatedExport "((?:[^"\\]|\\.)*)" "((?:[^"\\]|\\.)*)" (true|false) (true|false)'
+                            r'(?: lodLevels:#\(([^)]*)\))?',
+                            self.export)
+        return self
+
+    def export(self, match, script):
+        name = match.group(1)
+        path = match.group(2).replace('\\\\', '\\')
+        if name not in self.meshes:
+            return "ERROR_OBJ_NOT_FOUND"
+        positions, faces = self.meshes[name]
+        stages = []
+        t0 = time.perf_counter()
+
+        def mark(stage, start):
+            end = time.perf_counter()
+            stages.append([stage, round((start - t0) * 1000), round((end - t0) * 1000)])
+            return end
+
+        write_fbx(path, positions, faces, name)
+        t = mark("fbx_write", t0)
+        lod_count = 0
+        levels = self.lod_levels
+        if match.group(5) is not None:
+            levels = [float(v) for v in match.group(5).split(',') if v.strip()]
+        if match.group(3) == "true":
+            for i, percent in enumerate(levels, start=1):
+                write_fbx(path.replace('.fbx', f'_LOD{i}.fbx'), positions, faces[:int(len(faces) * percent / 100)], name)
+                t = mark(f"fbx_write_LOD{i}", t)
+                lod_count += 1
+        with open(path.replace('.fbx', '.json'), 'w') as f:
+            json.dump({
+                'asset': name,
+                'polygons': len(faces),
+                'vertices': len(positions),
+                'complexity': "Low",
+                'lod_count': lod_count,
+                'enable_nanite': match.group(4) == "true",
+                'texture_issues': "",
+                'textures': [],
+                'stages': stages,
+            }, f)
+        self.exported += 1
+        return "SUCCESS"
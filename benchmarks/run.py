@@ -0,0 +1,273 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import webbrowser
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+for path in (HERE, HERE / "stubs", ROOT / "ExporterUI"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+SIZES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000, '5m': 5_000_000}
+DEFAULT_SIZES = "1k,10k,100k"
+BASELINE_PATH = HERE / "baselines.json"
+TOLERANCE = 0.3
+ASSET_BUDGET = 500_000  # triangles exported per pipeline case, spread over up to 200 assets
+REPEAT = 3  # export and validation are each timed this many times; the best run is kept
+MIN_SECONDS = 0.5
+# Wall time of `python -m ExporterUI <command> --help`, interpreter start included. Build
+# scripts call the CLI thousands of times; anything above this fails the run outright.
+# Process start-up varies too much between runs for a relative gate, so the cli.*
+# baselines are shown for reference only and this budget is the whole check.
+CLI_STARTUP_BUDGET_MS = 250
+CLI_COMMANDS = ['', 'export', 'import-script', 'validate', 'index']
+VERTEX_CACHE_TRIANGLES = 2_000_000  # one shuffled grid through vertex_cache.optimize_fbx
+
+
+def peak_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def best_time(fn, repeat=REPEAT, min_seconds=MIN_SECONDS):
+    # Fastest of at least `repeat` runs, with more runs for steps too short to time once.
+    best, total, runs = None, 0.0, 0
+    while runs < repeat or total < min_seconds:
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        total += elapsed
+        runs += 1
+    return best
+
+
+def bench_ipc(count=2000):
+    from fake_monitor import FakeMonitor, measure_latency
+    from max_interface import MaxScriptInterface
+
+    with tempfile.TemporaryDirectory() as tmp, FakeMonitor(tmp):
+        interface = MaxScriptInterface(tmp)
+        latency = measure_latency(interface, count)
+        interface.close()
+    return {
+        'ipc.p50_ms': round(latency['p50_ms'], 4),
+        'ipc.p99_ms': round(latency['p99_ms'], 4),
+        'ipc.sequential_per_sec': round(latency['sequential_per_sec']),
+        'ipc.pipelined_per_sec': round(latency['pipelined_per_sec']),
+    }
+
+
+def bench_cli(runs=11):
+    # Median of `runs` fresh interpreters per command; -X importtime also shows whether
+    # anything pulled in PyQt.
+    metrics = {}
+    for command in CLI_COMMANDS:
+        args = [sys.executable, '-X', 'importtime', '-m', 'ExporterUI'] + ([command] if command else []) + ['--help']
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            done = subprocess.run(args, cwd=ROOT, capture_output=True, text=True)
+            times.append(time.perf_counter() - start)
+        if done.returncode != 0 or 'PyQt5' in done.stderr:
+            raise RuntimeError(f"`{' '.join(args[3:])}` failed or imported PyQt5")
+        metrics[f"cli.{command.replace('-', '_') or 'usage'}_ms"] = round(statistics.median(times) * 1000, 1)
+    return metrics
+
+
+def bench_vertex_cache(triangles=VERTEX_CACHE_TRIANGLES):
+    # Timed once: the pass rewrites the file, so a second run would see Tipsify's order.
+    import numpy as np
+    from synthetic import grid_mesh, write_fbx
+    from vertex_cache import optimize_fbx
+
+    positions, faces = grid_mesh(triangles)
+    faces = faces[np.random.default_rng(0).permutation(len(faces))]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "vertex_cache.fbx"
+        write_fbx(path, positions, faces)
+        start = time.perf_counter()
+        optimize_fbx(path)
+        seconds = time.perf_counter() - start
+    return {'vcache.2m.tris_per_sec': round(len(faces) / seconds)}
+
+
+def bench_pipeline(label):
+    # Export through the real BatchExportEngine/MaxScriptInterface against a FakeMonitor,
+    # import the result with BatchImporter against the stub unreal module, then validate
+    # every FBX offline.
+    from batch_engine import BatchExportEngine, DONE
+    from bench_import import EDITOR_COSTS
+    from fake_monitor import FakeMonitor, FakeScene
+    from fake_pipeline import FakeExporter
+    from fbx_reader import validate_export
+    from max_interface import MaxScriptInterface
+    from scene_cache import SceneCache
+    from synthetic import grid_mesh
+    from unreal_importer import UnrealImporter
+    import unreal
+
+    triangles = SIZES[label]
+    count = max(1, min(200, ASSET_BUDGET // triangles))
+    positions, faces = grid_mesh(triangles)
+    names = [f"Asset_{i:03d}" for i in range(count)]
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp, FakeMonitor(Path(tmp) / "channel") as monitor:
+        os.environ['PIPELINE_CATALOG'] = str(Path(tmp) / "catalog.db")  # not the user's catalog
+        scene = FakeScene()
+        for name in names:
+            scene.add(name, len(faces), len(positions))
+        scene.install(monitor)
+        FakeExporter({name: (positions, faces) for name in names}).install(monitor)
+
+        interface = MaxScriptInterface(Path(tmp) / "channel")
+
+        def export():
+            # A fresh engine each time so every repeat exports the whole batch again.
+            engine = BatchExportEngine(interface, SceneCache(interface))
+            engine.add_objects(names, Path(tmp) / "out")
+            summary = engine.run()
+            if summary.get(DONE) != count:
+                raise RuntimeError(f"export finished with {summary}")
+
+        seconds = best_time(export)
+        interface.close()
+        metrics[f'export.{label}.assets_per_sec'] = round(count / seconds, 2)
+        metrics[f'export.{label}.tris_per_sec'] = round(count * len(faces) / seconds)
+
+        paths = [str(Path(tmp) / "out" / f"{name}.fbx") for name in names]
+        script = UnrealImporter().generate_batch_import_script(paths, report_path=str(Path(tmp) / "report.html"))
+
+        # The stub returns instantly, so wall time here is noise; what the batch costs in
+        # the editor is the calls it makes, priced with bench_import's table.
+        unreal.reset()
+        original_open = webbrowser.open
+        webbrowser.open = lambda *args, **kwargs: True
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                exec(compile(script, "<batch import>", "exec"), {'__name__': '__main__'})
+        finally:
+            webbrowser.open = original_open
+        editor_seconds = sum(EDITOR_COSTS.get(k, 0) * v for k, v in unreal.calls.items())
+        metrics[f'import.{label}.editor_ms_per_asset'] = round(editor_seconds * 1000 / count, 3)
+
+        results = [validate_export(p) for p in paths]
+        if any(r is None or r['accuracy_score'] < 85 for r in results):
+            raise RuntimeError("validation rejected a synthetic export")
+        seconds = best_time(lambda: [validate_export(p) for p in paths])
+        metrics[f'validate.{label}.tris_per_sec'] = round(count * len(faces) / seconds)
+    return metrics
+
+
+def run_case(case):
+    # Each case runs in a fresh process so its peak RSS is its own.
+    name, arg = case
+    if name == 'cli':
+        return bench_cli()
+    metrics = {'ipc': bench_ipc, 'vcache': bench_vertex_cache}[name]() if arg is None else bench_pipeline(arg)
+    metrics[f"{name if arg is None else f'pipeline.{arg}'}.peak_rss_mb"] = peak_rss_mb()
+    return metrics
+
+
+def lower_is_better(metric):
+    return metric.endswith(('_ms', '_mb'))
+
+
+def budget_only(metric):
+    # Gated on CLI_STARTUP_BUDGET_MS alone, not against the baseline.
+    return metric.startswith('cli.')
+
+
+def case_label(metric):
+    # 'ipc', 'cli', 'vcache' or the pipeline size ('export.1k.tris_per_sec' -> '1k').
+    kind, label = metric.split('.')[:2]
+    return kind if kind in ('ipc', 'cli', 'vcache') else label
+
+
+def compare(metrics, baseline, labels):
+    # A baselined metric of a case that ran (labels) but was not measured fails the run:
+    # a renamed or dropped metric must not silently stop being checked.
+    rows, regressions = [], []
+    reference = baseline.get('metrics', {})
+    tolerances = baseline.get('tolerances', {})
+    for metric in sorted(set(reference) - set(metrics)):
+        if case_label(metric) in labels:
+            rows.append((metric, None, reference[metric], None, "MISSING"))
+            regressions.append(metric)
+    for metric, value in metrics.items():
+        base = reference.get(metric)
+        status, change = "new", None
+        if base:
+            change = (value - base) / base
+            tolerance = tolerances.get(metric, baseline.get('tolerance', TOLERANCE))
+            worse = change > tolerance if lower_is_better(metric) else change < -tolerance
+            worse = worse and not budget_only(metric)
+            status = "REGRESSION" if worse else "ok"
+            if worse:
+                regressions.append(metric)
+        rows.append((metric, value, base, change, status))
+    return rows, regressions
+
+
+def machine():
+    return {'platform': platform.platform(), 'python': platform.python_version(), 'cpus': os.cpu_count()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Pipeline benchmarks against a fake monitor and a stub unreal module")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"comma separated, from {', '.join(SIZES)}")
+    parser.add_argument('--baseline', default=str(BASELINE_PATH))
+    parser.add_argument('--save-baseline', action='store_true', help="record these results as the new baseline")
+    parser.add_argument('--tolerance', type=float, help=f"allowed slowdown before failing (default {TOLERANCE})")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+
+    cases = [('ipc', None), ('cli', None), ('vcache', None)] + [('pipeline', size.strip()) for size in args.sizes.split(',') if size.strip()]
+    unknown = [arg for _, arg in cases if arg is not None and arg not in SIZES]
+    if unknown:
+        raise SystemExit(f"Unknown size(s): {', '.join(unknown)}")
+
+    metrics = {}
+    context = multiprocessing.get_context('spawn')
+    for case in cases:
+        with context.Pool(1) as pool:
+            metrics.update(pool.apply(run_case, (case,)))
+        print(f"  finished {case[0]} {case[1] or ''}", flush=True)
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    if args.tolerance is not None:
+        baseline['tolerance'] = args.tolerance
+    labels = {arg or name for name, arg in cases}
+    rows, regressions = compare(metrics, baseline, labels)
+    over_budget = [m for m, v in metrics.items() if m.startswith('cli.') and v > CLI_STARTUP_BUDGET_MS]
+    regressions += [m for m in over_budget if m not in regressions]
+    print(f"\n{'metric':<34} {'value':>14} {'baseline':>14} {'change':>9}  status")
+    for metric, value, base, change, status in rows:
+        status = "OVER BUDGET" if metric in over_budget else status
+        print(f"{metric:<34} {value if value is not None else '-':>14} {base if base is not None else '-':>14} "
+              f"{'' if change is None else f'{change:+.1%}':>9}  {status}")
+    if args.json:
+        Path(args.json).write_text(json.dumps({'machine': machine(), 'metrics': metrics}, indent=2))
+
+    if args.save_baseline:
+        baseline.setdefault('tolerance', TOLERANCE)
+        baseline['machine'] = machine()
+        kept = {m: v for m, v in baseline.get('metrics', {}).items() if case_label(m) not in labels}
+        baseline['metrics'] = dict(kept, **metrics)
+        baseline_path.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline saved to {baseline_path}")
+    elif regressions:
+        print(f"\n*** {len(regressions)} REGRESSION(S) against {baseline_path}: {', '.join(regressions)} ***")
+        raise SystemExit(1)
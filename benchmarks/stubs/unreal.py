@@ -0,0 +1,371 @@
+# Minimal stand-in for the editor's `unreal` module, enough to run UnrealScripts and the
+# generated import scripts outside the editor. Assets live in a dict; every editor call
+# is counted in `calls` so benchmarks can price them with their own cost table, and the
+# meshes currently held in memory are tracked in `loaded` (peak in `peak_loaded`).
+import json
+import os
+from collections import Counter
+
+calls = Counter()
+assets = {}
+loaded = set()
+peak_loaded = 0
+messages = []
+
+
+def reset():
+    global peak_loaded
+    calls.clear()
+    assets.clear()
+    loaded.clear()
+    peak_loaded = 0
+    messages.clear()
+    actors.clear()
+
+
+def _hold(path):
+    global peak_loaded
+    loaded.add(path)
+    peak_loaded = max(peak_loaded, len(loaded))
+
+
+def log(message):
+    messages.append(('log', message))
+
+
+def log_warning(message):
+    messages.append(('warning', message))
+
+
+def log_error(message):
+    messages.append(('error', message))
+
+
+tick_callbacks = {}
+
+
+def register_slate_post_tick_callback(callback):
+    handle = len(tick_callbacks) + 1
+    tick_callbacks[handle] = callback
+    return handle
+
+
+def unregister_slate_post_tick_callback(handle):
+    tick_callbacks.pop(handle, None)
+
+
+def tick(delta_seconds):
+    # Drives the registered callbacks the way the editor's Slate tick would.
+    for callback in list(tick_callbacks.values()):
+        callback(delta_seconds)
+
+
+class _Object:
+    def set_editor_property(self, name, value):
+        setattr(self, name, value)
+
+    def get_editor_property(self, name):
+        return getattr(self, name, None)
+
+
+class _ImportData(_Object):
+    def __init__(self):
+        self.combine_meshes = False
+        self.auto_generate_collision = False
+        self.build_nanite = False
+
+
+class FbxImportUI(_Object):
+    def __init__(self):
+        self.import_mesh = True
+        self.import_materials = True
+        self.import_textures = True
+        self.static_mesh_import_data = _ImportData()
+
+
+class FbxFactory(_Object):
+    pass
+
+
+class AssetImportTask(_Object):
+    def __init__(self):
+        self.filename = ""
+        self.destination_path = ""
+        self.destination_name = ""
+        self.automated = False
+        self.replace_existing = False
+        self.save = False
+        self.factory = None
+        self.options = None
+        self.imported_object_paths = []
+
+
+class StaticMesh(_Object):
+    def __init__(self, path, triangles, vertices, nanite=False, uv_channels=1, has_tags=True):
+        self.path = path
+        self.lods = [(triangles, vertices)]
+        self.nanite = nanite
+        self.uv_channels = uv_channels
+        self.has_tags = has_tags  # False models a package saved before the tags existed
+
+    def registry_tags(self):
+        if not self.has_tags:
+            return {}
+        triangles, vertices = self.lods[0]
+        return {'Triangles': str(triangles), 'Vertices': str(vertices), 'LODs': str(len(self.lods)),
+                'UVChannels': str(self.uv_channels), 'NaniteEnabled': str(self.nanite)}
+
+    def get_num_triangles(self, lod=0):
+        return self.lods[lod][0] if lod < len(self.lods) else 0
+
+    def get_num_vertices(self, lod=0):
+        return self.lods[lod][1] if lod < len(self.lods) else 0
+
+    def get_num_lods(self):
+        return len(self.lods)
+
+    def get_editor_property(self, name):
+        if name == 'source_models':
+            # A copy, as Unreal returns struct arrays; set_editor_property writes it back.
+            return [getattr(self, 'models', {}).get(i, _SourceModel()) for i in range(len(self.lods))]
+        return super().get_editor_property(name)
+
+    def set_editor_property(self, name, value):
+        if name == 'source_models':
+            calls['set_source_models'] += 1
+            self.models = dict(enumerate(value))
+            return
+        super().set_editor_property(name, value)
+
+
+class _SourceModel(_Object):
+    def __init__(self):
+        self.screen_size = PerPlatformFloat()
+
+
+class PerPlatformFloat(_Object):
+    def __init__(self, default=0.0):
+        self.default = default
+
+
+def _manifest_counts(fbx_path):
+    json_path = os.path.splitext(fbx_path)[0] + '.json'
+    try:
+        with open(json_path, 'r') as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        metadata = {}
+    triangles = metadata.get('polygons', 0)
+    return triangles, metadata.get('vertices', triangles // 2)
+
+
+class _AssetTools:
+    def import_asset_tasks(self, tasks):
+        calls['import_asset_tasks'] += 1
+        for task in tasks:
+            calls['imported_assets'] += 1
+            name = task.destination_name or os.path.splitext(os.path.basename(task.filename))[0]
+            path = f"{task.destination_path}/{name}"
+            nanite = bool(task.options and task.options.static_mesh_import_data.build_nanite)
+            assets[path] = StaticMesh(path, *_manifest_counts(task.filename), nanite=nanite)
+            _hold(path)
+            task.imported_object_paths = [f"{path}.{name}"]
+            if task.save:
+                calls['saved_assets'] += 1
+                calls['save_calls'] += 1
+
+
+class AssetToolsHelpers:
+    @staticmethod
+    def get_asset_tools():
+        return _AssetTools()
+
+
+def _asset_path(path):
+    return path.split('.')[0]
+
+
+class EditorAssetLibrary:
+    @staticmethod
+    def does_asset_exist(path):
+        calls['does_asset_exist'] += 1
+        return _asset_path(path) in assets
+
+    @staticmethod
+    def load_asset(path):
+        calls['load_asset'] += 1
+        asset = assets.get(_asset_path(path))
+        if asset is not None:
+            _hold(asset.path)
+        return asset
+
+    @staticmethod
+    def find_asset_data(path):
+        calls['find_asset_data'] += 1
+        return AssetData(assets.get(_asset_path(path)))
+
+    @staticmethod
+    def save_asset(path, only_if_is_dirty=True):
+        calls['save_calls'] += 1
+        calls['saved_assets'] += 1
+        return _asset_path(path) in assets
+
+    @staticmethod
+    def save_loaded_assets(assets_to_save, only_if_is_dirty=True):
+        calls['save_calls'] += 1
+        calls['saved_assets'] += len(assets_to_save)
+        return True
+
+
+class EditorStaticMeshLibrary:
+    @staticmethod
+    def import_lod(mesh, lod_index, path):
+        calls['import_lod'] += 1
+        if not os.path.exists(path):
+            return -1
+        triangles, vertices = _manifest_counts(path)
+        base_triangles, base_vertices = mesh.lods[0]
+        scale = 0.5 ** lod_index
+        mesh.lods[lod_index:] = [(triangles or int(base_triangles * scale), vertices or int(base_vertices * scale))]
+        return lod_index
+
+
+class ScopedSlowTask:
+    def __init__(self, work, description=""):
+        self.work = work
+        self.description = description
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def make_dialog(self, can_cancel=False):
+        pass
+
+    def enter_progress_frame(self, work=1, description=""):
+        pass
+
+    def should_cancel(self):
+        return False
+
+
+class AssetData:
+    def __init__(self, asset=None):
+        self._asset = asset
+        self.package_name = asset.path if asset else ""
+        self.asset_name = asset.path.rsplit('/', 1)[-1] if asset else ""
+        self.asset_class = type(asset).__name__ if asset else ""
+
+    def is_valid(self):
+        return self._asset is not None
+
+    def get_tag_value(self, tag):
+        return self._asset.registry_tags().get(tag) if self._asset else None
+
+
+class _AssetRegistry:
+    def get_assets_by_path(self, package_path, recursive=False):
+        calls['get_assets_by_path'] += 1
+        prefix = package_path.rstrip('/') + '/'
+        return [AssetData(a) for path, a in sorted(assets.items())
+                if path.startswith(prefix) and (recursive or '/' not in path[len(prefix):])]
+
+    def get_asset_by_object_path(self, path):
+        return AssetData(assets.get(_asset_path(path)))
+
+
+class AssetRegistryHelpers:
+    @staticmethod
+    def get_asset_registry():
+        return _AssetRegistry()
+
+
+class SystemLibrary:
+    @staticmethod
+    def collect_garbage():
+        calls['collect_garbage'] += 1
+        loaded.clear()
+
+
+class Vector:
+    def __init__(self, x=0.0, y=0.0, z=0.0):
+        self.x, self.y, self.z = x, y, z
+
+
+class Rotator:
+    def __init__(self, roll=0.0, pitch=0.0, yaw=0.0):
+        self.roll, self.pitch, self.yaw = roll, pitch, yaw
+
+
+class Transform:
+    def __init__(self, location=None, rotation=None, scale=None):
+        self.translation = location or Vector()
+        self.rotation = rotation or Rotator()
+        self.scale3d = scale or Vector(1.0, 1.0, 1.0)
+
+
+class MathLibrary:
+    @staticmethod
+    def make_rot_from_xz(x, z):
+        # Only what the stub needs: yaw/pitch of the X axis, roll left at zero.
+        import math
+        return Rotator(0.0, math.degrees(math.atan2(x.z, math.hypot(x.x, x.y))), math.degrees(math.atan2(x.y, x.x)))
+
+
+class _StaticMeshComponent(_Object):
+    def __init__(self, mesh):
+        self.static_mesh = mesh
+
+    def set_static_mesh(self, mesh):
+        self.static_mesh = mesh
+
+
+class StaticMeshActor(_Object):
+    def __init__(self, mesh, location):
+        self.static_mesh_component = _StaticMeshComponent(mesh)
+        self.transform = Transform(location)
+        self.label = ""
+        self.folder_path = ""
+
+    def set_actor_label(self, label):
+        self.label = label
+
+    def get_actor_label(self):
+        return self.label
+
+    def set_folder_path(self, path):
+        self.folder_path = path
+
+    def get_folder_path(self):
+        return self.folder_path
+
+    def set_actor_transform(self, transform, sweep, teleport):
+        calls['set_actor_transform'] += 1
+        self.transform = transform
+
+
+actors = []
+
+
+class EditorActorSubsystem:
+    def get_all_level_actors(self):
+        calls['get_all_level_actors'] += 1
+        return list(actors)
+
+    def spawn_actor_from_object(self, object_to_use, location, rotation=None):
+        calls['spawn_actor'] += 1
+        actor = StaticMeshActor(object_to_use, location)
+        actors.append(actor)
+        return actor
+
+
+class LevelEditorSubsystem:
+    def save_current_level(self):
+        calls['save_current_level'] += 1
+        return True
+
+
+def get_editor_subsystem(cls):
+    return cls()
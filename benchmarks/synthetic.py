@@ -0,0 +1,129 @@
+import struct
+import zlib
+
+import numpy as np
+
+
+def grid_mesh(triangles, seed=0, roughness=0.05):
+    # Height-field grid with roughly the requested triangle count. Open borders and
+    # low-frequency bumps give the decimator something to preserve.
+    side = max(2, int(np.sqrt(triangles / 2)) + 1)
+    rng = np.random.default_rng(seed)
+    u, v = np.meshgrid(np.linspace(0, 1, side), np.linspace(0, 1, side), indexing='ij')
+    height = 0.2 * np.sin(u * 6.0) * np.cos(v * 4.0) + roughness * rng.standard_normal(u.shape) * 0.1
+    positions = np.stack([u.ravel(), v.ravel(), height.ravel()], axis=1)
+    index = np.arange(side * side).reshape(side, side)
+    a, b = index[:-1, :-1].ravel(), index[1:, :-1].ravel()
+    c, d = index[1:, 1:].ravel(), index[:-1, 1:].ravel()
+    faces = np.concatenate([np.stack([a, b, c], axis=1), np.stack([a, c, d], axis=1)])
+    return positions, faces
+
+
+def sphere_mesh(triangles, seed=0, roughness=0.02):
+    # Closed UV sphere (poles welded) with a little radial noise.
+    rings = max(3, int(np.sqrt(triangles / 4)))
+    segments = 2 * rings
+    rng = np.random.default_rng(seed)
+    theta = np.linspace(0, np.pi, rings + 1)[1:-1]
+    phi = np.linspace(0, 2 * np.pi, segments, endpoint=False)
+    t, p = np.meshgrid(theta, phi, indexing='ij')
+    radius = 1 + roughness * rng.standard_normal(t.shape)
+    body = np.stack([radius * np.sin(t) * np.cos(p), radius * np.sin(t) * np.sin(p), radius * np.cos(t)], axis=-1)
+    positions = np.concatenate([[[0, 0, 1]], body.reshape(-1, 3), [[0, 0, -1]]])
+    ring = np.arange(segments)
+    nxt = (ring + 1) % segments
+    faces = [np.stack([np.zeros(segments, int), 1 + ring, 1 + nxt], axis=1)]
+    for r in range(rings - 2):
+        top, bottom = 1 + r * segments, 1 + (r + 1) * segments
+        faces.append(np.stack([top + ring, bottom + ring, bottom + nxt], axis=1))
+        faces.append(np.stack([top + ring, bottom + nxt, top + nxt], axis=1))
+    last = 1 + (rings - 2) * segments
+    south = len(positions) - 1
+    faces.append(np.stack([last + ring, np.full(segments, south), last + nxt], axis=1))
+    return positions, np.concatenate(faces)
+
+
+# Minimal binary FBX (7.7) writer: one mesh geometry, its model and the connection
+# between them, which is all ExporterUI/fbx_reader.py and the importers look at.
+FBX_MAGIC = b"Kaydara FBX Binary  \x00\x1a\x00"
+FBX_VERSION = 7700
+NODE_HEADER = '<QQQB'
+ARRAY_CODES = {'f8': b'd', 'f4': b'f', 'i4': b'i', 'i8': b'l'}
+
+
+class FbxNode:
+    def __init__(self, name, props=(), children=()):
+        self.name = name
+        self.props = list(props)
+        self.children = list(children)
+
+
+def encode_property(value, compress):
+    if isinstance(value, np.ndarray):
+        raw = np.ascontiguousarray(value, dtype=value.dtype.newbyteorder('<')).tobytes()
+        data = zlib.compress(raw, 1) if compress else raw
+        return ARRAY_CODES[value.dtype.str[1:]] + struct.pack('<III', len(value), int(compress), len(data)) + data
+    if isinstance(value, int):
+        return b'L' + struct.pack('<q', value)
+    if isinstance(value, float):
+        return b'D' + struct.pack('<d', value)
+    data = value.encode('utf-8')
+    return b'S' + struct.pack('<I', len(data)) + data
+
+
+def encode_node(node, offset, compress):
+    header = struct.calcsize(NODE_HEADER)
+    props = b"".join(encode_property(p, compress) for p in node.props)
+    name = node.name.encode('ascii')
+    body = offset + header + len(name) + len(props)
+    children = []
+    for child in node.children:
+        children.append(encode_node(child, body + sum(len(c) for c in children), compress))
+    if node.children:
+        children.append(b"\0" * header)
+    end = body + sum(len(c) for c in children)
+    return b"".join([struct.pack(NODE_HEADER, end, len(node.props), len(props), len(name)), name, props] + children)
+
+
+def write_fbx(path, positions, faces, name="Mesh", uv_sets=1, compress=True, normals=None, uvs=None,
+              material_ids=None):
+    # normals (3F, 3) and uvs (3F, 2) are per triangle corner; uvs replaces the all-zero
+    # UV sets. material_ids holds one slot per triangle.
+    faces = np.asarray(faces, dtype=np.int32)
+    polygon_vertex_index = faces.copy()
+    polygon_vertex_index[:, 2] = ~polygon_vertex_index[:, 2]
+    corners = faces.size
+    geometry = [FbxNode("Vertices", [np.asarray(positions, dtype=np.float64).ravel()]),
+                FbxNode("PolygonVertexIndex", [polygon_vertex_index.ravel()])]
+    if normals is not None:
+        geometry.append(FbxNode("LayerElementNormal", [0], [
+            FbxNode("MappingInformationType", ["ByPolygonVertex"]),
+            FbxNode("ReferenceInformationType", ["Direct"]),
+            FbxNode("Normals", [np.asarray(normals, dtype=np.float64).ravel()]),
+        ]))
+    for channel in range(uv_sets):
+        geometry.append(FbxNode("LayerElementUV", [channel], [
+            FbxNode("MappingInformationType", ["ByPolygonVertex"]),
+            FbxNode("ReferenceInformationType", ["Direct"]),
+            FbxNode("UV", [np.zeros(corners * 2) if uvs is None else np.asarray(uvs, dtype=np.float64).ravel()]),
+        ]))
+    if material_ids is not None:
+        geometry.append(FbxNode("LayerElementMaterial", [0], [
+            FbxNode("MappingInformationType", ["ByPolygon"]),
+            FbxNode("ReferenceInformationType", ["IndexToDirect"]),
+            FbxNode("Materials", [np.asarray(material_ids, dtype=np.int32)]),
+        ]))
+    nodes = [
+        FbxNode("FBXHeaderExtension", [], [FbxNode("FBXVersion", [FBX_VERSION])]),
+        FbxNode("Objects", [], [FbxNode("Geometry", [100, name + "\x00\x01Geometry", "Mesh"], geometry),
+                                FbxNode("Model", [200, name + "\x00\x01Model", "Mesh"])]),
+        FbxNode("Connections", [], [FbxNode("C", ["OO", 100, 200]), FbxNode("C", ["OO", 200, 0])]),
+    ]
+    out = [FBX_MAGIC, struct.pack('<I', FBX_VERSION)]
+    offset = len(FBX_MAGIC) + 4
+    for node in nodes:
+        out.append(encode_node(node, offset, compress))
+        offset += len(out[-1])
+    out.append(b"\0" * 25)
+    with open(path, 'wb') as f:
+        f.write(b"".join(out))